@@ -0,0 +1,214 @@
+# benchmark_diagnosa.py - Benchmark mesin diagnosa malaria
+
+"""
+Membandingkan diagnosa_engine.py dengan penelusuran pakar_malaria_gui.py.
+
+Penelusuran GUI disimulasikan langkah demi langkah dan setiap panggilan ke
+Prolog (query, assertz, retractall) ikut dihitung. Semua kemungkinan
+himpunan gejala pasien dicoba, dan hasil diagnosa kedua cara harus sama.
+
+Benchmark sesi mengukur jumlah sesi diagnosa per detik dari banyak thread
+sekaligus dan lewat server_diagnosa.py dengan banyak klien asyncio.
+Benchmark batch mengukur jumlah pasien per menit di diagnosa_batch.py.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import random
+import threading
+import time
+
+from diagnosa_batch import DiagnosaBatch, np
+from diagnosa_engine import BasisPengetahuan, MesinDiagnosa, PohonPertanyaan
+from server_diagnosa import ServerDiagnosa
+
+def simulasi_penelusuran(kb, positif):
+    """Tiru alur mulai_diagnosa dan pertanyaan_selanjutnya di GUI
+    
+    Args:
+        kb (BasisPengetahuan): Basis pengetahuan
+        positif (int): Bitmask gejala yang dialami pasien
+    
+    Returns:
+        tuple: (penyakit atau None, jumlah pertanyaan, jumlah panggilan Prolog)
+    """
+    # retractall x2, query penyakit(X), lalu satu query gejala per penyakit
+    panggilan = 3 + len(kb.penyakit)
+    pertanyaan = 0
+    jawaban_pos, jawaban_neg = set(), set()
+    for p in kb.penyakit:
+        cocok = True
+        for g in kb.gejala_penyakit[p]:
+            # Query gejala_pos, lalu gejala_neg bila belum positif
+            panggilan += 1
+            if g in jawaban_pos:
+                continue
+            panggilan += 1
+            if g in jawaban_neg:
+                cocok = False
+                break
+            # Query pertanyaan lalu assertz jawaban
+            panggilan += 2
+            pertanyaan += 1
+            if positif & (1 << kb.indeks_gejala[g]):
+                jawaban_pos.add(g)
+            else:
+                jawaban_neg.add(g)
+                cocok = False
+                break
+        if cocok:
+            return p, pertanyaan, panggilan
+    return None, pertanyaan, panggilan
+
+def bench_jumlah_pertanyaan(path="pakar_malaria_gui.pl"):
+    """Rata-rata pertanyaan dan panggilan Prolog per sesi"""
+    kb = BasisPengetahuan.dari_file(path)
+    mulai = time.perf_counter()
+    pohon = PohonPertanyaan(kb)
+    waktu_susun = time.perf_counter() - mulai
+    
+    semua = range(1 << len(kb.gejala))
+    # Pasien yang hanya mengalami gejala dari tepat satu penyakit
+    khas = kb.mask_penyakit
+    
+    def rata_rata(daftar_pasien):
+        total_gui = total_pohon = total_panggilan = 0
+        for positif in daftar_pasien:
+            hasil_gui, tanya_gui, panggilan = simulasi_penelusuran(kb, positif)
+            hasil_pohon, tanya_pohon = pohon.diagnosa(lambda g: positif >> kb.indeks_gejala[g] & 1)
+            assert hasil_gui == hasil_pohon, (positif, hasil_gui, hasil_pohon)
+            total_gui += tanya_gui
+            total_pohon += tanya_pohon
+            total_panggilan += panggilan
+        n = len(daftar_pasien)
+        return total_gui / n, total_pohon / n, total_panggilan / n
+    
+    print(f"Basis pengetahuan: {len(kb.penyakit)} penyakit, {len(kb.gejala)} gejala")
+    print(f"Pohon: {pohon.jumlah_simpul} simpul, kedalaman {pohon.kedalaman()}, "
+          f"disusun dalam {waktu_susun * 1e3:.1f} ms")
+    print(f"{'Pasien':<22} {'Tanya GUI':>10} {'Tanya pohon':>12} {'Prolog GUI':>11} {'Prolog pohon':>13}")
+    for nama, daftar in (("semua kemungkinan", semua), ("gejala satu penyakit", khas)):
+        tanya_gui, tanya_pohon, panggilan = rata_rata(daftar)
+        print(f"{nama:<22} {tanya_gui:10.2f} {tanya_pohon:12.2f} {panggilan:11.2f} {0:13.2f}")
+    print("Fakta dibaca sekali saat mulai; selama sesi pohon tidak memanggil Prolog.")
+
+def _pasien_acak(kb, jumlah, seed):
+    rng = random.Random(seed)
+    return [rng.getrandbits(len(kb.gejala)) for _ in range(jumlah)]
+
+def bench_sesi_thread(jumlah_sesi=200000, daftar_thread=(1, 4, 16), path="pakar_malaria_gui.pl"):
+    """Sesi per detik dengan banyak thread memakai satu MesinDiagnosa"""
+    mesin = MesinDiagnosa(path, kb=BasisPengetahuan.dari_file(path))
+    kb = mesin.kb
+    
+    print(f"\nSesi dari thread ({jumlah_sesi} sesi, sesi terdaftar dengan ID)")
+    for jumlah_thread in daftar_thread:
+        bagian = [_pasien_acak(kb, jumlah_sesi // jumlah_thread, seed) for seed in range(jumlah_thread)]
+        salah = []
+        
+        def kerja(daftar_pasien):
+            for positif in daftar_pasien:
+                id_sesi, sesi = mesin.buka()
+                while not sesi.selesai:
+                    sesi.jawab(positif & sesi.simpul.bit)
+                mesin.tutup(id_sesi)
+                if sesi.hasil != kb.diagnosa(positif):
+                    salah.append(positif)
+        
+        threads = [threading.Thread(target=kerja, args=(b,)) for b in bagian]
+        mulai = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        durasi = time.perf_counter() - mulai
+        total = sum(len(b) for b in bagian)
+        assert not salah and mesin.jumlah_sesi == 0
+        print(f"  {jumlah_thread:3d} thread: {total / durasi:10.0f} sesi/detik")
+
+async def _klien(port, daftar_pasien, kb):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    bit = {g: 1 << i for i, g in enumerate(kb.gejala)}
+    for positif in daftar_pasien:
+        writer.write(b'{"aksi": "mulai"}\n')
+        balasan = json.loads(await reader.readline())
+        while not balasan.get("selesai"):
+            jawaban = bool(positif & bit[balasan["gejala"]])
+            writer.write(json.dumps({"aksi": "jawab", "sesi": balasan["sesi"], "jawaban": jawaban}).encode() + b"\n")
+            balasan = json.loads(await reader.readline())
+        assert balasan["hasil"] == kb.diagnosa(positif)
+    writer.close()
+    await writer.wait_closed()
+
+def bench_sesi_server(sesi_per_klien=200, daftar_klien=(1, 16, 128), path="pakar_malaria_gui.pl"):
+    """Sesi per detik lewat server asyncio dengan banyak klien bersamaan"""
+    mesin = MesinDiagnosa(path, kb=BasisPengetahuan.dari_file(path))
+    server = ServerDiagnosa(mesin)
+    
+    async def jalankan(jumlah_klien):
+        tcp = await asyncio.start_server(server.tangani_koneksi, "127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            daftar = [_pasien_acak(mesin.kb, sesi_per_klien, seed) for seed in range(jumlah_klien)]
+            mulai = time.perf_counter()
+            await asyncio.gather(*(_klien(port, d, mesin.kb) for d in daftar))
+            return time.perf_counter() - mulai
+    
+    print(f"\nSesi lewat server asyncio ({sesi_per_klien} sesi per klien, klien dan server satu proses)")
+    for jumlah_klien in daftar_klien:
+        durasi = asyncio.run(jalankan(jumlah_klien))
+        assert mesin.jumlah_sesi == 0
+        print(f"  {jumlah_klien:3d} klien: {jumlah_klien * sesi_per_klien / durasi:10.0f} sesi/detik")
+
+def bench_batch(jumlah_pasien=5000000, baris_csv=500000, path="pakar_malaria_gui.pl"):
+    """Pasien per menit untuk diagnosa massal"""
+    kb = BasisPengetahuan.dari_file(path)
+    batch = DiagnosaBatch(kb)
+    
+    def laporkan(nama, jumlah, durasi):
+        print(f"  {nama:<34} {jumlah / durasi * 60 / 1e6:10.2f} juta pasien/menit")
+    
+    print(f"\nDiagnosa massal ({len(kb.penyakit)} penyakit x {len(kb.gejala)} gejala)")
+    
+    # Satu per satu dengan BasisPengetahuan.diagnosa sebagai pembanding
+    kode_list = _pasien_acak(kb, 200000, 0)
+    mulai = time.perf_counter()
+    acuan = [kb.diagnosa(k) for k in kode_list]
+    laporkan("satu per satu (loop Python)", len(kode_list), time.perf_counter() - mulai)
+    
+    mulai = time.perf_counter()
+    hasil = batch.diagnosa_kode(kode_list)
+    laporkan("bitmask list + tabel kode", len(kode_list), time.perf_counter() - mulai)
+    assert [batch.nama(i) for i in hasil] == acuan
+    
+    if np is not None:
+        rng = np.random.default_rng(0)
+        pasien = rng.random((jumlah_pasien, len(kb.gejala))) < 0.5
+        mulai = time.perf_counter()
+        hasil = batch.diagnosa_matriks(pasien)
+        laporkan(f"matriks NumPy ({jumlah_pasien} pasien)", jumlah_pasien, time.perf_counter() - mulai)
+        cocok = batch.cocok_semua(pasien[:100000])
+        pertama = np.where(cocok.any(axis=1), cocok.argmax(axis=1), -1)
+        assert (pertama == hasil[:100000]).all()
+    
+    # CSV dibuat di memori agar yang terukur hanya pembacaan dan diagnosa
+    teks = io.StringIO()
+    writer = csv.writer(teks)
+    writer.writerow(["id"] + kb.gejala)
+    rng = random.Random(1)
+    for i in range(baris_csv):
+        writer.writerow([i] + [rng.choice(("ya", "tidak")) for _ in kb.gejala])
+    teks.seek(0)
+    mulai = time.perf_counter()
+    jumlah = 0
+    for ids, kode in batch.baca_csv(teks, kolom_id="id"):
+        jumlah += len(batch.diagnosa_kode(kode))
+    laporkan(f"CSV per potongan ({baris_csv} baris)", jumlah, time.perf_counter() - mulai)
+
+if __name__ == "__main__":
+    bench_jumlah_pertanyaan()
+    bench_sesi_thread()
+    bench_sesi_server()
+    bench_batch()
@@ -0,0 +1,145 @@
+# benchmark_silsilah.py - Benchmark indeks silsilah
+
+"""
+Mengukur waktu penyusunan indeks dan waktu query silsilah.py pada pohon
+sintetis sejuta orang dan pada silsilah dua orang tua per anak. Silsilah
+dua orang tua diukur dua kali: orang tua dari keluarga yang berdekatan
+(seperti data nyata), dan orang tua acak dari seluruh generasi sebagai
+kasus terburuk, karena setelah belasan generasi hampir semua orang menjadi
+pendahulu semua orang.
+
+Sebagai pembanding, ancestor/2 juga dijawab dengan menelusuri orang tua
+satu per satu seperti aturan rekursif di silsilah.pl. Jawaban indeks dan
+penelusuran harus sama.
+"""
+
+import csv
+import io
+import random
+import resource
+import time
+
+from silsilah import IndeksSilsilah, baca_csv
+
+def pohon_sintetis(jumlah, lebar=50, seed=0):
+    """Pasangan (orang tua, anak) untuk pohon acak dengan satu orang tua per orang
+    
+    Orang tua setiap orang dipilih dari `lebar` orang sebelumnya, sehingga
+    pohonnya dalam (ribuan generasi).
+    """
+    rng = random.Random(seed)
+    for i in range(1, jumlah):
+        yield f"p{i - 1 - rng.randrange(min(i, lebar))}", f"p{i}"
+
+def silsilah_dua_orang_tua(generasi, per_generasi, lebar=None, seed=0):
+    """Pasangan (orang tua, anak) untuk silsilah bergenerasi, dua orang tua per anak
+    
+    Orang tua anak ke-i dipilih dari sekitar posisi i di generasi sebelumnya
+    (sejauh `lebar`), atau dari seluruh generasi bila lebar None.
+    """
+    rng = random.Random(seed)
+    for g in range(1, generasi):
+        for i in range(per_generasi):
+            if lebar is None:
+                ayah, ibu = rng.sample(range(per_generasi), 2)
+            else:
+                ayah, ibu = [(i + d) % per_generasi for d in rng.sample(range(-lebar, lebar + 1), 2)]
+            yield f"g{g - 1}_{ayah}", f"g{g}_{i}"
+            yield f"g{g - 1}_{ibu}", f"g{g}_{i}"
+
+def ancestor_penelusuran(indeks, x, y):
+    """ancestor/2 dengan menelusuri orang tua dari y ke atas"""
+    terlihat, stack = set(), [y]
+    while stack:
+        for z in indeks.orang_tua(stack.pop()):
+            if z == x:
+                return True
+            if z not in terlihat:
+                terlihat.add(z)
+                stack.append(z)
+    return False
+
+def _pasangan_query(indeks, jumlah, seed):
+    """Pasangan (x, y) acak, kira-kira separuhnya x memang pendahulu y"""
+    rng = random.Random(seed)
+    nama = indeks.nama
+    hasil = []
+    for _ in range(jumlah):
+        y = rng.choice(nama)
+        if rng.random() < 0.5:
+            x = y
+            for _ in range(rng.randint(1, 200)):
+                ortu = indeks.orang_tua(x)
+                if not ortu:
+                    break
+                x = rng.choice(ortu)
+        else:
+            x = rng.choice(nama)
+        hasil.append((x, y))
+    return hasil
+
+def _per_query(fungsi, pasangan):
+    mulai = time.perf_counter()
+    hasil = [fungsi(x, y) for x, y in pasangan]
+    return (time.perf_counter() - mulai) / len(pasangan) * 1e6, hasil
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def bench_pohon(jumlah=1000000, jumlah_query=200000, sampel_penelusuran=2000):
+    """Penyusunan indeks dan query pada pohon sintetis"""
+    print(f"Pohon sintetis {jumlah} orang")
+    rss_awal = _rss_mb()
+    mulai = time.perf_counter()
+    indeks = IndeksSilsilah.dari_pasangan(pohon_sintetis(jumlah))
+    durasi = time.perf_counter() - mulai
+    print(f"  susun indeks:      {durasi:8.2f} s, {indeks.jumlah_interval} interval, "
+          f"RSS naik {_rss_mb() - rss_awal:.0f} MB")
+    
+    pasangan = _pasangan_query(indeks, jumlah_query, seed=1)
+    us, hasil = _per_query(indeks.ancestor, pasangan)
+    print(f"  ancestor (indeks): {us:8.2f} us/query, {sum(hasil)} dari {len(hasil)} benar")
+    sampel = pasangan[:sampel_penelusuran]
+    us_telusur, acuan = _per_query(lambda x, y: ancestor_penelusuran(indeks, x, y), sampel)
+    assert acuan == hasil[:len(sampel)]
+    print(f"  ancestor (telusur):{us_telusur:8.2f} us/query ({len(sampel)} sampel, hasil sama)")
+    us, _ = _per_query(indeks.grandparent, pasangan)
+    print(f"  grandparent:       {us:8.2f} us/query")
+    us, _ = _per_query(indeks.sibling, pasangan)
+    print(f"  sibling:           {us:8.2f} us/query")
+
+def bench_csv(jumlah=1000000):
+    """Baca CSV (orang tua, anak) lalu susun indeks"""
+    teks = io.StringIO()
+    writer = csv.writer(teks)
+    writer.writerow(["orang_tua", "anak"])
+    writer.writerows(pohon_sintetis(jumlah, seed=2))
+    teks.seek(0)
+    mulai = time.perf_counter()
+    indeks = IndeksSilsilah.dari_pasangan(baca_csv(teks))
+    print(f"\nCSV {jumlah} baris -> indeks: {time.perf_counter() - mulai:.2f} s ({indeks.jumlah_orang} orang)")
+
+def bench_dua_orang_tua(generasi=20, per_generasi=50000, lebar=10, jumlah_query=100000,
+                        sampel_penelusuran=500):
+    """Silsilah dengan dua orang tua per anak (graf, bukan pohon)"""
+    asal = "seluruh generasi" if lebar is None else f"keluarga sekitar (lebar {lebar})"
+    print(f"\nSilsilah dua orang tua: {generasi} generasi x {per_generasi} orang, orang tua dari {asal}")
+    mulai = time.perf_counter()
+    indeks = IndeksSilsilah.dari_pasangan(silsilah_dua_orang_tua(generasi, per_generasi, lebar))
+    durasi = time.perf_counter() - mulai
+    tanpa_lengkap = indeks.jumlah_orang - sum(indeks.lengkap)
+    print(f"  susun indeks:      {durasi:8.2f} s, {indeks.jumlah_interval / indeks.jumlah_orang:.1f} interval "
+          f"per orang, {tanpa_lengkap} orang hanya dengan interval pembungkus")
+    pasangan = _pasangan_query(indeks, jumlah_query, seed=3)
+    us, hasil = _per_query(indeks.ancestor, pasangan)
+    print(f"  ancestor (indeks): {us:8.2f} us/query, {sum(hasil)} dari {len(hasil)} benar")
+    sampel = pasangan[:sampel_penelusuran]
+    us_telusur, acuan = _per_query(lambda x, y: ancestor_penelusuran(indeks, x, y), sampel)
+    assert acuan == hasil[:len(sampel)]
+    print(f"  ancestor (telusur):{us_telusur:8.2f} us/query ({len(sampel)} sampel, hasil sama)")
+
+if __name__ == "__main__":
+    bench_pohon()
+    bench_csv()
+    bench_dua_orang_tua()
+    bench_dua_orang_tua(per_generasi=5000, lebar=None, jumlah_query=20000)
@@ -0,0 +1,256 @@
+# diagnosa_batch.py - Diagnosa malaria massal dari matriks gejala pasien
+
+"""
+Mendiagnosa banyak pasien sekaligus dari kuesioner skrining, tanpa sesi
+tanya jawab.
+
+Fakta gejala/2 disusun menjadi matriks boolean penyakit x gejala. Data
+pasien berupa matriks boolean pasien x gejala (NumPy) atau bitmask gejala
+per pasien. Setiap baris pasien diringkas menjadi satu kode bit, lalu hasil
+diagnosa diambil dari tabel yang berisi hasil untuk setiap kode. Urutannya
+sama dengan GUI: penyakit pertama yang semua gejalanya positif.
+
+NumPy dipakai bila terpasang; tanpa NumPy perhitungan yang sama dilakukan
+dengan bitmask integer.
+
+Jalankan dengan:
+    python diagnosa_batch.py pasien.csv -o hasil.csv --kolom-id id
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from diagnosa_engine import BasisPengetahuan
+
+# Nilai sel CSV yang berarti gejala dialami
+NILAI_POSITIF = frozenset({"1", "y", "ya", "true", "t", "yes"})
+
+# Tabel kode gejala hanya dibuat bila ukurannya wajar (2^n entri)
+MAKS_GEJALA_TABEL = 20
+
+# Indeks hasil untuk pasien yang tidak terdeteksi penyakit
+TIDAK_TERDETEKSI = -1
+
+class DiagnosaBatch:
+    """Diagnosa massal berdasarkan matriks penyakit x gejala"""
+    
+    def __init__(self, kb):
+        """Susun matriks dan tabel kode gejala
+        
+        Args:
+            kb (BasisPengetahuan): Basis pengetahuan
+        """
+        self.kb = kb
+        self.jumlah_gejala = len(kb.gejala)
+        self.mask_penyakit = list(kb.mask_penyakit)
+        
+        self.matriks = None
+        self.tabel = None
+        if np is not None:
+            # Matriks penyakit x gejala
+            self.matriks = np.array(
+                [[m >> i & 1 for i in range(self.jumlah_gejala)] for m in self.mask_penyakit],
+                dtype=bool
+            ).reshape(len(self.mask_penyakit), self.jumlah_gejala)
+        if self.jumlah_gejala <= MAKS_GEJALA_TABEL:
+            self.tabel = self._susun_tabel()
+    
+    def _susun_tabel(self):
+        """Hasil diagnosa (indeks penyakit) untuk setiap kode gejala"""
+        ukuran = 1 << self.jumlah_gejala
+        if np is None:
+            tabel = [TIDAK_TERDETEKSI] * ukuran
+            for kode in range(ukuran):
+                tabel[kode] = self._indeks_pertama(kode)
+            return tabel
+        
+        kode = np.arange(ukuran, dtype=np.uint64)
+        tabel = np.full(ukuran, TIDAK_TERDETEKSI, dtype=np.int8 if len(self.mask_penyakit) < 127 else np.int32)
+        # Dari penyakit terakhir ke pertama, agar penyakit yang lebih dulu menang
+        for i in range(len(self.mask_penyakit) - 1, -1, -1):
+            m = np.uint64(self.mask_penyakit[i])
+            tabel[(kode & m) == m] = i
+        return tabel
+    
+    def _indeks_pertama(self, kode):
+        for i, m in enumerate(self.mask_penyakit):
+            if kode & m == m:
+                return i
+        return TIDAK_TERDETEKSI
+    
+    def kode_gejala(self, pasien):
+        """Ringkas matriks pasien x gejala menjadi satu kode bit per pasien
+        
+        Args:
+            pasien: Array boolean/0-1 berukuran (jumlah pasien, jumlah gejala),
+                    kolom sesuai urutan kb.gejala
+        
+        Returns:
+            numpy.ndarray: Kode uint64 per pasien
+        """
+        pasien = np.asarray(pasien)
+        if pasien.ndim != 2 or pasien.shape[1] != self.jumlah_gejala:
+            raise ValueError(f"Matriks pasien harus berukuran (n, {self.jumlah_gejala})")
+        if self.jumlah_gejala > 64:
+            raise ValueError("Kode gejala hanya mendukung sampai 64 gejala")
+        # Setiap 8 kolom digabung menjadi satu byte, lalu byte-byte itu digeser ke posisinya
+        per_byte = np.packbits(pasien.astype(bool), axis=1, bitorder="little").astype(np.uint64)
+        geser = np.uint64(8) * np.arange(per_byte.shape[1], dtype=np.uint64)
+        return np.bitwise_or.reduce(per_byte << geser, axis=1)
+    
+    def diagnosa_kode(self, kode):
+        """Indeks penyakit untuk setiap kode gejala
+        
+        Args:
+            kode: Array NumPy kode gejala, atau list bitmask integer
+        
+        Returns:
+            Array/list indeks penyakit, TIDAK_TERDETEKSI bila tidak ada yang cocok
+        """
+        if np is None or isinstance(kode, list):
+            if self.tabel is not None:
+                tabel = self.tabel
+                return [tabel[k] for k in kode]
+            return [self._indeks_pertama(k) for k in kode]
+        
+        if self.tabel is not None:
+            return np.asarray(self.tabel)[kode.astype(np.intp)]
+        hasil = np.full(len(kode), TIDAK_TERDETEKSI, dtype=np.int32)
+        for i in range(len(self.mask_penyakit) - 1, -1, -1):
+            m = np.uint64(self.mask_penyakit[i])
+            hasil[(kode & m) == m] = i
+        return hasil
+    
+    def diagnosa_matriks(self, pasien):
+        """Indeks penyakit untuk setiap baris matriks pasien x gejala"""
+        return self.diagnosa_kode(self.kode_gejala(pasien))
+    
+    def cocok_semua(self, pasien):
+        """Semua penyakit yang cocok, bukan hanya yang pertama
+        
+        Args:
+            pasien: Array boolean berukuran (jumlah pasien, jumlah gejala)
+        
+        Returns:
+            numpy.ndarray: Boolean (jumlah pasien, jumlah penyakit)
+        """
+        if np is None:
+            raise RuntimeError("cocok_semua membutuhkan NumPy")
+        pasien = np.asarray(pasien, dtype=bool)
+        # Jumlah gejala penyakit yang tidak dialami pasien harus nol
+        kurang = (~pasien).astype(np.int32) @ self.matriks.T.astype(np.int32)
+        return kurang == 0
+    
+    def nama(self, indeks):
+        """Nama penyakit dari indeks hasil, None bila tidak terdeteksi"""
+        return None if indeks == TIDAK_TERDETEKSI else self.kb.penyakit[indeks]
+    
+    def baca_csv(self, f, ukuran_potongan=100000, kolom_id=None):
+        """Baca CSV pasien per potongan
+        
+        Baris pertama berisi nama kolom; kolom bernama gejala dibaca, kolom
+        lain diabaikan. Gejala yang kolomnya tidak ada dianggap tidak dialami,
+        begitu juga sel yang hilang karena barisnya lebih pendek dari header.
+        
+        Args:
+            f: File teks yang sudah dibuka
+            ukuran_potongan (int): Jumlah baris per potongan
+            kolom_id (str): Kolom opsional yang ikut dikembalikan sebagai ID
+        
+        Yields:
+            tuple: (daftar ID atau None, kode gejala per pasien)
+        """
+        reader = csv.reader(f)
+        header = [nama.strip() for nama in next(reader, [])]
+        posisi = {nama: i for i, nama in enumerate(header)}
+        kolom = [(posisi[g], self.kb.indeks_gejala[g]) for g in self.kb.gejala if g in posisi]
+        hilang = [g for g in self.kb.gejala if g not in posisi]
+        if hilang:
+            print(f"Peringatan: kolom gejala tidak ada, dianggap tidak dialami: {', '.join(hilang)}",
+                  file=sys.stderr)
+        if kolom_id is not None and kolom_id not in posisi:
+            raise ValueError(f"Kolom ID tidak ada: {kolom_id}")
+        indeks_id = posisi.get(kolom_id)
+        
+        potongan = []
+        for baris in reader:
+            if not baris:
+                continue
+            if len(baris) < len(header):
+                # Sel yang hilang di akhir baris dianggap kosong (tidak dialami)
+                baris = baris + [""] * (len(header) - len(baris))
+            potongan.append(baris)
+            if len(potongan) >= ukuran_potongan:
+                yield self._kode_potongan(potongan, kolom, indeks_id)
+                potongan = []
+        if potongan:
+            yield self._kode_potongan(potongan, kolom, indeks_id)
+    
+    def _kode_potongan(self, potongan, kolom, indeks_id):
+        ids = [baris[indeks_id] for baris in potongan] if indeks_id is not None else None
+        if np is not None:
+            kode = np.zeros(len(potongan), dtype=np.uint64)
+            for posisi, bit in kolom:
+                positif = np.fromiter(
+                    (baris[posisi].strip().lower() in NILAI_POSITIF for baris in potongan),
+                    dtype=bool, count=len(potongan)
+                )
+                kode |= positif.astype(np.uint64) << np.uint64(bit)
+            return ids, kode
+        
+        bit_kolom = [(posisi, 1 << bit) for posisi, bit in kolom]
+        kode = []
+        for baris in potongan:
+            k = 0
+            for posisi, bit in bit_kolom:
+                if baris[posisi].strip().lower() in NILAI_POSITIF:
+                    k |= bit
+            kode.append(k)
+        return ids, kode
+
+def main():
+    parser = argparse.ArgumentParser(description="Diagnosa malaria massal dari CSV kuesioner")
+    parser.add_argument("input", help="File CSV pasien, '-' untuk stdin")
+    parser.add_argument("-o", "--output", help="File CSV hasil (default: stdout)")
+    parser.add_argument("--kb", default="pakar_malaria_gui.pl", help="File basis pengetahuan")
+    parser.add_argument("--kolom-id", help="Kolom ID pasien yang ikut ditulis")
+    parser.add_argument("--ukuran-potongan", type=int, default=100000, help="Baris per potongan")
+    args = parser.parse_args()
+    
+    batch = DiagnosaBatch(BasisPengetahuan.dari_file(args.kb))
+    nama = [""] + batch.kb.penyakit
+    f_in = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8-sig")
+    f_out = sys.stdout if not args.output else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.writer(f_out)
+        writer.writerow([args.kolom_id or "baris", "diagnosa"])
+        nomor = 0
+        for ids, kode in batch.baca_csv(f_in, args.ukuran_potongan, args.kolom_id):
+            hasil = batch.diagnosa_kode(kode)
+            if ids is None:
+                ids = range(nomor + 1, nomor + len(hasil) + 1)
+            # Indeks -1 (tidak terdeteksi) menjadi sel kosong
+            writer.writerows(zip(ids, (nama[i + 1] for i in hasil)))
+            nomor += len(hasil)
+    except (ValueError, csv.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # Pembaca stdout sudah berhenti (misalnya dialirkan ke head)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if f_in is not sys.stdin:
+            f_in.close()
+        if f_out is not sys.stdout:
+            f_out.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+# diagnosa_engine.py - Mesin diagnosa malaria tanpa query Prolog per langkah
+
+"""
+Memuat fakta penyakit/1, gejala/2 dan pertanyaan/2 dari pakar_malaria_gui.pl
+satu kali, lalu menyusunnya menjadi pohon pertanyaan.
+
+Hasil diagnosa sama dengan penelusuran di pakar_malaria_gui.py: penyakit
+pertama (sesuai urutan fakta penyakit/1) yang semua gejalanya positif.
+Bedanya, urutan pertanyaan dipilih berdasarkan information gain sehingga
+rata-rata jumlah pertanyaan per pasien lebih sedikit, dan selama sesi
+diagnosa tidak ada query ke Prolog sama sekali.
+
+Jawaban setiap pasien disimpan di objek SesiDiagnosa masing-masing (posisi
+di pohon dan bitmask gejala positif/negatif), bukan di database Prolog
+bersama. Pohon tidak pernah diubah setelah disusun, sehingga banyak sesi
+dari thread atau server asyncio dapat berjalan bersamaan.
+
+Contoh:
+    mesin = MesinDiagnosa("pakar_malaria_gui.pl")
+    sesi = mesin.mulai_sesi()
+    while not sesi.selesai:
+        sesi.jawab(input(sesi.pertanyaan + " (y/t) ") == "y")
+    print(sesi.hasil)
+"""
+
+import itertools
+import math
+import re
+import threading
+
+# Jumlah gejala maksimum untuk menyusun pohon secara eksak (2^n kemungkinan pasien)
+MAKS_GEJALA_POHON = 20
+
+# Pola fakta yang dibaca dari file .pl
+_POLA_PENYAKIT = re.compile(r'^penyakit\(\s*"([^"]*)"\s*\)\s*\.', re.MULTILINE)
+_POLA_GEJALA = re.compile(r'^gejala\(\s*([a-z]\w*)\s*,\s*"([^"]*)"\s*\)\s*\.', re.MULTILINE)
+_POLA_PERTANYAAN = re.compile(
+    r'^pertanyaan\(\s*([a-z]\w*)\s*,\s*([A-Z_]\w*)\s*\)\s*:-\s*\2\s*=\s*"([^"]*)"\s*\.',
+    re.MULTILINE
+)
+
+class BasisPengetahuan:
+    """Fakta penyakit dan gejala dalam bentuk bitmask"""
+    
+    def __init__(self, penyakit, gejala, pertanyaan):
+        """Inisialisasi basis pengetahuan
+        
+        Args:
+            penyakit (list): Nama penyakit sesuai urutan penelusuran
+            gejala (list): Pasangan (gejala, penyakit) sesuai urutan fakta gejala/2
+            pertanyaan (dict): Teks pertanyaan untuk setiap gejala
+        """
+        self.penyakit = list(penyakit)
+        self.pertanyaan = dict(pertanyaan)
+        
+        # Gejala diberi nomor bit sesuai urutan kemunculannya
+        self.gejala = []
+        self.indeks_gejala = {}
+        self.gejala_penyakit = {p: [] for p in self.penyakit}
+        for g, p in gejala:
+            if p not in self.gejala_penyakit:
+                raise ValueError(f"Gejala {g} untuk penyakit yang tidak dikenal: {p}")
+            if g not in self.indeks_gejala:
+                self.indeks_gejala[g] = len(self.gejala)
+                self.gejala.append(g)
+            self.gejala_penyakit[p].append(g)
+        
+        tanpa_pertanyaan = [g for g in self.gejala if g not in self.pertanyaan]
+        if tanpa_pertanyaan:
+            raise ValueError(f"Gejala tanpa pertanyaan: {', '.join(tanpa_pertanyaan)}")
+        
+        # Satu bitmask per penyakit, urutannya sama dengan self.penyakit
+        self.mask_penyakit = [self.mask(self.gejala_penyakit[p]) for p in self.penyakit]
+    
+    @classmethod
+    def dari_file(cls, path="pakar_malaria_gui.pl"):
+        """Baca fakta dari file Prolog tanpa menjalankan Prolog
+        
+        Hanya bentuk fakta seperti di pakar_malaria_gui.pl yang dibaca:
+        penyakit("..."), gejala(atom, "...") dan
+        pertanyaan(atom, Y) :- Y = "...".
+        
+        Args:
+            path (str): Lokasi file .pl
+        
+        Returns:
+            BasisPengetahuan: Basis pengetahuan hasil pembacaan
+        """
+        with open(path, encoding="utf-8") as f:
+            # Buang komentar baris agar fakta yang dikomentari tidak ikut terbaca
+            teks = re.sub(r"%.*", "", f.read())
+        return cls(
+            _POLA_PENYAKIT.findall(teks),
+            _POLA_GEJALA.findall(teks),
+            {g: teks_pertanyaan for g, _, teks_pertanyaan in _POLA_PERTANYAAN.findall(teks)}
+        )
+    
+    @classmethod
+    def dari_prolog(cls, prolog):
+        """Ambil fakta dari Prolog yang sudah di-consult, cukup tiga query
+        
+        Args:
+            prolog: Objek pyswip.Prolog
+        
+        Returns:
+            BasisPengetahuan: Basis pengetahuan hasil query
+        """
+        def teks(nilai):
+            return nilai.decode() if isinstance(nilai, bytes) else str(nilai)
+        
+        penyakit = [teks(p["X"]) for p in prolog.query("penyakit(X)")]
+        gejala = [(teks(g["G"]), teks(g["P"])) for g in prolog.query("gejala(G, P)")]
+        pertanyaan = {teks(q["G"]): teks(q["Y"]) for q in prolog.query("pertanyaan(G, Y)")}
+        return cls(penyakit, gejala, pertanyaan)
+    
+    def mask(self, daftar_gejala):
+        """Ubah daftar gejala menjadi bitmask"""
+        hasil = 0
+        for g in daftar_gejala:
+            hasil |= 1 << self.indeks_gejala[g]
+        return hasil
+    
+    def diagnosa(self, positif):
+        """Diagnosa dari bitmask gejala positif
+        
+        Args:
+            positif (int): Bitmask gejala yang dialami pasien
+        
+        Returns:
+            str: Penyakit pertama yang semua gejalanya positif, atau None
+        """
+        for p, m in zip(self.penyakit, self.mask_penyakit):
+            if positif & m == m:
+                return p
+        return None
+
+class Simpul:
+    """Simpul pohon pertanyaan, daun bila gejala bernilai None"""
+    
+    __slots__ = ("gejala", "bit", "ya", "tidak", "hasil")
+    
+    def __init__(self, gejala=None, bit=0, ya=None, tidak=None, hasil=None):
+        self.gejala = gejala
+        self.bit = bit
+        self.ya = ya
+        self.tidak = tidak
+        self.hasil = hasil
+    
+    @property
+    def daun(self):
+        return self.gejala is None
+    
+    def lanjut(self, jawaban):
+        """Simpul berikutnya setelah pertanyaan simpul ini dijawab"""
+        return self.ya if jawaban else self.tidak
+
+class PohonPertanyaan:
+    """Pohon keputusan urutan pertanyaan berdasarkan information gain"""
+    
+    def __init__(self, kb, prevalensi=None):
+        """Susun pohon pertanyaan
+        
+        Setiap kemungkinan himpunan gejala pasien diberi bobot dari peluang
+        tiap gejala (default 0.5, artinya semua kemungkinan sama besar). Di
+        setiap simpul dipilih gejala dengan information gain terbesar
+        terhadap hasil diagnosa; bila sama, gejala yang lebih dulu muncul.
+        
+        Args:
+            kb (BasisPengetahuan): Basis pengetahuan
+            prevalensi (dict): Peluang opsional setiap gejala dialami pasien
+        """
+        n = len(kb.gejala)
+        if n > MAKS_GEJALA_POHON:
+            raise ValueError(f"Terlalu banyak gejala untuk pohon eksak ({n} > {MAKS_GEJALA_POHON})")
+        self.kb = kb
+        prevalensi = prevalensi or {}
+        peluang = [prevalensi.get(g, 0.5) for g in kb.gejala]
+        
+        # Semua kemungkinan pasien: (bitmask gejala, bobot, indeks hasil diagnosa)
+        hasil_ke_indeks = {p: i for i, p in enumerate(kb.penyakit)}
+        kemungkinan = []
+        for positif in range(1 << n):
+            bobot = 1.0
+            for i, q in enumerate(peluang):
+                bobot *= q if positif >> i & 1 else 1.0 - q
+            if bobot > 0:
+                hasil = kb.diagnosa(positif)
+                kemungkinan.append((positif, bobot, hasil_ke_indeks.get(hasil, -1)))
+        
+        self.jumlah_simpul = 0
+        self.akar = self._susun(kemungkinan, 0)
+        self.rata_rata_pertanyaan = self._rata_rata(self.akar, kemungkinan)
+    
+    @staticmethod
+    def _entropi(bobot_hasil, total):
+        h = 0.0
+        for w in bobot_hasil.values():
+            if w > 0:
+                h -= w / total * math.log2(w / total)
+        return h
+    
+    def _susun(self, kemungkinan, sudah_ditanya):
+        self.jumlah_simpul += 1
+        hasil_unik = {k[2] for k in kemungkinan}
+        if len(hasil_unik) == 1:
+            indeks = hasil_unik.pop()
+            return Simpul(hasil=self.kb.penyakit[indeks] if indeks >= 0 else None)
+        
+        total = sum(k[1] for k in kemungkinan)
+        terbaik = None
+        for i in range(len(self.kb.gejala)):
+            bit = 1 << i
+            if sudah_ditanya & bit:
+                continue
+            ya, tidak = {}, {}
+            for positif, bobot, hasil in kemungkinan:
+                cabang = ya if positif & bit else tidak
+                cabang[hasil] = cabang.get(hasil, 0.0) + bobot
+            bobot_ya = sum(ya.values())
+            bobot_tidak = total - bobot_ya
+            if not ya or not tidak:
+                continue
+            # Entropi awal sama untuk semua gejala, cukup bandingkan entropi sisa
+            sisa = (bobot_ya * self._entropi(ya, bobot_ya) + bobot_tidak * self._entropi(tidak, bobot_tidak)) / total
+            if terbaik is None or sisa < terbaik[0] - 1e-12:
+                terbaik = (sisa, i)
+        
+        i = terbaik[1]
+        bit = 1 << i
+        return Simpul(
+            gejala=self.kb.gejala[i],
+            bit=bit,
+            ya=self._susun([k for k in kemungkinan if k[0] & bit], sudah_ditanya | bit),
+            tidak=self._susun([k for k in kemungkinan if not k[0] & bit], sudah_ditanya | bit)
+        )
+    
+    @staticmethod
+    def _rata_rata(akar, kemungkinan):
+        """Rata-rata jumlah pertanyaan sesuai bobot setiap kemungkinan pasien"""
+        total = jumlah = 0.0
+        for positif, bobot, _ in kemungkinan:
+            simpul, langkah = akar, 0
+            while not simpul.daun:
+                simpul = simpul.lanjut(positif & simpul.bit)
+                langkah += 1
+            jumlah += bobot * langkah
+            total += bobot
+        return jumlah / total
+    
+    def kedalaman(self, simpul=None):
+        """Jumlah pertanyaan terbanyak dalam satu sesi"""
+        simpul = simpul or self.akar
+        if simpul.daun:
+            return 0
+        return 1 + max(self.kedalaman(simpul.ya), self.kedalaman(simpul.tidak))
+    
+    def diagnosa(self, jawab):
+        """Jalankan satu sesi diagnosa
+        
+        Args:
+            jawab: Fungsi yang menerima nama gejala dan mengembalikan True
+                   bila pasien mengalaminya
+        
+        Returns:
+            tuple: (penyakit atau None, jumlah pertanyaan yang diajukan)
+        """
+        simpul, jumlah = self.akar, 0
+        while not simpul.daun:
+            simpul = simpul.lanjut(jawab(simpul.gejala))
+            jumlah += 1
+        return simpul.hasil, jumlah
+    
+    def diagnosa_mask(self, positif):
+        """Diagnosa dari bitmask gejala, lihat BasisPengetahuan.diagnosa"""
+        simpul = self.akar
+        while not simpul.daun:
+            simpul = simpul.ya if positif & simpul.bit else simpul.tidak
+        return simpul.hasil
+
+class SesiDiagnosa:
+    """Status diagnosa satu pasien"""
+    
+    __slots__ = ("kb", "simpul", "positif", "negatif", "jumlah_pertanyaan")
+    
+    def __init__(self, pohon):
+        """Mulai sesi dari akar pohon
+        
+        Args:
+            pohon (PohonPertanyaan): Pohon pertanyaan yang dipakai bersama
+        """
+        self.kb = pohon.kb
+        self.simpul = pohon.akar
+        # Bitmask gejala yang sudah dijawab ya dan tidak
+        self.positif = 0
+        self.negatif = 0
+        self.jumlah_pertanyaan = 0
+    
+    @property
+    def selesai(self):
+        return self.simpul.daun
+    
+    @property
+    def gejala(self):
+        """Gejala yang sedang ditanyakan, None bila sesi selesai"""
+        return self.simpul.gejala
+    
+    @property
+    def pertanyaan(self):
+        """Teks pertanyaan yang sedang diajukan, None bila sesi selesai"""
+        return None if self.simpul.daun else self.kb.pertanyaan[self.simpul.gejala]
+    
+    @property
+    def hasil(self):
+        """Penyakit hasil diagnosa, None bila tidak terdeteksi atau belum selesai"""
+        return self.simpul.hasil
+    
+    def jawab(self, ya):
+        """Catat jawaban untuk pertanyaan saat ini dan lanjut ke pertanyaan berikutnya
+        
+        Args:
+            ya (bool): True bila pasien mengalami gejala yang ditanyakan
+        """
+        if self.simpul.daun:
+            raise ValueError("Sesi diagnosa sudah selesai")
+        if ya:
+            self.positif |= self.simpul.bit
+        else:
+            self.negatif |= self.simpul.bit
+        self.simpul = self.simpul.lanjut(ya)
+        self.jumlah_pertanyaan += 1
+    
+    def gejala_positif(self):
+        """Daftar gejala yang dijawab ya"""
+        return [g for i, g in enumerate(self.kb.gejala) if self.positif >> i & 1]
+
+def muat_basis_pengetahuan(path="pakar_malaria_gui.pl"):
+    """Muat fakta lewat pyswip bila tersedia, selain itu baca file .pl langsung
+    
+    Args:
+        path (str): Lokasi file .pl
+    
+    Returns:
+        BasisPengetahuan: Basis pengetahuan hasil pemuatan
+    """
+    try:
+        from pyswip import Prolog
+    except ImportError:
+        return BasisPengetahuan.dari_file(path)
+    prolog = Prolog()
+    prolog.consult(path)
+    return BasisPengetahuan.dari_prolog(prolog)
+
+class MesinDiagnosa:
+    """Satu basis pengetahuan dan pohon untuk banyak sesi sekaligus"""
+    
+    def __init__(self, path="pakar_malaria_gui.pl", kb=None, prevalensi=None):
+        """Muat fakta sekali dan susun pohon pertanyaan
+        
+        Args:
+            path (str): Lokasi file .pl
+            kb (BasisPengetahuan): Basis pengetahuan yang sudah dimuat, opsional
+            prevalensi (dict): Peluang opsional setiap gejala, lihat PohonPertanyaan
+        """
+        self.kb = kb if kb is not None else muat_basis_pengetahuan(path)
+        self.pohon = PohonPertanyaan(self.kb, prevalensi)
+        # Sesi yang diakses lewat ID, misalnya dari server
+        self._sesi = {}
+        self._id = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def mulai_sesi(self):
+        """Buat sesi baru yang tidak terdaftar, untuk dipakai langsung"""
+        return SesiDiagnosa(self.pohon)
+    
+    def buka(self):
+        """Buat sesi baru yang terdaftar dengan ID
+        
+        Returns:
+            tuple: (ID sesi, SesiDiagnosa)
+        """
+        sesi = SesiDiagnosa(self.pohon)
+        with self._lock:
+            id_sesi = next(self._id)
+            self._sesi[id_sesi] = sesi
+        return id_sesi, sesi
+    
+    def ambil(self, id_sesi):
+        """Ambil sesi terdaftar, KeyError bila tidak ada"""
+        return self._sesi[id_sesi]
+    
+    def tutup(self, id_sesi):
+        """Hapus sesi terdaftar, mengembalikan sesinya atau None"""
+        with self._lock:
+            return self._sesi.pop(id_sesi, None)
+    
+    @property
+    def jumlah_sesi(self):
+        return len(self._sesi)
@@ -0,0 +1,103 @@
+# server_diagnosa.py - Server asyncio untuk banyak sesi diagnosa malaria sekaligus
+
+"""
+Setiap baris yang dikirim klien adalah satu objek JSON, dan server membalas
+dengan satu baris JSON:
+
+    {"aksi": "mulai"}                              -> {"sesi": 1, "pertanyaan": "..."}
+    {"aksi": "jawab", "sesi": 1, "jawaban": true}  -> {"sesi": 1, "pertanyaan": "..."}
+                                                   -> {"sesi": 1, "selesai": true, "hasil": "..."}
+    {"aksi": "batal", "sesi": 1}                   -> {"sesi": 1, "batal": true}
+
+Sesi yang selesai langsung dihapus. Sesi yang masih terbuka saat koneksinya
+putus juga dihapus.
+
+Jalankan dengan:
+    python server_diagnosa.py --port 8090
+"""
+
+import argparse
+import asyncio
+import json
+
+from diagnosa_engine import MesinDiagnosa
+
+class ServerDiagnosa:
+    """Protokol baris JSON di atas MesinDiagnosa"""
+    
+    def __init__(self, mesin):
+        self.mesin = mesin
+    
+    async def tangani_koneksi(self, reader, writer):
+        # Sesi milik koneksi ini, dihapus saat koneksi putus
+        milik = set()
+        try:
+            while True:
+                baris = await reader.readline()
+                if not baris:
+                    break
+                try:
+                    balasan = self.proses(json.loads(baris), milik)
+                except (ValueError, KeyError, TypeError) as e:
+                    balasan = {"error": str(e)}
+                writer.write(json.dumps(balasan).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for id_sesi in milik:
+                self.mesin.tutup(id_sesi)
+            writer.close()
+    
+    def proses(self, pesan, milik):
+        """Jalankan satu perintah dan kembalikan balasannya"""
+        if not isinstance(pesan, dict):
+            raise ValueError("Pesan harus berupa objek JSON")
+        aksi = pesan.get("aksi")
+        if aksi == "mulai":
+            id_sesi, sesi = self.mesin.buka()
+            milik.add(id_sesi)
+        elif aksi in ("jawab", "batal"):
+            id_sesi = pesan["sesi"]
+            if id_sesi not in milik:
+                raise KeyError(f"Sesi {id_sesi} tidak ditemukan")
+            if aksi == "batal":
+                milik.discard(id_sesi)
+                self.mesin.tutup(id_sesi)
+                return {"sesi": id_sesi, "batal": True}
+            jawaban = pesan["jawaban"]
+            if not isinstance(jawaban, bool):
+                # "false" sebagai string tidak boleh dianggap ya
+                raise ValueError("jawaban harus true atau false")
+            sesi = self.mesin.ambil(id_sesi)
+            sesi.jawab(jawaban)
+        else:
+            raise ValueError(f"Aksi tidak dikenal: {aksi}")
+        
+        if sesi.selesai:
+            milik.discard(id_sesi)
+            self.mesin.tutup(id_sesi)
+            return {"sesi": id_sesi, "selesai": True, "hasil": sesi.hasil}
+        return {"sesi": id_sesi, "pertanyaan": sesi.pertanyaan, "gejala": sesi.gejala}
+
+async def jalankan(server, host="127.0.0.1", port=8090):
+    tcp = await asyncio.start_server(server.tangani_koneksi, host, port)
+    print(f"Server diagnosa berjalan di {host}:{port}")
+    async with tcp:
+        await tcp.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Server diagnosa malaria (baris JSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--kb", default="pakar_malaria_gui.pl", help="File basis pengetahuan")
+    args = parser.parse_args()
+    
+    server = ServerDiagnosa(MesinDiagnosa(args.kb))
+    try:
+        asyncio.run(jalankan(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
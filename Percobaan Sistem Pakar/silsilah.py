@@ -0,0 +1,555 @@
+# silsilah.py - Indeks silsilah keluarga untuk query ancestor, grandparent dan sibling
+
+"""
+Memuat fakta parent/2 lalu menyusun indeks keterjangkauan (reachability)
+agar query silsilah tetap cepat pada data ratusan ribu sampai jutaan orang.
+
+Fakta dapat dibaca dari file .pl seperti silsilah.pl, dari CSV dua kolom
+(orang tua, anak), atau dari file mirip GEDCOM (record FAM dengan HUSB, WIFE
+dan CHIL). Semua pembaca berupa generator sehingga file dibaca baris demi
+baris.
+
+Indeks memakai interval labelling: setiap orang diberi nomor post-order
+dari penelusuran DFS, dan keturunan seseorang adalah nomor-nomor di dalam
+interval miliknya. Pada pohon (satu orang tua per orang) setiap orang
+cukup memiliki satu interval, sehingga ancestor/2 hanya dua perbandingan.
+Pada silsilah dengan dua orang tua, interval anak-anak digabung ke interval
+orang tuanya; orang yang keturunannya tersebar mendapat interval tambahan
+yang dicari dengan bisect. Agar indeks tidak membengkak, jumlah interval
+per orang dibatasi MAKS_INTERVAL. Orang yang melewati batas itu hanya
+menyimpan satu interval pembungkus (semua keturunannya pasti di dalamnya),
+dan query untuknya menelusuri keturunan yang intervalnya memuat target
+sampai bertemu orang dengan interval lengkap. Penelusuran itu dipangkas
+dengan beberapa interval pembungkus lagi dari DFS berurutan acak (cara
+GRAIL), yang hanya disusun bila ada orang yang melewati batas.
+
+Sebagai alternatif, PrologSilsilah menjalankan query yang sama di
+SWI-Prolog dengan ancestor/2 yang di-table (lihat silsilah.pl).
+
+Contoh:
+    indeks = IndeksSilsilah.dari_pasangan(baca_pl("silsilah.pl"))
+    indeks.ancestor("alya", "grace")   # True
+    indeks.saudara("david")            # ['emma']
+"""
+
+import csv
+import itertools
+import random
+import re
+from array import array
+from bisect import bisect_right
+
+# Batas interval per orang sebelum hanya interval pembungkus yang disimpan
+MAKS_INTERVAL = 32
+
+# Jumlah interval pembungkus tambahan untuk memangkas penelusuran
+JUMLAH_LABEL_ACAK = 3
+
+# Fakta parent/2 di file .pl, nama berupa atom atau string berkutip
+_POLA_PARENT = re.compile(
+    r"""^\s*parent\(\s*('[^']*'|"[^"]*"|[a-z]\w*)\s*,\s*('[^']*'|"[^"]*"|[a-z]\w*)\s*\)\s*\.""",
+    re.MULTILINE
+)
+
+def _tanpa_kutip(nama):
+    if len(nama) >= 2 and nama[0] == nama[-1] and nama[0] in "'\"":
+        return nama[1:-1]
+    return nama
+
+def baca_pl(path):
+    """Baca fakta parent/2 dari file Prolog
+    
+    Args:
+        path (str): Lokasi file .pl
+    
+    Yields:
+        tuple: (orang tua, anak)
+    """
+    with open(path, encoding="utf-8") as f:
+        # Buang komentar baris agar fakta yang dikomentari tidak ikut terbaca
+        teks = re.sub(r"%.*", "", f.read())
+    for orang_tua, anak in _POLA_PARENT.findall(teks):
+        yield _tanpa_kutip(orang_tua), _tanpa_kutip(anak)
+
+def baca_csv(f, header=True):
+    """Baca pasangan (orang tua, anak) dari CSV dua kolom
+    
+    Args:
+        f: File teks yang sudah dibuka
+        header (bool): Apakah baris pertama berisi nama kolom
+    
+    Yields:
+        tuple: (orang tua, anak)
+    """
+    reader = csv.reader(f)
+    if header:
+        next(reader, None)
+    for nomor, baris in enumerate(reader, start=2 if header else 1):
+        if not baris:
+            continue
+        if len(baris) < 2:
+            raise ValueError(f"Baris {nomor}: butuh dua kolom (orang tua, anak)")
+        yield baris[0].strip(), baris[1].strip()
+
+def baca_gedcom(f):
+    """Baca hubungan orang tua dari file mirip GEDCOM
+    
+    Hanya record keluarga yang dibaca: setiap anak (CHIL) dipasangkan
+    dengan ayah (HUSB) dan ibu (WIFE) di record FAM yang sama. Orang
+    dikenali dari xref-nya, misalnya @I1@ menjadi I1.
+    
+    Args:
+        f: File teks yang sudah dibuka
+    
+    Yields:
+        tuple: (orang tua, anak)
+    """
+    orang_tua, anak = [], []
+    dalam_fam = False
+    for baris in f:
+        bagian = baris.split()
+        if len(bagian) < 2:
+            continue
+        if bagian[0] == "0":
+            # Record baru, keluarkan pasangan dari record FAM sebelumnya
+            for o in orang_tua:
+                for a in anak:
+                    yield o, a
+            orang_tua, anak = [], []
+            dalam_fam = len(bagian) >= 3 and bagian[2] == "FAM"
+        elif dalam_fam and bagian[0] == "1" and len(bagian) >= 3:
+            if bagian[1] in ("HUSB", "WIFE"):
+                orang_tua.append(bagian[2].strip("@"))
+            elif bagian[1] == "CHIL":
+                anak.append(bagian[2].strip("@"))
+    for o in orang_tua:
+        for a in anak:
+            yield o, a
+
+def _csr(jumlah, sumber, tujuan):
+    """Susun daftar tetangga padat (offset, isi) dari daftar sisi"""
+    offset = array("l", bytes(array("l").itemsize * (jumlah + 1)))
+    for s in sumber:
+        offset[s + 1] += 1
+    for i in range(jumlah):
+        offset[i + 1] += offset[i]
+    posisi = array("l", offset)
+    isi = array("l", bytes(array("l").itemsize * len(sumber)))
+    for s, t in zip(sumber, tujuan):
+        isi[posisi[s]] = t
+        posisi[s] += 1
+    return offset, isi
+
+class IndeksSilsilah:
+    """Indeks keterjangkauan untuk fakta parent/2"""
+    
+    def __init__(self, nama, orang_tua, anak, nomor=None):
+        """Inisialisasi indeks, biasanya lewat dari_pasangan
+        
+        Args:
+            nama (list): Nama setiap orang sesuai nomornya
+            orang_tua (list): Nomor orang tua untuk setiap sisi
+            anak (list): Nomor anak untuk setiap sisi
+            nomor (dict): Nomor untuk setiap nama, dibuat dari nama bila tidak diberikan
+        """
+        self.nama = nama
+        self.nomor = nomor if nomor is not None else {n: i for i, n in enumerate(nama)}
+        jumlah = len(nama)
+        self._anak = _csr(jumlah, orang_tua, anak)
+        self._orang_tua = _csr(jumlah, anak, orang_tua)
+        self._susun_interval()
+    
+    @classmethod
+    def dari_pasangan(cls, pasangan):
+        """Susun indeks dari iterable pasangan (orang tua, anak)
+        
+        Args:
+            pasangan: Iterable (orang tua, anak), misalnya dari baca_pl,
+                      baca_csv atau baca_gedcom
+        
+        Returns:
+            IndeksSilsilah: Indeks yang siap dipakai
+        """
+        nama, nomor = [], {}
+        sisi_orang_tua, sisi_anak = array("l"), array("l")
+        for orang_tua, anak in pasangan:
+            for n, sisi in ((orang_tua, sisi_orang_tua), (anak, sisi_anak)):
+                i = nomor.get(n)
+                if i is None:
+                    i = nomor[n] = len(nama)
+                    nama.append(n)
+                sisi.append(i)
+        return cls(nama, sisi_orang_tua, sisi_anak, nomor)
+    
+    def _susun_interval(self):
+        """Beri nomor post-order lalu gabungkan interval keturunan
+        
+        DFS dilakukan tanpa rekursi sehingga silsilah yang sangat dalam
+        tidak menghabiskan stack. Pada graf tanpa siklus setiap anak selesai
+        sebelum orang tuanya, jadi interval dapat digabung sesuai urutan
+        post-order.
+        """
+        jumlah = len(self.nama)
+        offset_anak, isi_anak = self._anak
+        offset_ortu = self._orang_tua[0]
+        # 0 = belum dikunjungi, 1 = sedang di stack, 2 = selesai
+        status = bytearray(jumlah)
+        post = array("l", bytes(array("l").itemsize * jumlah))
+        urutan = array("l")
+        
+        akar = [i for i in range(jumlah) if offset_ortu[i] == offset_ortu[i + 1]]
+        # Orang yang tidak terjangkau dari akar mana pun pasti berada di siklus
+        for mulai in itertools.chain(akar, range(jumlah)):
+            if status[mulai]:
+                continue
+            status[mulai] = 1
+            stack = [(mulai, offset_anak[mulai])]
+            while stack:
+                v, k = stack[-1]
+                if k < offset_anak[v + 1]:
+                    stack[-1] = (v, k + 1)
+                    c = isi_anak[k]
+                    if status[c] == 0:
+                        status[c] = 1
+                        stack.append((c, offset_anak[c]))
+                    elif status[c] == 1:
+                        raise ValueError(
+                            f"Silsilah mengandung siklus: {self.nama[c]} adalah keturunannya sendiri"
+                        )
+                else:
+                    stack.pop()
+                    status[v] = 2
+                    post[v] = len(urutan)
+                    urutan.append(v)
+        
+        # Interval utama [awal, post] selalu berakhir di nomor orang itu sendiri
+        awal = array("l", post)
+        tambahan = {}
+        # 1 bila interval orang itu lengkap, 0 bila hanya interval pembungkus
+        lengkap = bytearray(b"\x01") * jumlah
+        for v in urutan:
+            mulai, selesai = offset_anak[v], offset_anak[v + 1]
+            if mulai == selesai:
+                continue
+            anak_v = isi_anak[mulai:selesai]
+            interval = None
+            if all(lengkap[c] for c in anak_v):
+                interval = [(post[v], post[v])]
+                for c in anak_v:
+                    interval.append((awal[c], post[c]))
+                    lain = tambahan.get(c)
+                    if lain is not None:
+                        interval.extend(zip(lain[0::2], lain[1::2]))
+                if len(interval) > 4 * MAKS_INTERVAL:
+                    interval = None
+            if interval is None:
+                lengkap[v] = 0
+                awal[v] = min(self._terendah(c, awal, tambahan) for c in anak_v)
+                continue
+            interval.sort()
+            gabung = [list(interval[0])]
+            for a, b in interval[1:]:
+                if a <= gabung[-1][1] + 1:
+                    if b > gabung[-1][1]:
+                        gabung[-1][1] = b
+                else:
+                    gabung.append([a, b])
+            if len(gabung) > MAKS_INTERVAL:
+                lengkap[v] = 0
+                awal[v] = gabung[0][0]
+                continue
+            # Interval terakhir memuat post[v] karena semua keturunan bernomor lebih kecil
+            awal[v] = gabung[-1][0]
+            if len(gabung) > 1:
+                tambahan[v] = array("l", [x for a, b in gabung[:-1] for x in (a, b)])
+        
+        self.post = post
+        self.urutan = urutan
+        self.awal = awal
+        # Interval tambahan per orang, disimpan datar [a0, b0, a1, b1, ...]
+        self.tambahan = tambahan
+        self.lengkap = lengkap
+        # Pasangan (awal, post) dari DFS berurutan acak, lihat _label_acak
+        self.label = []
+        if not all(lengkap):
+            self.label = [self._label_acak(akar, seed) for seed in range(JUMLAH_LABEL_ACAK)]
+    
+    def _label_acak(self, akar, seed):
+        """Interval pembungkus dari DFS dengan urutan anak acak
+        
+        Returns:
+            tuple: (awal, post), keturunan v bernomor post di [awal[v], post[v]]
+        """
+        jumlah = len(self.nama)
+        offset, isi = self._anak
+        rng = random.Random(seed)
+        post = array("l", bytes(array("l").itemsize * jumlah))
+        awal = array("l", post)
+        dikunjungi = bytearray(jumlah)
+        nomor = 0
+        akar = list(akar)
+        rng.shuffle(akar)
+        for mulai in akar:
+            if dikunjungi[mulai]:
+                continue
+            dikunjungi[mulai] = 1
+            derajat = offset[mulai + 1] - offset[mulai]
+            stack = [(mulai, 0, rng.randrange(derajat) if derajat else 0)]
+            while stack:
+                v, k, geser = stack[-1]
+                derajat = offset[v + 1] - offset[v]
+                if k < derajat:
+                    stack[-1] = (v, k + 1, geser)
+                    c = isi[offset[v] + (k + geser) % derajat]
+                    if not dikunjungi[c]:
+                        dikunjungi[c] = 1
+                        derajat_c = offset[c + 1] - offset[c]
+                        stack.append((c, 0, rng.randrange(derajat_c) if derajat_c else 0))
+                else:
+                    stack.pop()
+                    post[v] = nomor
+                    terendah = nomor
+                    for j in range(offset[v], offset[v + 1]):
+                        if awal[isi[j]] < terendah:
+                            terendah = awal[isi[j]]
+                    awal[v] = terendah
+                    nomor += 1
+        return awal, post
+    
+    @staticmethod
+    def _terendah(v, awal, tambahan):
+        """Nomor post terkecil di antara keturunan v"""
+        lain = tambahan.get(v)
+        return lain[0] if lain is not None else awal[v]
+    
+    @property
+    def jumlah_orang(self):
+        return len(self.nama)
+    
+    @property
+    def jumlah_interval(self):
+        """Total interval di indeks, sama dengan jumlah orang pada pohon"""
+        return len(self.nama) + sum(len(t) // 2 for t in self.tambahan.values())
+    
+    def _id(self, nama):
+        return self.nomor.get(nama)
+    
+    def _di_interval(self, x, p):
+        """Apakah nomor post p berada di interval lengkap milik x"""
+        if self.awal[x] <= p <= self.post[x]:
+            return True
+        lain = self.tambahan.get(x)
+        if lain is None:
+            return False
+        # Cari interval terakhir yang awalnya <= p
+        i = bisect_right(lain, p, 0, len(lain)) - 1
+        if i < 0:
+            return False
+        if i % 2 == 0:
+            return p <= lain[i + 1]
+        return p == lain[i]
+    
+    def _mungkin(self, v, y, p):
+        """Apakah y mungkin keturunan v menurut semua interval pembungkus"""
+        if not self._terendah(v, self.awal, self.tambahan) <= p < self.post[v]:
+            return False
+        for awal, post in self.label:
+            if not awal[v] <= post[y] < post[v]:
+                return False
+        return True
+    
+    def _ancestor_id(self, x, y):
+        if x == y:
+            return False
+        p = self.post[y]
+        if self.lengkap[x]:
+            return self._di_interval(x, p)
+        if not self._mungkin(x, y, p):
+            return False
+        
+        # Telusuri keturunan x yang interval pembungkusnya memuat y
+        offset, isi = self._anak
+        terlihat, stack = {x}, [x]
+        while stack:
+            u = stack.pop()
+            for k in range(offset[u], offset[u + 1]):
+                c = isi[k]
+                if c == y:
+                    return True
+                if c in terlihat or not self._mungkin(c, y, p):
+                    continue
+                terlihat.add(c)
+                if self.lengkap[c]:
+                    if self._di_interval(c, p):
+                        return True
+                else:
+                    stack.append(c)
+        return False
+    
+    def ancestor(self, x, y):
+        """Apakah x adalah pendahulu y, seperti ancestor/2"""
+        ix, iy = self._id(x), self._id(y)
+        if ix is None or iy is None:
+            return False
+        return self._ancestor_id(ix, iy)
+    
+    def _tetangga(self, csr, i):
+        offset, isi = csr
+        return isi[offset[i]:offset[i + 1]]
+    
+    def orang_tua(self, y):
+        """Daftar orang tua y"""
+        iy = self._id(y)
+        if iy is None:
+            return []
+        return [self.nama[i] for i in self._tetangga(self._orang_tua, iy)]
+    
+    def anak(self, x):
+        """Daftar anak x"""
+        ix = self._id(x)
+        if ix is None:
+            return []
+        return [self.nama[i] for i in self._tetangga(self._anak, ix)]
+    
+    def parent(self, x, y):
+        """Apakah x adalah orang tua y, seperti parent/2"""
+        ix, iy = self._id(x), self._id(y)
+        if ix is None or iy is None:
+            return False
+        return ix in self._tetangga(self._orang_tua, iy)
+    
+    def grandparent(self, x, y):
+        """Apakah x adalah kakek/nenek y, seperti grandparent/2"""
+        ix, iy = self._id(x), self._id(y)
+        if ix is None or iy is None:
+            return False
+        return any(ix in self._tetangga(self._orang_tua, z) for z in self._tetangga(self._orang_tua, iy))
+    
+    def kakek_nenek(self, y):
+        """Daftar kakek/nenek y tanpa duplikat"""
+        iy = self._id(y)
+        if iy is None:
+            return []
+        hasil = dict.fromkeys(
+            g for z in self._tetangga(self._orang_tua, iy) for g in self._tetangga(self._orang_tua, z)
+        )
+        return [self.nama[i] for i in hasil]
+    
+    def sibling(self, x, y):
+        """Apakah x dan y saudara kandung (berbagi orang tua), seperti sibling/2"""
+        ix, iy = self._id(x), self._id(y)
+        if ix is None or iy is None or ix == iy:
+            return False
+        ortu_y = self._tetangga(self._orang_tua, iy)
+        return any(z in ortu_y for z in self._tetangga(self._orang_tua, ix))
+    
+    def saudara(self, x):
+        """Daftar saudara kandung x, setiap saudara hanya sekali
+        
+        sibling/2 di Prolog menghasilkan saudara yang sama sekali untuk
+        setiap orang tua bersama; di sini hasilnya tanpa duplikat.
+        """
+        ix = self._id(x)
+        if ix is None:
+            return []
+        hasil = dict.fromkeys(
+            s for z in self._tetangga(self._orang_tua, ix) for s in self._tetangga(self._anak, z) if s != ix
+        )
+        return [self.nama[i] for i in hasil]
+    
+    def pasangan_saudara(self):
+        """Semua pasangan saudara kandung, setiap pasangan hanya sekali
+        
+        Yields:
+            tuple: (x, y) dengan x lebih dulu dimuat daripada y
+        """
+        for x in range(len(self.nama)):
+            terlihat = set()
+            for z in self._tetangga(self._orang_tua, x):
+                for y in self._tetangga(self._anak, z):
+                    if y > x and y not in terlihat:
+                        terlihat.add(y)
+                        yield self.nama[x], self.nama[y]
+    
+    def leluhur(self, y):
+        """Semua pendahulu y"""
+        iy = self._id(y)
+        if iy is None:
+            return []
+        hasil, terlihat, stack = [], {iy}, [iy]
+        while stack:
+            for z in self._tetangga(self._orang_tua, stack.pop()):
+                if z not in terlihat:
+                    terlihat.add(z)
+                    hasil.append(self.nama[z])
+                    stack.append(z)
+        return hasil
+    
+    def keturunan(self, x):
+        """Semua keturunan x, diambil langsung dari intervalnya bila lengkap"""
+        ix = self._id(x)
+        if ix is None:
+            return []
+        if not self.lengkap[ix]:
+            offset, isi = self._anak
+            hasil, terlihat, stack = [], {ix}, [ix]
+            while stack:
+                u = stack.pop()
+                for c in isi[offset[u]:offset[u + 1]]:
+                    if c not in terlihat:
+                        terlihat.add(c)
+                        hasil.append(self.nama[c])
+                        stack.append(c)
+            return hasil
+        lain = self.tambahan.get(ix, ())
+        interval = list(zip(lain[0::2], lain[1::2])) + [(self.awal[ix], self.post[ix] - 1)]
+        return [self.nama[self.urutan[p]] for a, b in interval for p in range(a, b + 1)]
+    
+    def tulis_fakta(self, f):
+        """Tulis fakta parent/2 agar dapat di-consult Prolog bersama aturan silsilah.pl"""
+        offset, isi = self._anak
+        for x in range(len(self.nama)):
+            for k in range(offset[x], offset[x + 1]):
+                f.write(f"parent({_atom(self.nama[x])}, {_atom(self.nama[isi[k]])}).\n")
+
+def _atom(nama):
+    """Tulis nama sebagai atom Prolog, diberi kutip bila perlu"""
+    if re.fullmatch(r"[a-z]\w*", nama):
+        return nama
+    return "'" + nama.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+class PrologSilsilah:
+    """Query silsilah lewat SWI-Prolog (pyswip) dengan ancestor/2 yang di-table"""
+    
+    def __init__(self, path="silsilah.pl"):
+        """Consult file silsilah
+        
+        Args:
+            path (str): File .pl berisi fakta parent/2 dan aturan silsilah
+        """
+        from pyswip import Prolog
+        
+        self.prolog = Prolog()
+        self.prolog.consult(path)
+    
+    def _ada(self, goal):
+        return bool(list(self.prolog.query(goal, maxresult=1)))
+    
+    def ancestor(self, x, y):
+        return self._ada(f"ancestor({_atom(x)}, {_atom(y)})")
+    
+    def parent(self, x, y):
+        return self._ada(f"parent({_atom(x)}, {_atom(y)})")
+    
+    def grandparent(self, x, y):
+        return self._ada(f"grandparent({_atom(x)}, {_atom(y)})")
+    
+    def sibling(self, x, y):
+        return self._ada(f"sibling({_atom(x)}, {_atom(y)})")
+    
+    def saudara(self, x):
+        # distinct/2 membuang saudara yang muncul sekali per orang tua bersama
+        return [str(s["Y"]) for s in self.prolog.query(f"distinct(Y, sibling({_atom(x)}, Y))")]
+    
+    def leluhur(self, y):
+        return [str(s["X"]) for s in self.prolog.query(f"ancestor(X, {_atom(y)})")]
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# bench_suite.py - Reproducible benchmark suite for Outfit Recommendation System
+
+"""
+Runs a fixed set of benchmark cases and stores the results as JSON, so
+runs from different commits can be compared.
+
+Every case times a callable with timeit: after a warm-up the number of
+calls per round is calibrated to take at least --min-time seconds, and
+the best, median and mean of --repeat rounds are reported per operation.
+Memory per operation is measured separately with tracemalloc, as the
+peak and the retained bytes over a block of calls. Random choices use
+fixed seeds, so every run does the same work.
+
+The Prolog subprocess cases use swipl when it is installed and
+swipl_stub.py otherwise; the backend used is stored with the result.
+Cases whose backend is missing (pyswip) are recorded as skipped.
+
+Run with:
+    python bench_suite.py -o results/$(git rev-parse --short HEAD).json
+    python bench_suite.py --compare results/base.json results/new.json
+    python bench_suite.py --filter engine --compare results/base.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from itertools import product
+
+from knowledge_base import GENDERS, OCCASIONS, SPECIALS, WEATHERS, KnowledgeBase
+from recommendation_engine import OutfitRecommendationEngine
+
+# Every input combination of the UI, 3 x 4 x 3 x 2
+COMBINATIONS = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS))
+DATE = (15, 6, 2025)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROLOG_FILE = os.path.join(HERE, "outfit_kb.pl")
+STUB_EXECUTABLE = os.path.join(HERE, "swipl_stub.py")
+
+# Format version of the result files
+RESULT_VERSION = 1
+
+class Skip(Exception):
+    """Raised by a case whose backend isn't available"""
+
+class Case:
+    """One benchmark: a setup function returning the callable to time"""
+    
+    def __init__(self, name, setup, operations, description):
+        """Initialize the case
+        
+        Args:
+            name (str): Unique name, used as the key in result files
+            setup: Function of the Fixtures returning (callable, info dict),
+                   the info is stored with the result
+            operations (int): Operations done by one call of the callable,
+                              the info may override it
+            description (str): What one operation is
+        """
+        self.name = name
+        self.setup = setup
+        self.operations = operations
+        self.description = description
+
+CASES = []
+
+def case(name, operations=1, description=""):
+    """Register a benchmark case, see Case"""
+    def register(setup):
+        CASES.append(Case(name, setup, operations, description))
+        return setup
+    return register
+
+class Fixtures:
+    """Objects shared by the cases, built on first use and closed at the end"""
+    
+    def __init__(self):
+        self._objects = {}
+        self._closers = []
+    
+    def get(self, name, build, close=None):
+        if name not in self._objects:
+            self._objects[name] = build()
+            if close is not None:
+                self._closers.append(lambda: close(self._objects[name]))
+        return self._objects[name]
+    
+    def python_kb(self):
+        return self.get("python_kb", KnowledgeBase)
+    
+    def prolog_kb(self):
+        return self.get("prolog_kb", lambda: KnowledgeBase(use_prolog=True, prolog_file=PROLOG_FILE))
+    
+    def close(self):
+        for closer in reversed(self._closers):
+            closer()
+        self._closers.clear()
+
+def _quiet(build):
+    """Run a constructor without its status prints"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        return build()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+@case("engine.generate_recommendation", len(COMBINATIONS),
+      "one recommendation, cycling through all 72 input combinations")
+def _engine_generate(fixtures):
+    engine = OutfitRecommendationEngine(fixtures.python_kb(), rng=random.Random(0))
+    generate = engine.generate_recommendation
+    
+    def run():
+        for combination in COMBINATIONS:
+            generate(*combination, DATE)
+    return run, {}
+
+@case("engine.generate_recommendation.deterministic", len(COMBINATIONS),
+      "one cached deterministic recommendation, all 72 input combinations")
+def _engine_deterministic(fixtures):
+    engine = OutfitRecommendationEngine(fixtures.python_kb(), deterministic=True)
+    generate = engine.generate_recommendation
+    
+    def run():
+        for combination in COMBINATIONS:
+            generate(*combination, DATE, user_id="bench")
+    return run, {}
+
+@case("engine.generate_recommendations.batch", 100 * len(COMBINATIONS),
+      "one row of a 7200-row batch")
+def _engine_batch(fixtures):
+    engine = OutfitRecommendationEngine(fixtures.python_kb())
+    rows = [combination + (DATE,) for combination in COMBINATIONS] * 100
+    
+    def run():
+        engine.generate_recommendations(rows, seed=0)
+    return run, {}
+
+@case("engine.format_recommendation_text", len(COMBINATIONS),
+      "formatting one recommendation as display text")
+def _format_text(fixtures):
+    engine = OutfitRecommendationEngine(fixtures.python_kb(), rng=random.Random(0))
+    recommendations = [engine.generate_recommendation(*combination, DATE) for combination in COMBINATIONS]
+    format_text = engine.format_recommendation_text
+    
+    def run():
+        for recommendation in recommendations:
+            format_text(recommendation)
+    return run, {}
+
+def _item_options_case(kb):
+    cells = list(kb.catalogue.cells)
+    get_item_options = kb.get_item_options
+    
+    def run():
+        for cell in cells:
+            get_item_options(*cell)
+    return run, {"operations_per_call": len(cells)}
+
+@case("kb.get_item_options[python]", 60, "one cell lookup, every cell of the catalogue")
+def _item_options_python(fixtures):
+    return _item_options_case(fixtures.python_kb())
+
+@case("kb.get_item_options[prolog]", 60, "one cell lookup, every cell of the catalogue")
+def _item_options_prolog(fixtures):
+    kb = _quiet(fixtures.prolog_kb)
+    if not kb.use_prolog:
+        raise Skip(f"{PROLOG_FILE} could not be loaded")
+    return _item_options_case(kb)
+
+# Queries cycled through by the bridge cases
+BRIDGE_QUERIES = [
+    f"item_options({category}, {occasion}, {weather}, Items)"
+    for category, occasion, weather in product(("tops", "shoes"), OCCASIONS, WEATHERS)
+]
+
+def _bridge_case(bridge):
+    query = bridge.query
+    
+    def run():
+        for text in BRIDGE_QUERIES:
+            if not query(text):
+                raise RuntimeError(f"No answer for {text}")
+    return run
+
+@case("bridge.query[pyswip]", len(BRIDGE_QUERIES), "one uncached item_options/4 query")
+def _bridge_pyswip(fixtures):
+    try:
+        import pyswip  # noqa: F401
+    except ImportError:
+        raise Skip("pyswip is not installed")
+    from prolog_bridge import PrologBridge
+    
+    bridge = fixtures.get("pyswip_bridge", lambda: _quiet(
+        lambda: PrologBridge(PROLOG_FILE, cache_size=0)
+    ), close=lambda bridge: bridge.close())
+    _quiet(lambda: bridge.query("true"))
+    if not bridge.pyswip_available:
+        raise Skip("pyswip could not start Prolog")
+    return _bridge_case(bridge), {"backend": "pyswip"}
+
+def _subprocess_bridge(fixtures, cache_size):
+    from prolog_bridge import PrologBridge
+    
+    executable = shutil.which("swipl") or STUB_EXECUTABLE
+    bridge = fixtures.get(f"subprocess_bridge_{cache_size}", lambda: _quiet(
+        lambda: PrologBridge(PROLOG_FILE, pool_size=1, cache_size=cache_size, executable=executable)
+    ), close=lambda bridge: bridge.close())
+    # Pick the backend and start the worker outside the timed rounds
+    _quiet(lambda: bridge.query(BRIDGE_QUERIES[0]))
+    if bridge.pyswip_available:
+        raise Skip("pyswip is installed, the bridge doesn't use subprocesses")
+    if not bridge.swipl_available:
+        raise Skip(f"{executable} could not be started")
+    backend = "swipl" if executable != STUB_EXECUTABLE else "swipl_stub.py"
+    return _bridge_case(bridge), {"backend": backend}
+
+@case("bridge.query[subprocess]", len(BRIDGE_QUERIES), "one uncached item_options/4 query")
+def _bridge_subprocess(fixtures):
+    return _subprocess_bridge(fixtures, cache_size=0)
+
+@case("bridge.query[subprocess,cached]", len(BRIDGE_QUERIES), "one item_options/4 query from the cache")
+def _bridge_subprocess_cached(fixtures):
+    return _subprocess_bridge(fixtures, cache_size=256)
+
+def measure_time(run, operations, repeat, min_time):
+    """Time a callable, see the module docstring
+    
+    Returns:
+        dict: Per-operation timings in microseconds and the round layout
+    """
+    run()
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = timer.repeat(repeat=repeat, number=number)
+    per_op = [seconds / (number * operations) * 1e6 for seconds in rounds]
+    return {
+        "best_us": min(per_op),
+        "median_us": statistics.median(per_op),
+        "mean_us": statistics.fmean(per_op),
+        "stdev_us": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "ops_per_second": 1e6 / min(per_op),
+        "calls_per_round": number,
+        "rounds": repeat
+    }
+
+def measure_memory(run, operations, calls=5):
+    """Measure the Python allocations of a callable with tracemalloc
+    
+    Returns:
+        dict: Peak bytes above the start during one call, and bytes
+              still held after several calls, per operation
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        for _ in range(calls - 1):
+            run()
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_per_op": (peak - before) / operations,
+        "retained_bytes_per_op": (current - before) / (calls * operations)
+    }
+
+def run_suite(selected=None, repeat=7, min_time=0.2, progress=None):
+    """Run the benchmark cases
+    
+    Args:
+        selected: Optional substrings, only matching cases run
+        repeat (int): Timing rounds per case
+        min_time (float): Minimum seconds per round
+        progress: Optional text stream for one line per case
+    
+    Returns:
+        dict: Result document with "meta" and "results"
+    """
+    fixtures = Fixtures()
+    results = {}
+    try:
+        for bench in CASES:
+            if selected and not any(part in bench.name for part in selected):
+                continue
+            entry = {"operations_per_call": bench.operations, "description": bench.description}
+            try:
+                run, info = bench.setup(fixtures)
+            except Skip as e:
+                entry.update(status="skipped", reason=str(e))
+            else:
+                entry.update(info)
+                operations = entry["operations_per_call"]
+                entry.update(measure_time(run, operations, repeat, min_time))
+                entry.update(measure_memory(run, operations))
+                entry["status"] = "ok"
+            results[bench.name] = entry
+            if progress is not None:
+                print(format_entry(bench.name, entry), file=progress, flush=True)
+    finally:
+        fixtures.close()
+    return {"version": RESULT_VERSION, "meta": environment(), "results": results}
+
+def environment():
+    """Describe the machine and the commit the results belong to"""
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=HERE, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git("status", "--porcelain", "--", ".")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count()
+    }
+
+def format_entry(name, entry):
+    """One line summary of a result entry"""
+    if entry["status"] != "ok":
+        return f"{name:<45} skipped: {entry['reason']}"
+    line = (f"{name:<45} {entry['best_us']:10.3f} us/op  {entry['ops_per_second']:12.0f} op/s"
+            f"  {entry['peak_bytes_per_op']:9.0f} B peak/op")
+    if "backend" in entry:
+        line += f"  [{entry['backend']}]"
+    return line
+
+def compare(base, new, threshold=0.1):
+    """Compare two result documents
+    
+    Args:
+        base (dict): Results of the reference run
+        new (dict): Results of the run being checked
+        threshold (float): Relative slowdown of the best time counted as a regression
+    
+    Returns:
+        tuple: (report lines, names of the regressed cases)
+    """
+    lines = [
+        f"base: {base['meta'].get('commit') or 'unknown'}   new: {new['meta'].get('commit') or 'unknown'}",
+        f"{'case':<45} {'base us/op':>11} {'new us/op':>11} {'change':>8}"
+    ]
+    regressions = []
+    for name in sorted(base["results"].keys() | new["results"].keys()):
+        old = base["results"].get(name)
+        current = new["results"].get(name)
+        if not old or not current or old["status"] != "ok" or current["status"] != "ok":
+            lines.append(f"{name:<45} {'-':>11} {'-':>11}   not comparable")
+            continue
+        if old.get("backend") != current.get("backend"):
+            lines.append(f"{name:<45} backend changed ({old.get('backend')} -> {current.get('backend')})")
+            continue
+        change = current["best_us"] / old["best_us"] - 1
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            marker = "  faster"
+        lines.append(f"{name:<45} {old['best_us']:11.3f} {current['best_us']:11.3f} {change:+8.1%}{marker}")
+    return lines, regressions
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with JSON results")
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("--filter", action="append", help="Only run cases containing this text, repeatable")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="Compare with BASE.json; with two files compare them without running")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args()
+    
+    if args.list:
+        for bench in CASES:
+            print(f"{bench.name:<45} {bench.description}")
+        return
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes one or two result files")
+    
+    if args.compare and len(args.compare) == 2:
+        new = load_results(args.compare[1])
+    else:
+        new = run_suite(args.filter, args.repeat, args.min_time, progress=sys.stdout)
+        if args.output:
+            directory = os.path.dirname(args.output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(new, f, indent=2, sort_keys=True)
+                f.write("\n")
+            print(f"Results written to {args.output}")
+    
+    if args.compare:
+        lines, regressions = compare(load_results(args.compare[0]), new, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
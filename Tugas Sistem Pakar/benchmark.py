@@ -0,0 +1,767 @@
+#!/usr/bin/env python3
+# benchmark.py - Performance benchmarks for Outfit Recommendation System
+
+import gc
+import json
+import random
+import timeit
+from itertools import product
+
+from knowledge_base import GENDERS, OCCASIONS, SPECIALS, WEATHERS, KnowledgeBase
+from metrics import Metrics, PrometheusExporter
+from recommendation_engine import OutfitRecommendationEngine
+
+def legacy_candidates(kb, weather, occasion, gender, special):
+    """Reproduce the per-request filtering done before the precomputed tables
+    
+    Lists are copied before extending so the benchmark does not grow the
+    knowledge base the way the old code did.
+    
+    Args:
+        kb (KnowledgeBase): The knowledge base to read from
+        weather (str): Weather value (hot, warm, cold, rainy)
+        occasion (str): Occasion value (formal, casual, sports)
+        gender (str): Gender preference (masculine, feminine, neutral)
+        special (str): Special considerations (modest, none)
+    
+    Returns:
+        tuple: The five candidate lists
+    """
+    tops = list(kb.get_item_options("tops", occasion, weather))
+    bottoms = list(kb.get_item_options("bottoms", occasion, weather))
+    outerwear = kb.get_item_options("outerwear", occasion, weather)
+    shoes = kb.get_item_options("shoes", occasion, weather)
+    accessories = kb.get_item_options("accessories", occasion, weather)
+    
+    if gender == "masculine":
+        feminine_items = ["Blus", "Rok", "Dress", "Crop top"]
+        tops = [item for item in tops if not any(f_item in item for f_item in feminine_items)]
+        bottoms = [item for item in bottoms if not any(f_item in item for f_item in feminine_items)]
+    
+    if gender == "feminine":
+        if occasion == "formal" and random.random() > 0.5:
+            tops.extend(["Blus formal", "Kemeja feminine"])
+            bottoms.extend(["Rok pensil", "Dress formal"])
+        elif occasion == "casual" and random.random() > 0.5:
+            tops.extend(["Blus casual", "Crop top stylish"])
+            bottoms.extend(["Rok casual", "Dress santai"])
+        elif occasion == "sports":
+            tops.extend(["Sport bra", "Tank top feminine"])
+    
+    if special == "modest":
+        immodest_items = ["Crop top", "Tank top", "Singlet", "Rok mini", "Celana pendek"]
+        tops = [item for item in tops if not any(im_item in item for im_item in immodest_items)]
+        bottoms = [item for item in bottoms if not any(im_item in item for im_item in immodest_items)]
+        if not tops:
+            tops = ["Kemeja lengan panjang", "Blus tertutup", "Kaos lengan panjang"]
+        if not bottoms:
+            bottoms = ["Celana panjang", "Rok panjang", "Celana kulot"]
+    
+    return tops, bottoms, outerwear, shoes, accessories
+
+def precomputed_candidates(kb, weather, occasion, gender, special):
+    """Fetch the same candidates through the precomputed tables
+    
+    Args:
+        kb (KnowledgeBase): The knowledge base to read from
+        weather (str): Weather value (hot, warm, cold, rainy)
+        occasion (str): Occasion value (formal, casual, sports)
+        gender (str): Gender preference (masculine, feminine, neutral)
+        special (str): Special considerations (modest, none)
+    
+    Returns:
+        tuple: The five candidate tuples
+    """
+    extended = False
+    if gender == "feminine":
+        if occasion == "formal" or occasion == "casual":
+            extended = random.random() > 0.5
+        elif occasion == "sports":
+            extended = True
+    
+    get_options = kb.get_filtered_options
+    return (
+        get_options("tops", occasion, weather, gender, special, extended),
+        get_options("bottoms", occasion, weather, gender, special, extended),
+        get_options("outerwear", occasion, weather, gender, special, extended),
+        get_options("shoes", occasion, weather, gender, special, extended),
+        get_options("accessories", occasion, weather, gender, special, extended)
+    )
+
+def check_read_only(kb):
+    """Check that the shared ID tables can't be written through
+    
+    Cells and filtered tables are shared by every caller, a write would
+    change the recommendations of everyone else.
+    """
+    before = kb.get_item_options("shoes", "formal", "hot")
+    for ids in (
+        kb.catalogue.cell_ids("shoes", "formal", "hot"),
+        kb.get_filtered_ids("shoes", "formal", "hot", "neutral", "none"),
+        kb.get_filtered_ids("tops", "formal", "hot", "feminine", "modest", True)
+    ):
+        try:
+            ids[0] = ids[-1]
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("ID table is writable")
+        assert not hasattr(ids, "append")
+    assert kb.get_item_options("shoes", "formal", "hot") == before
+
+def bench_candidates(repeat=5, number=2000):
+    """Compare the legacy filtering path with the precomputed tables
+    
+    Args:
+        repeat (int): Number of timing rounds, the best one is reported
+        number (int): Number of passes over all input combinations per round
+    """
+    kb = KnowledgeBase()
+    check_read_only(kb)
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS))
+    
+    def run(func):
+        def loop():
+            for weather, occasion, gender, special in combos:
+                func(kb, weather, occasion, gender, special)
+        best = min(timeit.repeat(loop, repeat=repeat, number=number))
+        return best / (number * len(combos)) * 1e6
+    
+    legacy = run(legacy_candidates)
+    precomputed = run(precomputed_candidates)
+    print("Candidate lookup per request:")
+    print(f"  legacy filtering     : {legacy:8.3f} us")
+    print(f"  precomputed tables   : {precomputed:8.3f} us")
+    print(f"  speedup              : {legacy / precomputed:8.2f}x")
+
+def bench_engine(repeat=5, number=500):
+    """Measure full generate_recommendation calls over all input combinations
+    
+    Args:
+        repeat (int): Number of timing rounds, the best one is reported
+        number (int): Number of passes over all input combinations per round
+    """
+    engine = OutfitRecommendationEngine(KnowledgeBase())
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS))
+    date = (1, 6, 2025)
+    
+    def loop():
+        for weather, occasion, gender, special in combos:
+            engine.generate_recommendation(weather, occasion, gender, special, date)
+    
+    best = min(timeit.repeat(loop, repeat=repeat, number=number))
+    per_call = best / (number * len(combos)) * 1e6
+    print("generate_recommendation:")
+    print(f"  per call             : {per_call:8.3f} us")
+    print(f"  throughput           : {1e6 / per_call:8.0f} req/s")
+
+def bench_batch(size=200000, repeat=3):
+    """Compare one-at-a-time generation with the batch API
+    
+    Args:
+        size (int): Number of rows in the batch
+        repeat (int): Number of timing rounds, the best one is reported
+    """
+    engine = OutfitRecommendationEngine(KnowledgeBase())
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS, range(1, 13)))
+    rows = [
+        (weather, occasion, gender, special, (1, month, 2025))
+        for weather, occasion, gender, special, month in (combos * (size // len(combos) + 1))[:size]
+    ]
+    
+    def single():
+        for weather, occasion, gender, special, date in rows:
+            engine.generate_recommendation(weather, occasion, gender, special, date)
+    
+    def batch():
+        engine.generate_recommendations(rows, seed=0)
+    
+    single_time = min(timeit.repeat(single, repeat=repeat, number=1))
+    batch_time = min(timeit.repeat(batch, repeat=repeat, number=1))
+    print(f"Batch of {size} rows:")
+    print(f"  generate_recommendation : {size / single_time:10.0f} rows/s")
+    print(f"  generate_recommendations: {size / batch_time:10.0f} rows/s")
+
+def bench_parallel(size=1000000, worker_counts=(1, 2, 4, 8)):
+    """Measure ParallelRecommendationEngine throughput for several worker counts
+    
+    Args:
+        size (int): Number of rows in the batch
+        worker_counts (tuple): Worker counts to try
+    """
+    from parallel_engine import ParallelRecommendationEngine
+    
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS, range(1, 13)))
+    rows = [
+        (weather, occasion, gender, special, (1, month, 2025))
+        for weather, occasion, gender, special, month in (combos * (size // len(combos) + 1))[:size]
+    ]
+    
+    print(f"Parallel batch of {size} rows:")
+    baseline = None
+    for workers in worker_counts:
+        with ParallelRecommendationEngine(workers=workers, seed=0) as engine:
+            # Warm up so process start-up isn't measured
+            engine.generate_recommendations(rows[:workers])
+            start = timeit.default_timer()
+            engine.generate_recommendations(rows)
+            elapsed = timeit.default_timer() - start
+        rate = size / elapsed
+        baseline = baseline or rate
+        print(f"  {workers:2d} workers : {rate:10.0f} rows/s ({rate / baseline:4.2f}x)")
+
+def catalogue_size(kb):
+    """Count every item stored in the knowledge base cells"""
+    return sum(
+        len(items)
+        for occasions in kb.knowledge_base.values()
+        for weathers in occasions.values()
+        for items in weathers.values()
+    )
+
+def resident_memory_kb():
+    """Current resident set size in KiB, or peak RSS where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        import os
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def bench_soak(calls=2000000, checkpoints=10):
+    """Soak test: memory must stay flat over millions of recommendations
+    
+    Feminine requests used to extend the knowledge base's own lists, so the
+    catalogue grew with every call. The catalogue size, the number of live
+    objects and the resident memory are printed at each checkpoint.
+    
+    Args:
+        calls (int): Total number of generate_recommendation calls
+        checkpoints (int): Number of progress reports
+    """
+    kb = KnowledgeBase()
+    engine = OutfitRecommendationEngine(kb)
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS))
+    per_checkpoint = calls // checkpoints
+    initial_items = catalogue_size(kb)
+    
+    print(f"Soak test over {calls} calls:")
+    print(f"  {'calls':>10} {'catalogue items':>16} {'live objects':>13} {'RSS KiB':>9}")
+    for checkpoint in range(1, checkpoints + 1):
+        for index in range(per_checkpoint):
+            weather, occasion, gender, special = combos[index % len(combos)]
+            engine.generate_recommendation(weather, occasion, gender, special, (1, 6, 2025))
+        gc.collect()
+        print(f"  {checkpoint * per_checkpoint:>10} {catalogue_size(kb):>16} "
+              f"{len(gc.get_objects()):>13} {resident_memory_kb():>9}")
+    
+    if catalogue_size(kb) != initial_items:
+        print("  FAILED: the knowledge base grew during the run")
+
+def bench_metrics(repeat=5, number=500):
+    """Compare generate_recommendation with instrumentation off and on
+    
+    Args:
+        repeat (int): Number of timing rounds, the best one is reported
+        number (int): Number of passes over all input combinations per round
+    """
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS))
+    date = (1, 6, 2025)
+    
+    print("Instrumentation overhead:")
+    for label, metrics in (("disabled", None), ("enabled", Metrics())):
+        engine = OutfitRecommendationEngine(KnowledgeBase(metrics=metrics))
+        
+        def loop():
+            for weather, occasion, gender, special in combos:
+                engine.format_recommendation_text(
+                    engine.generate_recommendation(weather, occasion, gender, special, date)
+                )
+        
+        best = min(timeit.repeat(loop, repeat=repeat, number=number))
+        print(f"  {label:<20} : {best / (number * len(combos)) * 1e6:8.3f} us per call")
+    
+    print(metrics.export(PrometheusExporter()))
+
+class PaddedKnowledgeBase(KnowledgeBase):
+    """Knowledge base whose filter keyword lists are padded with dummy keywords"""
+    
+    def __init__(self, padding):
+        self.padding = padding
+        super().__init__()
+    
+    def _init_python_kb(self):
+        super()._init_python_kb()
+        dummies = [f"Keyword{index}" for index in range(self.padding)]
+        self.attribute_keywords["feminine"] = dummies + self.attribute_keywords["feminine"]
+        self.attribute_keywords["immodest"] = dummies + self.attribute_keywords["immodest"]
+
+def bench_keyword_filters(paddings=(0, 16, 64, 256), repeat=5, number=200):
+    """Compare keyword scans with attribute bitmasks as keyword lists grow
+    
+    Both variants filter every tops and bottoms cell for a masculine user
+    with the modest preference.
+    
+    Args:
+        paddings (tuple): Numbers of dummy keywords added to each list
+        repeat (int): Number of timing rounds, the best one is reported
+        number (int): Number of passes over all cells per round
+    """
+    print("Gender and modesty filter per cell:")
+    print(f"  {'keywords':>9} {'substring scan':>15} {'bitmask':>10}")
+    for padding in paddings:
+        kb = PaddedKnowledgeBase(padding)
+        cells = [
+            kb.get_item_options(category, occasion, weather)
+            for category in ("tops", "bottoms")
+            for occasion in OCCASIONS
+            for weather in WEATHERS
+        ]
+        feminine, immodest = kb.feminine_keywords, kb.immodest_keywords
+        excluded = kb.attribute_mask("feminine", "immodest")
+        
+        def scan():
+            for items in cells:
+                kept = [item for item in items if not any(keyword in item for keyword in feminine)]
+                kept = [item for item in kept if not any(keyword in item for keyword in immodest)]
+        
+        def bitmask():
+            for items in cells:
+                kb.items_with(items, excluded=excluded)
+        
+        results = []
+        for func in (scan, bitmask):
+            best = min(timeit.repeat(func, repeat=repeat, number=number))
+            results.append(best / (number * len(cells)) * 1e6)
+        print(f"  {len(feminine):>9} {results[0]:>12.3f} us {results[1]:>7.3f} us")
+
+def bench_serializers(size=20000, repeat=3):
+    """Measure text formatting and the serializers per recommendation
+    
+    Args:
+        size (int): Number of recommendations serialized per round
+        repeat (int): Number of timing rounds, the best one is reported
+    """
+    import io
+    from serializers import (BinarySerializer, JsonSerializer, MsgpackSerializer,
+                             RecommendationWriter, TextFormatter)
+    
+    engine = OutfitRecommendationEngine(KnowledgeBase(), rng=random.Random(0))
+    combos = list(product(WEATHERS, OCCASIONS, GENDERS, SPECIALS))
+    records = [
+        engine.generate_recommendation(*combos[index % len(combos)], (1, 6, 2025))
+        for index in range(size)
+    ]
+    
+    formatter = TextFormatter()
+    stdlib_json = lambda record: json.dumps(record, ensure_ascii=False).encode("utf-8")
+    variants = (
+        ("TextFormatter", formatter.format),
+        ("json.dumps", stdlib_json),
+        ("JsonSerializer", JsonSerializer().dumps),
+        ("MsgpackSerializer", MsgpackSerializer().dumps),
+        ("BinarySerializer", BinarySerializer().dumps)
+    )
+    
+    print(f"Formatting and serialization of {size} recommendations:")
+    for label, func in variants:
+        best = min(timeit.repeat(lambda: [func(record) for record in records], repeat=repeat, number=1))
+        encoded = func(records[0])
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        print(f"  {label:<24}: {best / size * 1e6:7.3f} us per record, {len(encoded):4d} bytes")
+    
+    batch = engine.generate_recommendations([combos[index % len(combos)] for index in range(size)], seed=0)
+    for fmt in ("json", "msgpack", "binary"):
+        def write():
+            out = io.BytesIO()
+            with RecommendationWriter(out, fmt) as writer:
+                writer.write_batch(batch)
+            return out
+        best = min(timeit.repeat(write, repeat=repeat, number=1))
+        print(f"  stream {fmt:<17}: {best / size * 1e6:7.3f} us per record, "
+              f"{len(write().getvalue()) / size:6.1f} bytes per record")
+
+def synthetic_catalogue(items, seed=0, cells_per_item=3):
+    """Generate a catalogue with a given number of distinct items
+    
+    Every item is named after a real item of its category, so the gender
+    and modesty filters still apply, and is listed in several cells with a
+    separate string object per listing, like the Prolog loader produces.
+    
+    Args:
+        items (int): Number of distinct items
+        seed (int): Seed for the generator
+        cells_per_item (int): Number of cells each item is listed in
+    
+    Returns:
+        dict: category -> occasion -> weather -> list of items
+    """
+    rng = random.Random(seed)
+    real = KnowledgeBase().knowledge_base
+    categories = list(real)
+    bases = {category: real[category]["casual"]["hot"] for category in categories}
+    slots = list(product(OCCASIONS, WEATHERS))
+    catalogue = {}
+    for index in range(items):
+        category = categories[index % len(categories)]
+        base = rng.choice(bases[category])
+        for occasion, weather in rng.sample(slots, cells_per_item):
+            cell = catalogue.setdefault(category, {}).setdefault(occasion, {}).setdefault(weather, [])
+            cell.append(f"{base} {index:06d}")
+    return catalogue
+
+class SyntheticKnowledgeBase(KnowledgeBase):
+    """Knowledge base built on synthetic_catalogue"""
+    
+    def __init__(self, items, seed=0, added=None, previous=None):
+        self.items = items
+        self.seed = seed
+        # (category, occasion, weather) -> extra item names for that cell
+        self.added = added or {}
+        super().__init__(previous=previous)
+    
+    def _init_python_kb(self):
+        super()._init_python_kb()
+        self.knowledge_base = synthetic_catalogue(self.items, self.seed)
+        for (category, occasion, weather), names in self.added.items():
+            self.knowledge_base[category][occasion][weather].extend(names)
+
+def bench_catalogue_memory(items=100000):
+    """Compare the memory of nested string tuples with the interned catalogue
+    
+    The legacy layout is a nested dict of string tuples plus one tuple of
+    strings per filtered table entry. The interned layout is what
+    KnowledgeBase keeps now: one string per item, one ID buffer and ID
+    arrays for the filtered tables.
+    
+    Args:
+        items (int): Number of distinct items in the synthetic catalogue
+    """
+    import tracemalloc
+    
+    def measure(build):
+        gc.collect()
+        tracemalloc.start()
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return result, size
+    
+    def legacy_layout():
+        nested = synthetic_catalogue(items)
+        frozen = {
+            category: {
+                occasion: {weather: tuple(cell) for weather, cell in weathers.items()}
+                for occasion, weathers in occasions.items()
+            }
+            for category, occasions in nested.items()
+        }
+        tables = {
+            key: tuple(kb.get_filtered_options(*key))
+            for key in kb._filtered_tables
+        }
+        return frozen, tables
+    
+    def interned_layout():
+        kb = SyntheticKnowledgeBase(items)
+        kb.build_filtered_tables()
+        return kb
+    
+    kb, interned_size = measure(interned_layout)
+    _, legacy_size = measure(legacy_layout)
+    listings = len(kb.catalogue.ids)
+    
+    print(f"Catalogue of {items} items in {listings} cell listings:")
+    print(f"  nested string tuples : {legacy_size / 2**20:8.1f} MiB")
+    print(f"  interned catalogue   : {interned_size / 2**20:8.1f} MiB")
+    for name, size in kb.catalogue.memory_usage().items():
+        print(f"    {name:<18} : {size / 2**20:8.1f} MiB")
+
+def bench_catalogue_startup(items=100000, repeat=3):
+    """Compare KnowledgeBase startup with an in-memory and a mapped catalogue
+    
+    Args:
+        items (int): Number of distinct items in the synthetic catalogue
+        repeat (int): Number of timing rounds, the best one is reported
+    """
+    import os
+    import tempfile
+    from catalogue_file import write_catalogue_file
+    
+    kb = SyntheticKnowledgeBase(items)
+    path = os.path.join(tempfile.mkdtemp(), "synthetic.cat")
+    write_catalogue_file(kb.catalogue, path, kb.item_masks(), kb.attribute_fingerprint())
+    
+    # Building the synthetic catalogue stands in for parsing outfit_kb.pl
+    in_memory = min(timeit.repeat(lambda: SyntheticKnowledgeBase(items), repeat=repeat, number=1))
+    mapped = min(timeit.repeat(lambda: KnowledgeBase(catalogue_file=path), repeat=repeat, number=1))
+    
+    print(f"KnowledgeBase startup with {items} items:")
+    print(f"  in-memory catalogue  : {in_memory * 1e3:8.1f} ms")
+    print(f"  mapped catalogue     : {mapped * 1e3:8.1f} ms ({os.path.getsize(path) / 2**20:.1f} MiB file)")
+    os.remove(path)
+
+def check_broken_reload():
+    """Check that a Prolog file with a broken fact is rejected by a reload
+    
+    The old version must stay in use with all of its cells, instead of
+    the broken cell silently disappearing.
+    """
+    import os
+    import shutil
+    import tempfile
+    
+    from kb_reload import KnowledgeBaseReloader
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "outfit_kb.pl")
+        shutil.copy("outfit_kb.pl", path)
+        kb = KnowledgeBase(use_prolog=True, prolog_file=path)
+        engine = OutfitRecommendationEngine(kb)
+        reloader = KnowledgeBaseReloader(kb, engines=[engine])
+        
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source.replace("item_options(tops,", "item_options(tops(,", 1))
+        report = reloader.reload()
+        assert report.error and report.new_version is None, report
+        assert reloader.kb is kb and engine.kb is kb
+        assert kb.get_item_options("tops", "formal", "hot")
+
+def bench_reload(items=100000, changed_cells=4, repeat=3):
+    """Compare a hot reload that changes a few cells with a restart
+    
+    Both sides end with every filtered table built, which is the state a
+    long-running service keeps. The synthetic catalogue is generated on
+    both sides, standing in for reading the knowledge base source.
+    
+    Args:
+        items (int): Number of distinct items in the synthetic catalogue
+        changed_cells (int): Number of cells that get a new item
+        repeat (int): Number of timing rounds, the best one is reported
+    """
+    from kb_reload import KnowledgeBaseReloader
+    
+    check_broken_reload()
+    cells = sorted(SyntheticKnowledgeBase(items).catalogue.cells)
+    added = {
+        cell: [f"Item baru {index}"]
+        for index, cell in enumerate(random.Random(1).sample(cells, changed_cells))
+    }
+    
+    def restart():
+        kb = SyntheticKnowledgeBase(items, added=added)
+        kb.build_filtered_tables()
+        return kb
+    
+    def reload_round():
+        kb = SyntheticKnowledgeBase(items)
+        kb.build_filtered_tables()
+        engine = OutfitRecommendationEngine(kb)
+        reloader = KnowledgeBaseReloader(
+            kb, engines=[engine],
+            factory=lambda previous: SyntheticKnowledgeBase(items, added=added, previous=previous)
+        )
+        start = timeit.default_timer()
+        report = reloader.reload()
+        engine.kb.build_filtered_tables()
+        return timeit.default_timer() - start, report
+    
+    restart_time = min(timeit.repeat(restart, repeat=repeat, number=1))
+    reload_time, report = min((reload_round() for _ in range(repeat)), key=lambda pair: pair[0])
+    
+    print(f"Knowledge base with {items} items, {changed_cells} cells changed:")
+    print(f"  restart + warm tables: {restart_time * 1e3:8.1f} ms")
+    print(f"  hot reload (swap)    : {report.seconds * 1e3:8.1f} ms, {len(report.changed_cells)} cells reported")
+    print(f"  hot reload + warm    : {reload_time * 1e3:8.1f} ms")
+
+# Builds a headless engine and prints import and construction time in ms
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from knowledge_base import KnowledgeBase
+from recommendation_engine import OutfitRecommendationEngine
+imported = time.perf_counter()
+engine = OutfitRecommendationEngine(KnowledgeBase())
+built = time.perf_counter()
+print((imported - start) * 1e3, (built - imported) * 1e3)
+"""
+
+# Modules that should stay off the headless startup path
+HEAVY_MODULES = ("numpy", "tkinter", "subprocess", "pyswip", "orjson", "msgpack", "argparse")
+
+def bench_startup(repeat=5, top=8):
+    """Measure headless engine startup in fresh interpreters
+    
+    Every round runs STARTUP_SCRIPT under ``python -X importtime``. The
+    import log of the fastest round is used to list the slowest imports
+    and any heavy module that got pulled in.
+    
+    Args:
+        repeat (int): Number of fresh interpreters, the best one is reported
+        top (int): Number of slowest imports to list
+    """
+    import os
+    import subprocess
+    import sys
+    
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            cwd=here, capture_output=True, text=True, check=True
+        )
+        import_ms, build_ms = (float(value) for value in result.stdout.split()[-2:])
+        if best is None or import_ms + build_ms < best[0] + best[1]:
+            best = (import_ms, build_ms, result.stderr)
+    import_ms, build_ms, log = best
+    
+    # Lines look like "import time:  self [us] | cumulative | name"
+    imports = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports.append((int(cumulative), name.rstrip()))
+    loaded = {name.strip() for _, name in imports}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    
+    print("Headless startup (best of fresh interpreters):")
+    print(f"  imports              : {import_ms:8.2f} ms")
+    print(f"  KB + engine          : {build_ms:8.2f} ms")
+    print(f"  heavy modules loaded : {', '.join(heavy) or 'none'}")
+    print("  slowest imports (cumulative, -X importtime):")
+    for cumulative, name in sorted(imports, reverse=True)[:top]:
+        print(f"    {cumulative / 1e3:8.2f} ms {name}")
+
+def bench_planner(users=100000, days=30, seed=0):
+    """Plan a month for many users, then change one day of every plan
+    
+    Every user gets their own forecast and preferences. The re-plan side
+    compares changing one day with update_day against planning the whole
+    month again.
+    
+    Args:
+        users (int): Number of users, one plan each
+        days (int): Days per plan
+        seed (int): Seed of the synthetic forecasts
+    """
+    from datetime import date, timedelta
+    from wardrobe_planner import WardrobePlanner
+    
+    rng = random.Random(seed)
+    start = date(2025, 6, 1)
+    dates = [(day.day, day.month, day.year) for day in (start + timedelta(n) for n in range(days))]
+    users_inputs = [
+        (
+            [(dates[n], rng.choice(WEATHERS), rng.choice(OCCASIONS)) for n in range(days)],
+            rng.choice(GENDERS), rng.choice(SPECIALS)
+        )
+        for _ in range(users)
+    ]
+    planner = WardrobePlanner(KnowledgeBase())
+    
+    begin = timeit.default_timer()
+    plans = [planner.plan(forecast, gender, special, user_id) for user_id, (forecast, gender, special)
+             in enumerate(users_inputs)]
+    plan_time = timeit.default_timer() - begin
+    repeats = sum(plan.repeats for plan in plans)
+    
+    changes = [(rng.randrange(days), rng.choice(WEATHERS), rng.choice(OCCASIONS)) for _ in range(users)]
+    begin = timeit.default_timer()
+    touched = 0
+    for plan, (index, weather, occasion) in zip(plans, changes):
+        touched += len(plan.update_day(index, weather, occasion))
+    update_time = timeit.default_timer() - begin
+    
+    begin = timeit.default_timer()
+    for user_id, plan in enumerate(plans):
+        planner.plan(plan.forecast, plan.gender, plan.special, user_id)
+    replan_time = timeit.default_timer() - begin
+    
+    print(f"Wardrobe plans, {users} users x {days} days:")
+    print(f"  plan all      : {plan_time:8.2f} s, {users / plan_time:10.0f} plans/s, "
+          f"{users * days / plan_time:10.0f} days/s")
+    print(f"  repeats left  : {repeats} (cells with a single candidate)")
+    print(f"  one day changed, incremental : {update_time:8.2f} s, {touched / users:.2f} days re-picked per plan")
+    print(f"  one day changed, full re-plan: {replan_time:8.2f} s")
+
+def bench_outfit_search(cell_sizes=(3, 30, 300, 3000), k=10, repeat=200, brute_limit=30):
+    """Top-k outfit search latency as the cells grow
+    
+    Every cell of the synthetic catalogues holds about `size` items per
+    category. The first query of a cell scores and groups its items, later
+    queries reuse them. Small cells are checked against scoring the whole
+    Cartesian product.
+    
+    Args:
+        cell_sizes (tuple): Approximate items per category per cell
+        k (int): Outfits per query
+        repeat (int): Cached queries timed per size
+        brute_limit (int): Largest cell size checked against the full product
+    """
+    from outfit_search import NO_ITEM, OutfitSearch, pair_score
+    
+    print(f"Top-{k} outfit search:")
+    cells = len(OCCASIONS) * len(WEATHERS)
+    for size in cell_sizes:
+        # Five categories, each item listed in three cells
+        kb = SyntheticKnowledgeBase(size * cells * 5 // 3)
+        search = OutfitSearch(kb)
+        query = ("rainy", "formal", "neutral", "none", (1, 10, 2025))
+        preferences = {"colors": ["navy"], "liked": ["waterproof"]}
+        
+        begin = timeit.default_timer()
+        best = search.top_k(*query, k=k, preferences=preferences)
+        first = timeit.default_timer() - begin
+        cached = min(timeit.repeat(
+            lambda: search.top_k(*query, k=k, preferences=preferences), repeat=5, number=repeat
+        )) / repeat
+        per_category = [len(kb.get_filtered_ids(category, "formal", "rainy", "neutral", "none"))
+                        for category in ("tops", "bottoms", "outerwear", "shoes")]
+        combinations = 1
+        for count in per_category:
+            combinations *= max(count, 1)
+        line = (f"  {size:5d} items/cell: first query {first * 1e3:8.2f} ms, cached {cached * 1e6:8.1f} us, "
+                f"{combinations:.2e} combinations")
+        
+        if size <= brute_limit:
+            groups = search._scored_groups("rainy", "formal", "neutral", "none", "fall",
+                                           search._preference_key(preferences))
+            columns = []
+            for category_groups in groups[:-1]:
+                column = [(group.style, score) for group in category_groups for score in group.scores]
+                columns.append(column or [(None, 0.0)])
+            begin = timeit.default_timer()
+            scores = []
+            for combination in product(*columns):
+                styles = [style for style, _ in combination if style is not None]
+                score = sum(score for _, score in combination)
+                score += sum(pair_score(a, b) for index, a in enumerate(styles) for b in styles[index + 1:])
+                scores.append(score + search._best_accessories(groups[-1], styles)[0])
+            scores = sorted(scores, reverse=True)[:k]
+            brute = timeit.default_timer() - begin
+            assert [round(score, 6) for score, _ in best] == [round(score, 6) for score in scores]
+            line += f", full product {brute * 1e3:8.2f} ms (same scores)"
+        assert all(outfit[0] != NO_ITEM for _, outfit in best)
+        print(line)
+
+if __name__ == "__main__":
+    bench_candidates()
+    bench_engine()
+    bench_batch()
+    bench_metrics()
+    bench_keyword_filters()
+    bench_serializers()
+    bench_catalogue_memory()
+    bench_catalogue_startup()
+    bench_startup()
+    bench_reload()
+    bench_planner()
+    bench_outfit_search()
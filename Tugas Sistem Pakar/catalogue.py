@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# catalogue.py - Integer-interned item catalogue for Outfit Recommendation System
+
+"""
+Compact storage for the item catalogue.
+
+Every distinct item name is interned once and gets an integer ID. The
+cells of the catalogue (category, occasion, weather) are (offset, length)
+slices of a single contiguous array of IDs, so an item shared by several
+cells costs four bytes per cell instead of a pointer plus a string. Names
+are only looked up when a recommendation is rendered.
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+
+class Catalogue:
+    """Interned item names plus one contiguous ID buffer holding every cell"""
+    
+    def __init__(self):
+        """Initialize an empty catalogue"""
+        self.strings = []
+        self._string_ids = {}
+        self.ids = array("i")
+        # (category, occasion, weather) -> (offset, length) into self.ids
+        self.cells = {}
+    
+    @classmethod
+    def from_nested(cls, knowledge_base, base=None):
+        """Build a catalogue from the category -> occasion -> weather -> items layout
+        
+        Args:
+            knowledge_base (dict): Nested item lists, as in KnowledgeBase
+            base (Catalogue): Optional catalogue whose item IDs are kept. Its
+                              names are interned first, so every item it has
+                              keeps its ID and new items are appended. Names
+                              dropped from the input keep their ID too.
+        
+        Returns:
+            Catalogue: The interned catalogue
+        """
+        catalogue = cls()
+        if base is not None:
+            catalogue.strings = list(base.strings)
+            catalogue._string_ids = dict(base._string_ids)
+        for category, occasions in knowledge_base.items():
+            for occasion, weathers in occasions.items():
+                for weather, items in weathers.items():
+                    catalogue.add_cell(category, occasion, weather, items)
+        return catalogue
+    
+    def intern(self, name):
+        """Return the ID of an item name, assigning a new one if needed
+        
+        Args:
+            name (str): Item name
+        
+        Returns:
+            int: The item's ID
+        """
+        item_id = self._string_ids.get(name)
+        if item_id is None:
+            item_id = self._string_ids[name] = len(self.strings)
+            self.strings.append(sys.intern(name))
+        return item_id
+    
+    def add_cell(self, category, occasion, weather, items):
+        """Append one cell's items to the ID buffer
+        
+        Args:
+            category (str): Item category
+            occasion (str): Occasion type
+            weather (str): Weather condition
+            items: Item names in display order
+        """
+        offset = len(self.ids)
+        self.ids.extend(self.intern(item) for item in items)
+        self.cells[(category, occasion, weather)] = (offset, len(self.ids) - offset)
+    
+    def id_of(self, name):
+        """Return the ID of an item name, or None if it was never interned"""
+        return self._string_ids.get(name)
+    
+    def name(self, item_id):
+        """Return the item name of an ID"""
+        return self.strings[item_id]
+    
+    def cell_ids(self, category, occasion, weather):
+        """Return the IDs of one cell without copying them
+        
+        The view is read-only: every caller shares the catalogue's buffer.
+        
+        Args:
+            category (str): Item category
+            occasion (str): Occasion type
+            weather (str): Weather condition
+        
+        Returns:
+            memoryview: Read-only slice of the ID buffer, or None for an unknown cell
+        """
+        cell = self.cells.get((category, occasion, weather))
+        if cell is None:
+            return None
+        offset, length = cell
+        return memoryview(self.ids)[offset:offset + length].toreadonly()
+    
+    def cell_items(self, category, occasion, weather):
+        """Resolve the item names of one cell
+        
+        Returns:
+            tuple: Item names, or None for an unknown cell
+        """
+        ids = self.cell_ids(category, occasion, weather)
+        if ids is None:
+            return None
+        strings = self.strings
+        return tuple(strings[item_id] for item_id in ids)
+    
+    def ids_array(self):
+        """Return the ID buffer as a NumPy array sharing its memory
+        
+        Raises:
+            RuntimeError: If NumPy isn't installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("NumPy is required for ids_array")
+        return np.frombuffer(self.ids, dtype=np.int32)
+    
+    def nested(self):
+        """Read-only category -> occasion -> weather -> items view of the catalogue"""
+        tree = {}
+        for key in self.cells:
+            category, occasion, weather = key
+            tree.setdefault(category, {}).setdefault(occasion, {})[weather] = key
+        return _NestedView(self, tree)
+    
+    def memory_usage(self):
+        """Estimate the bytes held by the catalogue's own structures
+        
+        Returns:
+            dict: Bytes per structure and their total
+        """
+        usage = {
+            "ids": sys.getsizeof(self.ids),
+            "strings": sys.getsizeof(self.strings) + sum(sys.getsizeof(name) for name in self.strings),
+            "string_index": sys.getsizeof(self._string_ids),
+            "cells": sys.getsizeof(self.cells) + sum(
+                sys.getsizeof(key) + sys.getsizeof(value) for key, value in self.cells.items()
+            )
+        }
+        usage["total"] = sum(usage.values())
+        return usage
+
+class _NestedView(Mapping):
+    """One level of the nested view returned by Catalogue.nested"""
+    
+    def __init__(self, catalogue, tree):
+        self._catalogue = catalogue
+        # key -> subtree, or -> (category, occasion, weather) on the last level
+        self._tree = tree
+    
+    def __getitem__(self, key):
+        value = self._tree[key]
+        if isinstance(value, tuple):
+            return self._catalogue.cell_items(*value)
+        return _NestedView(self._catalogue, value)
+    
+    def __iter__(self):
+        return iter(self._tree)
+    
+    def __len__(self):
+        return len(self._tree)
+    
+    def __contains__(self, key):
+        return key in self._tree
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
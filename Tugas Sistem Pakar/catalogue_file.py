@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# catalogue_file.py - Memory-mapped on-disk catalogue for Outfit Recommendation System
+
+"""
+Binary file format for a Catalogue, read back through mmap.
+
+Opening a catalogue file only reads the header and the small cell index.
+Item IDs, attribute masks and strings stay in the mapped file and are
+paged in on demand, so startup doesn't depend on the catalogue size and
+worker processes that map the same file share its pages.
+
+Layout (little-endian, sections aligned to 8 bytes):
+    header          magic, version and (offset, size) of every section
+    string_offsets  uint64[n + 1], item name i is string_data[off[i]:off[i + 1]]
+    string_data     UTF-8 item names
+    key_offsets     uint64[k + 1], same for the cell key names
+    key_data        UTF-8 category, occasion and weather names
+    cells           int32[cells][5]: category, occasion, weather key IDs,
+                    offset and length into ids
+    ids             int32 item IDs of every cell
+    masks           uint64 attribute mask per item ID, may be empty
+    hash_index      int32 open-addressing table, crc32(name) -> item ID
+    attributes      fingerprint of the attribute keywords the masks were built with
+
+Export a file with:
+    python catalogue_file.py -o outfit_kb.cat
+    python catalogue_file.py --prolog outfit_kb.pl -o outfit_kb.cat
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+
+from catalogue import Catalogue
+
+MAGIC = b"OUTFTCAT"
+FORMAT_VERSION = 1
+SECTIONS = ("string_offsets", "string_data", "key_offsets", "key_data",
+            "cells", "ids", "masks", "hash_index", "attributes")
+HEADER = struct.Struct("<8sII" + "QQ" * len(SECTIONS))
+
+class CatalogueFileError(Exception):
+    """Raised when a catalogue file is missing, damaged or incompatible"""
+
+def _little_endian(values):
+    """Return the bytes of an array in little-endian order"""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _string_table(strings):
+    """Encode strings as an offsets section and a data section"""
+    offsets = array("Q", [0])
+    data = bytearray()
+    for text in strings:
+        data += text.encode("utf-8")
+        offsets.append(len(data))
+    return _little_endian(offsets), bytes(data)
+
+def _hash_index(encoded):
+    """Build the open-addressing name -> ID table, at most half full"""
+    size = 1
+    while size < 2 * len(encoded):
+        size <<= 1
+    table = array("i", [-1]) * size
+    for item_id, name in enumerate(encoded):
+        slot = zlib.crc32(name) & (size - 1)
+        while table[slot] != -1:
+            slot = (slot + 1) & (size - 1)
+        table[slot] = item_id
+    return _little_endian(table)
+
+def write_catalogue_file(catalogue, path, masks=None, attributes=""):
+    """Write a catalogue to a binary file
+    
+    The file is written next to the target and renamed into place, so
+    processes that have the old file mapped keep a consistent view.
+    
+    Args:
+        catalogue (Catalogue): Catalogue to store
+        path (str): Output file path
+        masks: Optional attribute mask per item ID
+        attributes (str): Fingerprint of the keywords the masks were built with
+    """
+    keys = []
+    key_ids = {}
+    
+    def key_id(name):
+        if name not in key_ids:
+            key_ids[name] = len(keys)
+            keys.append(name)
+        return key_ids[name]
+    
+    cells = array("i")
+    for (category, occasion, weather), (offset, length) in catalogue.cells.items():
+        cells.extend((key_id(category), key_id(occasion), key_id(weather), offset, length))
+    
+    strings = list(catalogue.strings)
+    string_offsets, string_data = _string_table(strings)
+    key_offsets, key_data = _string_table(keys)
+    sections = {
+        "string_offsets": string_offsets,
+        "string_data": string_data,
+        "key_offsets": key_offsets,
+        "key_data": key_data,
+        "cells": _little_endian(cells),
+        "ids": _little_endian(array("i", catalogue.ids)),
+        "masks": _little_endian(array("Q", masks)) if masks is not None else b"",
+        "hash_index": _hash_index([text.encode("utf-8") for text in strings]),
+        "attributes": attributes.encode("utf-8") if masks is not None else b""
+    }
+    
+    layout = []
+    position = HEADER.size
+    for name in SECTIONS:
+        position = (position + 7) & ~7
+        layout.extend((position, len(sections[name])))
+        position += len(sections[name])
+    
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, *layout))
+        for index, name in enumerate(SECTIONS):
+            f.write(b"\0" * (layout[2 * index] - f.tell()))
+            f.write(sections[name])
+    os.replace(temporary, path)
+
+class _MappedStrings(Sequence):
+    """Item names decoded from the mapped string table on first access"""
+    
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+        self._decoded = {}
+    
+    def __len__(self):
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, item_id):
+        text = self._decoded.get(item_id)
+        if text is None:
+            if not 0 <= item_id < len(self._offsets) - 1:
+                raise IndexError(item_id)
+            text = self._decoded[item_id] = str(self.raw(item_id), "utf-8")
+        return text
+    
+    def raw(self, item_id):
+        """Return the encoded name as a view into the file"""
+        return self._data[self._offsets[item_id]:self._offsets[item_id + 1]]
+
+class MappedCatalogue(Catalogue):
+    """Read-only Catalogue backed by a memory-mapped catalogue file"""
+    
+    def __init__(self, path):
+        """Map a catalogue file
+        
+        Args:
+            path (str): File written by write_catalogue_file
+        
+        Raises:
+            CatalogueFileError: If the file can't be used
+        """
+        if sys.byteorder != "little":
+            raise CatalogueFileError("Catalogue files can only be mapped on little-endian machines")
+        
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise CatalogueFileError(f"Cannot map {path}: {e}")
+        
+        view = memoryview(self._mmap)
+        if len(view) < HEADER.size:
+            raise CatalogueFileError(f"{path} is too short to be a catalogue file")
+        magic, version, _, *layout = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise CatalogueFileError(f"{path} is not a catalogue file")
+        if version != FORMAT_VERSION:
+            raise CatalogueFileError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+        
+        sections = {}
+        for index, name in enumerate(SECTIONS):
+            offset, size = layout[2 * index], layout[2 * index + 1]
+            if offset + size > len(view):
+                raise CatalogueFileError(f"{path} is truncated")
+            sections[name] = view[offset:offset + size]
+        
+        self.strings = _MappedStrings(sections["string_offsets"].cast("Q"), sections["string_data"])
+        key_offsets = sections["key_offsets"].cast("Q")
+        keys = [
+            str(sections["key_data"][key_offsets[index]:key_offsets[index + 1]], "utf-8")
+            for index in range(len(key_offsets) - 1)
+        ]
+        cells = sections["cells"].cast("i")
+        self.cells = {
+            (keys[cells[row]], keys[cells[row + 1]], keys[cells[row + 2]]): (cells[row + 3], cells[row + 4])
+            for row in range(0, len(cells), 5)
+        }
+        self.ids = sections["ids"].cast("i")
+        self.masks = sections["masks"].cast("Q") if len(sections["masks"]) else None
+        self.attributes = str(sections["attributes"], "utf-8")
+        self._hash_index = sections["hash_index"].cast("i")
+    
+    def id_of(self, name):
+        """Return the ID of an item name, or None if the file doesn't have it"""
+        encoded = name.encode("utf-8")
+        table = self._hash_index
+        size_mask = len(table) - 1
+        slot = zlib.crc32(encoded) & size_mask
+        while True:
+            item_id = table[slot]
+            if item_id == -1:
+                return None
+            if self.strings.raw(item_id) == encoded:
+                return item_id
+            slot = (slot + 1) & size_mask
+    
+    def intern(self, name):
+        """Return the ID of an item name that must already be in the file
+        
+        Raises:
+            CatalogueFileError: If the name isn't in the file
+        """
+        item_id = self.id_of(name)
+        if item_id is None:
+            raise CatalogueFileError(f"{name!r} is not in {self.path}, export the catalogue again")
+        return item_id
+    
+    def add_cell(self, category, occasion, weather, items):
+        raise CatalogueFileError("Mapped catalogues are read-only")
+    
+    def memory_usage(self):
+        """Report the mapped file size, the pages are shared and paged in on demand"""
+        return {"mapped_file": len(self._mmap), "total": len(self._mmap)}
+
+def main():
+    """Export the catalogue of a knowledge base to a catalogue file"""
+    import argparse
+    from knowledge_base import KnowledgeBase
+    
+    parser = argparse.ArgumentParser(description="Export the outfit catalogue to a memory-mappable file")
+    parser.add_argument("-o", "--output", default="outfit_kb.cat", help="Catalogue file to write")
+    parser.add_argument("--prolog", metavar="FILE", help="Read the catalogue from a Prolog file instead of knowledge_base.py")
+    args = parser.parse_args()
+    
+    if args.prolog:
+        kb = KnowledgeBase(use_prolog=True, prolog_file=args.prolog)
+    else:
+        kb = KnowledgeBase()
+    write_catalogue_file(kb.catalogue, args.output, kb.item_masks(), kb.attribute_fingerprint())
+    print(f"Wrote {len(kb.catalogue.strings)} items in {len(kb.catalogue.cells)} cells to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# cli.py - Headless batch mode for Outfit Recommendation System
+
+"""
+Generates recommendations for a file of requests without the GUI.
+
+Input rows are read one line at a time from a CSV or JSON Lines file (or
+stdin), collected into chunks of --chunk-size rows and drawn through the
+batch API of OutfitRecommendationEngine. Every chunk is written out before
+the next one is read, so memory use depends on the chunk size and not on
+the size of the input.
+
+Every input row has the fields weather, occasion, gender (default
+neutral), special (default none) and optionally date or month. CSV dates
+are written as DD-MM-YYYY or DD/MM/YYYY, JSON dates as [day, month, year].
+Output rows are written in input order.
+
+Run with:
+    python cli.py requests.csv -o recommendations.jsonl
+    python cli.py requests.jsonl --output-format csv -o recommendations.csv
+    cat requests.jsonl | python cli.py - --input-format jsonl > recommendations.jsonl
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from knowledge_base import KnowledgeBase, validate_inputs
+from parallel_engine import chunk_seed
+from recommendation_engine import OutfitRecommendationEngine
+from serializers import RecommendationWriter
+
+INPUT_FORMATS = ("csv", "jsonl")
+OUTPUT_FORMATS = ("jsonl", "csv", "msgpack", "binary")
+# File extensions recognised when no format is given
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl",
+              ".msgpack": "msgpack", ".bin": "binary"}
+
+class InvalidRow(ValueError):
+    """Raised for an input row that can't be turned into a request"""
+
+class LineReader:
+    """Iterate over the decoded lines of a binary stream, counting bytes read"""
+    
+    def __init__(self, fileobj):
+        """Initialize the reader
+        
+        Args:
+            fileobj: File object opened in binary mode
+        """
+        self.file = fileobj
+        self.bytes_read = 0
+    
+    def __iter__(self):
+        first = True
+        for line in self.file:
+            self.bytes_read += len(line)
+            text = line.decode("utf-8")
+            if first:
+                # Spreadsheet exports often start with a byte order mark
+                text = text.lstrip("\ufeff")
+                first = False
+            yield text
+
+class CsvRecommendationWriter:
+    """Stream recommendations to a binary file as CSV, one row per outfit
+    
+    Has the same interface as serializers.RecommendationWriter.
+    Accessories share one column, separated by "; ".
+    """
+    
+    FIELDS = ("date", "time", "top", "bottom", "outerwear", "shoes", "accessories",
+              "color_recommendation", "weather_tip", "occasion_tip")
+    
+    def __init__(self, fileobj, buffer_size=1 << 16):
+        """Initialize the writer
+        
+        Args:
+            fileobj: File object opened in binary mode
+            buffer_size (int): Characters to collect before writing to the file
+        """
+        self.file = fileobj
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer)
+        self._csv.writerow(self.FIELDS)
+    
+    def write(self, recommendation):
+        """Add one recommendation dict to the stream"""
+        row = [recommendation.get(field) for field in self.FIELDS]
+        row[self.FIELDS.index("accessories")] = "; ".join(recommendation.get("accessories") or ())
+        self._csv.writerow(["" if value is None else value for value in row])
+        self.count += 1
+        if self._buffer.tell() >= self.buffer_size:
+            self.flush()
+    
+    def write_many(self, recommendations):
+        """Add an iterable of recommendation dicts to the stream"""
+        for recommendation in recommendations:
+            self.write(recommendation)
+    
+    def write_batch(self, batch):
+        """Add every row of a RecommendationBatch to the stream"""
+        self.write_many(batch)
+    
+    def flush(self):
+        """Write the buffered rows to the file"""
+        if self._buffer.tell():
+            self.file.write(self._buffer.getvalue().encode("utf-8"))
+            self._buffer.seek(0)
+            self._buffer.truncate()
+    
+    def close(self):
+        """Flush the remaining output, the file itself stays open"""
+        self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def open_writer(fileobj, fmt):
+    """Create the writer for an output format
+    
+    Args:
+        fileobj: File object opened in binary mode
+        fmt (str): One of OUTPUT_FORMATS
+    
+    Returns:
+        CsvRecommendationWriter or RecommendationWriter
+    """
+    if fmt == "csv":
+        return CsvRecommendationWriter(fileobj)
+    return RecommendationWriter(fileobj, "json" if fmt == "jsonl" else fmt)
+
+def read_records(lines, fmt):
+    """Parse input lines into records
+    
+    Args:
+        lines: Iterable of text lines
+        fmt (str): csv or jsonl
+    
+    Yields:
+        tuple: (line number, dict of fields), or (line number, None) for
+               a line that isn't a JSON object
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+def parse_month(record, default_month):
+    """Read the month of a record from its month or date field
+    
+    Args:
+        record (dict): Input record
+        default_month (int): Month used when the record has no date
+    
+    Returns:
+        int: Month number from 1 to 12
+    """
+    month = record.get("month")
+    date = record.get("date")
+    if month in (None, "") and date not in (None, ""):
+        if isinstance(date, str):
+            date = date.replace("/", "-").split("-")
+        if not isinstance(date, (list, tuple)) or len(date) != 3:
+            raise InvalidRow("date must be DD-MM-YYYY or [day, month, year]")
+        month = date[1]
+    if month in (None, ""):
+        return default_month
+    
+    try:
+        month = int(month)
+    except (TypeError, ValueError):
+        raise InvalidRow(f"invalid month {month!r}")
+    if not 1 <= month <= 12:
+        raise InvalidRow(f"invalid month {month!r}")
+    return month
+
+def parse_record(record, default_month):
+    """Validate one input record
+    
+    Args:
+        record (dict): Input record
+        default_month (int): Month used when the record has no date
+    
+    Returns:
+        tuple: (weather, occasion, gender, special, month)
+    
+    Raises:
+        InvalidRow: If a field is missing or has an unknown value
+    """
+    if record is None:
+        raise InvalidRow("line is not a JSON object")
+    
+    try:
+        weather, occasion, gender, special = validate_inputs(
+            record.get("weather"),
+            record.get("occasion"),
+            record.get("gender") or "neutral",
+            record.get("special") or "none"
+        )
+    except ValueError as e:
+        raise InvalidRow(str(e))
+    return weather, occasion, gender, special, parse_month(record, default_month)
+
+class BatchRunner:
+    """Stream requests through the engine chunk by chunk"""
+    
+    def __init__(self, engine, chunk_size=10000, seed=None, skip_invalid=False,
+                 progress=None, progress_interval=1.0):
+        """Initialize the runner
+        
+        Args:
+            engine (OutfitRecommendationEngine): Engine used for the batches
+            chunk_size (int): Rows drawn per batch call, bounds memory use
+            seed (int): Optional base seed, every chunk gets its own seed
+                        derived from it so output is reproducible
+            skip_invalid (bool): Report and skip invalid rows instead of stopping
+            progress: Optional text stream for progress reports
+            progress_interval (float): Seconds between progress reports
+        """
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.skip_invalid = skip_invalid
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.rows = 0
+        self.skipped = 0
+    
+    def run(self, records, writer, reader=None, total_bytes=None):
+        """Generate and write recommendations for every record
+        
+        Args:
+            records: Iterable of (line number, record) pairs, see read_records
+            writer: Output writer with write_batch and flush
+            reader (LineReader): Optional source of the bytes-read count
+            total_bytes (int): Input size, for a percentage in the progress report
+        
+        Returns:
+            dict: rows, skipped, seconds and rows_per_second
+        
+        Raises:
+            InvalidRow: For an invalid row unless skip_invalid is set
+        """
+        columns = self._empty_columns()
+        default_month = datetime.now().month
+        chunk_index = 0
+        start = last_report = time.perf_counter()
+        
+        for line_number, record in records:
+            try:
+                row = parse_record(record, default_month)
+            except InvalidRow as e:
+                if not self.skip_invalid:
+                    raise InvalidRow(f"line {line_number}: {e}")
+                self.skipped += 1
+                if self.progress is not None:
+                    print(f"Skipping line {line_number}: {e}", file=self.progress)
+                continue
+            
+            for name, value in zip(("weather", "occasion", "gender", "special", "month"), row):
+                columns[name].append(value)
+            if len(columns["weather"]) >= self.chunk_size:
+                self._write_chunk(columns, chunk_index, writer)
+                columns = self._empty_columns()
+                chunk_index += 1
+                
+                now = time.perf_counter()
+                if self.progress is not None and now - last_report >= self.progress_interval:
+                    self._report(now - start, reader, total_bytes)
+                    last_report = now
+        
+        if columns["weather"]:
+            self._write_chunk(columns, chunk_index, writer)
+        writer.flush()
+        
+        elapsed = time.perf_counter() - start
+        if self.progress is not None:
+            self._report(elapsed, reader, total_bytes)
+        return {
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "seconds": elapsed,
+            "rows_per_second": self.rows / elapsed if elapsed > 0 else 0.0
+        }
+    
+    @staticmethod
+    def _empty_columns():
+        return {"weather": [], "occasion": [], "gender": [], "special": [], "month": []}
+    
+    def _write_chunk(self, columns, chunk_index, writer):
+        """Draw one chunk and hand it to the writer"""
+        seed = chunk_seed(self.seed, chunk_index) if self.seed is not None else None
+        batch = self.engine.generate_recommendations(columns, seed=seed)
+        writer.write_batch(batch)
+        writer.flush()
+        self.rows += len(batch)
+    
+    def _report(self, elapsed, reader, total_bytes):
+        """Print rows done, throughput and input position"""
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        line = f"{self.rows} rows, {rate:.0f} rows/s"
+        if reader is not None:
+            line += f", {reader.bytes_read / 2**20:.1f} MiB read"
+            if total_bytes:
+                line += f" ({100 * reader.bytes_read / total_bytes:.0f}%)"
+        if self.skipped:
+            line += f", {self.skipped} skipped"
+        print(line, file=self.progress, flush=True)
+
+def detect_format(path, choices, default):
+    """Guess a format from a file extension
+    
+    Args:
+        path (str): File path, "-" for a standard stream
+        choices (tuple): Formats that are allowed here
+        default (str): Format used when the extension doesn't tell
+    
+    Returns:
+        str: The format
+    """
+    if path and path != "-":
+        fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt in choices:
+            return fmt
+    return default
+
+def main():
+    """Entry point for the batch mode"""
+    parser = argparse.ArgumentParser(description="Generate outfit recommendations for a CSV/JSONL file of requests")
+    parser.add_argument("input", help="CSV or JSON Lines file with one request per row, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file, - for stdout (default)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="Default: from the file extension, else csv")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, help="Default: from the file extension, else jsonl")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per batch, bounds memory use")
+    parser.add_argument("--seed", type=int, help="Base seed for reproducible output")
+    parser.add_argument("--skip-invalid", action="store_true", help="Skip invalid rows instead of stopping")
+    parser.add_argument("--quiet", action="store_true", help="No progress reports")
+    parser.add_argument("--prolog", action="store_true", help="Load the catalogue from outfit_kb.pl")
+    parser.add_argument("--catalogue", help="Map the item catalogue from a file written by catalogue_file.py")
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    
+    input_format = args.input_format or detect_format(args.input, INPUT_FORMATS, "csv")
+    output_format = args.output_format or detect_format(args.output, OUTPUT_FORMATS, "jsonl")
+    
+    kb = KnowledgeBase(use_prolog=args.prolog, catalogue_file=args.catalogue)
+    engine = OutfitRecommendationEngine(kb)
+    runner = BatchRunner(
+        engine,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        skip_invalid=args.skip_invalid,
+        progress=None if args.quiet else sys.stderr
+    )
+    
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        total_bytes = os.fstat(source.fileno()).st_size if args.input != "-" else None
+        reader = LineReader(source)
+        with open_writer(target, output_format) as writer:
+            stats = runner.run(read_records(reader, input_format), writer, reader, total_bytes)
+    except InvalidRow as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # The reader of stdout went away (e.g. piped into head), stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if target is not sys.stdout.buffer:
+            target.close()
+    
+    if not args.quiet:
+        print(f"Done: {stats['rows']} rows in {stats['seconds']:.2f} s "
+              f"({stats['rows_per_second']:.0f} rows/s), {stats['skipped']} skipped", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# kb_loader.py - Compile the ground facts of outfit_kb.pl into Python structures
+
+"""
+This module reads outfit_kb.pl without a Prolog engine. Only ground facts are
+loaded, rules are skipped. The compiled result is cached next to the source
+file and reused as long as the file's mtime and hash are unchanged.
+"""
+
+import hashlib
+import os
+import pickle
+
+# Bump when the layout of the compiled structure changes
+CACHE_VERSION = 2
+
+class PrologSyntaxError(Exception):
+    """Raised when the knowledge base file cannot be parsed"""
+
+class Variable:
+    """Marker for a Prolog variable, which makes a fact non-ground"""
+    
+    def __init__(self, name):
+        self.name = name
+
+class _Tokenizer:
+    """Split Prolog source into tokens, skipping comments and whitespace"""
+    
+    PUNCTUATION = "()[],|"
+    SYMBOL_CHARS = "+-*/\\^<>=~:.?@#&$"
+    
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        # Offset of the token being yielded
+        self.token_start = 0
+    
+    def tokens(self):
+        """Yield (kind, value) tuples for the whole source text"""
+        text = self.text
+        length = len(text)
+        while True:
+            self._skip_layout()
+            if self.pos >= length:
+                return
+            self.token_start = self.pos
+            char = text[self.pos]
+            
+            if char == "." and (self.pos + 1 >= length or text[self.pos + 1].isspace() or text[self.pos + 1] == "%"):
+                self.pos += 1
+                yield ("end", ".")
+            elif char in self.PUNCTUATION:
+                self.pos += 1
+                yield ("punct", char)
+            elif char == "'":
+                yield ("atom", self._quoted("'"))
+            elif char == '"':
+                yield ("string", self._quoted('"'))
+            elif char.isdigit():
+                yield ("number", self._number())
+            elif char.isalpha() or char == "_":
+                start = self.pos
+                while self.pos < length and (text[self.pos].isalnum() or text[self.pos] == "_"):
+                    self.pos += 1
+                name = text[start:self.pos]
+                kind = "var" if name[0].isupper() or name[0] == "_" else "atom"
+                yield (kind, name)
+            elif char in self.SYMBOL_CHARS:
+                start = self.pos
+                while self.pos < length and text[self.pos] in self.SYMBOL_CHARS:
+                    self.pos += 1
+                yield ("atom", text[start:self.pos])
+            else:
+                # Anything else (e.g. ';' or '!') is a solo character atom
+                self.pos += 1
+                yield ("atom", char)
+    
+    def _skip_layout(self):
+        text = self.text
+        length = len(text)
+        while self.pos < length:
+            char = text[self.pos]
+            if char.isspace():
+                self.pos += 1
+            elif char == "%":
+                end = text.find("\n", self.pos)
+                self.pos = length if end == -1 else end + 1
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end == -1:
+                    raise PrologSyntaxError("Unterminated block comment")
+                self.pos = end + 2
+            else:
+                return
+    
+    def _quoted(self, quote):
+        text = self.text
+        self.pos += 1
+        chars = []
+        escapes = {"n": "\n", "t": "\t", "\\": "\\", "'": "'", '"': '"', "`": "`"}
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char == quote:
+                if text.startswith(quote * 2, self.pos):
+                    chars.append(quote)
+                    self.pos += 2
+                    continue
+                self.pos += 1
+                return "".join(chars)
+            if char == "\\" and self.pos + 1 < len(text):
+                chars.append(escapes.get(text[self.pos + 1], text[self.pos + 1]))
+                self.pos += 2
+                continue
+            chars.append(char)
+            self.pos += 1
+        raise PrologSyntaxError("Unterminated quoted text")
+    
+    def _number(self):
+        text = self.text
+        start = self.pos
+        while self.pos < len(text) and text[self.pos].isdigit():
+            self.pos += 1
+        if text.startswith(".", self.pos) and self.pos + 1 < len(text) and text[self.pos + 1].isdigit():
+            self.pos += 1
+            while self.pos < len(text) and text[self.pos].isdigit():
+                self.pos += 1
+            return float(text[start:self.pos])
+        return int(text[start:self.pos])
+
+def _split_clauses(text, with_lines=False):
+    """Group the token stream into clauses ending with a full stop
+    
+    Args:
+        text (str): Prolog source code
+        with_lines (bool): Yield (line, clause) with the line the clause starts on
+    """
+    tokenizer = _Tokenizer(text)
+    clause = []
+    line = 1
+    counted = 0
+    for token in tokenizer.tokens():
+        if token[0] == "end":
+            if clause:
+                yield (line, clause) if with_lines else clause
+            clause = []
+        else:
+            if not clause and with_lines:
+                line += text.count("\n", counted, tokenizer.token_start)
+                counted = tokenizer.token_start
+            clause.append(token)
+    if clause:
+        raise PrologSyntaxError("Last clause is missing its full stop")
+
+def _is_rule(clause):
+    """Whether a clause has :- or --> outside any parentheses or brackets"""
+    depth = 0
+    for kind, value in clause:
+        if kind == "punct":
+            if value in "([":
+                depth += 1
+            elif value in ")]":
+                depth -= 1
+        elif depth == 0 and kind == "atom" and value in (":-", "-->"):
+            return True
+    return False
+
+class _FactParser:
+    """Parse a single clause made of a compound head and simple arguments"""
+    
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+    
+    def fact(self):
+        """Return (name, args) or None if the clause is not a plain fact"""
+        if any(token == ("atom", ":-") for token in self.tokens):
+            return None
+        name = self._expect("atom")
+        if self.pos == len(self.tokens):
+            return name, ()
+        self._expect_punct("(")
+        args = self._arguments(")")
+        if self.pos != len(self.tokens):
+            return None
+        return name, tuple(args)
+    
+    def _term(self):
+        kind, value = self._next()
+        if kind == "punct" and value == "[":
+            return self._list()
+        if kind == "var":
+            return Variable(value)
+        if kind == "atom" and self._peek() == ("punct", "("):
+            self.pos += 1
+            return (value, tuple(self._arguments(")")))
+        if kind in ("atom", "string", "number"):
+            return value
+        raise PrologSyntaxError(f"Unexpected token {value!r}")
+    
+    def _list(self):
+        if self._peek() == ("punct", "]"):
+            self.pos += 1
+            return []
+        items = self._arguments("]", allow_tail=True)
+        return items
+    
+    def _arguments(self, closing, allow_tail=False):
+        args = [self._term()]
+        while True:
+            kind, value = self._next()
+            if kind == "punct" and value == ",":
+                args.append(self._term())
+            elif kind == "punct" and value == closing:
+                return args
+            elif allow_tail and kind == "punct" and value == "|":
+                tail = self._term()
+                if isinstance(tail, list):
+                    args.extend(tail)
+                else:
+                    args.append(tail)
+                self._expect_punct(closing)
+                return args
+            else:
+                raise PrologSyntaxError(f"Unexpected token {value!r}")
+    
+    def _next(self):
+        if self.pos >= len(self.tokens):
+            raise PrologSyntaxError("Unexpected end of clause")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+    
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+    
+    def _expect(self, kind):
+        token_kind, value = self._next()
+        if token_kind != kind:
+            raise PrologSyntaxError(f"Expected {kind}, got {value!r}")
+        return value
+    
+    def _expect_punct(self, char):
+        if self._next() != ("punct", char):
+            raise PrologSyntaxError(f"Expected {char!r}")
+
+def _is_ground(term):
+    if isinstance(term, Variable):
+        return False
+    if isinstance(term, list):
+        return all(_is_ground(item) for item in term)
+    if isinstance(term, tuple):
+        return all(_is_ground(arg) for arg in term[1])
+    return True
+
+def parse_facts(text, source="<string>"):
+    """Parse all ground facts in a Prolog source text
+    
+    Directives and rules are skipped. Every other clause must be a fact
+    this parser understands, so a broken fact isn't silently dropped.
+    
+    Args:
+        text (str): Prolog source code
+        source (str): Name of the source used in error messages
+    
+    Returns:
+        dict: Mapping of (name, arity) to a list of argument tuples
+    
+    Raises:
+        PrologSyntaxError: If a fact can't be parsed
+    """
+    facts = {}
+    line = 1
+    try:
+        for line, clause in _split_clauses(text, with_lines=True):
+            if _is_rule(clause):
+                # Directives (:- dynamic foo/1.) and rules, whose bodies use
+                # operators this parser doesn't handle
+                continue
+            fact = _FactParser(clause).fact()
+            if fact is None:
+                raise PrologSyntaxError("Expected a single fact")
+            if not all(_is_ground(arg) for arg in fact[1]):
+                continue
+            name, args = fact
+            facts.setdefault((name, len(args)), []).append(args)
+    except PrologSyntaxError as e:
+        raise PrologSyntaxError(f"{source}:{line}: {e}") from None
+    return facts
+
+def compile_facts(facts):
+    """Build the indexed knowledge base structure from parsed facts
+    
+    Args:
+        facts (dict): Output of parse_facts
+    
+    Returns:
+        dict: Compiled knowledge base
+    """
+    catalogue = {}
+    for category, occasion, weather, items in facts.get(("item_options", 4), []):
+        catalogue.setdefault(category, {}).setdefault(occasion, {})[weather] = list(items)
+    
+    def single(name):
+        values = facts.get((name, 1), [])
+        return list(values[0][0]) if values else []
+    
+    return {
+        "item_options": catalogue,
+        "color_recommendation": dict(facts.get(("color_recommendation", 2), [])),
+        "weather_tip": dict(facts.get(("weather_tip", 2), [])),
+        "occasion_tip": dict(facts.get(("occasion_tip", 2), [])),
+        "attribute_bits": dict(facts.get(("attribute_bit", 2), [])),
+        "attribute_keywords": {
+            name: list(keywords) for name, keywords in facts.get(("attribute_keywords", 2), [])
+        },
+        "feminine_keywords": single("feminine_keywords"),
+        "immodest_keywords": single("immodest_keywords")
+    }
+
+def _cache_path(prolog_file):
+    directory, name = os.path.split(os.path.abspath(prolog_file))
+    return os.path.join(directory, "__pycache__", name + ".kbcache")
+
+def load_prolog_kb(prolog_file="outfit_kb.pl", use_cache=True):
+    """Load the compiled knowledge base, reusing the cache when possible
+    
+    Args:
+        prolog_file (str): Path to the Prolog knowledge base file
+        use_cache (bool): Read and write the compiled cache file
+    
+    Returns:
+        dict: Compiled knowledge base (see compile_facts)
+    """
+    stat = os.stat(prolog_file)
+    cache_file = _cache_path(prolog_file)
+    cached = None
+    
+    if use_cache:
+        try:
+            with open(cache_file, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("version") != CACHE_VERSION:
+                cached = None
+        except Exception:
+            cached = None
+    
+    # Fast path: the file hasn't been touched since it was compiled
+    if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        return cached["kb"]
+    
+    with open(prolog_file, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+    
+    if cached and cached["sha256"] == digest:
+        kb = cached["kb"]
+    else:
+        kb = compile_facts(parse_facts(source.decode("utf-8"), prolog_file))
+    
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "wb") as f:
+                pickle.dump({
+                    "version": CACHE_VERSION,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": digest,
+                    "kb": kb
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Warning: could not write knowledge base cache: {e}")
+    
+    return kb
+
+def diff_catalogues(left, right):
+    """List the cells where two item catalogues disagree
+    
+    Args:
+        left (dict): Catalogue as category -> occasion -> weather -> items
+        right (dict): Catalogue in the same layout
+    
+    Returns:
+        list: (category, occasion, weather) keys whose items differ
+    """
+    def cells(catalogue):
+        return {
+            (category, occasion, weather): list(items)
+            for category, occasions in catalogue.items()
+            for occasion, weathers in occasions.items()
+            for weather, items in weathers.items()
+        }
+    
+    left_cells = cells(left)
+    right_cells = cells(right)
+    return sorted(
+        key for key in set(left_cells) | set(right_cells)
+        if left_cells.get(key) != right_cells.get(key)
+    )
+
+if __name__ == "__main__":
+    # Report drift between outfit_kb.pl and the Python knowledge base
+    from knowledge_base import KnowledgeBase
+    
+    compiled = load_prolog_kb("outfit_kb.pl")
+    differences = diff_catalogues(compiled["item_options"], KnowledgeBase().knowledge_base)
+    if differences:
+        print("Cells that differ between outfit_kb.pl and knowledge_base.py:")
+        for key in differences:
+            print("  " + "/".join(key))
+    else:
+        print("outfit_kb.pl and knowledge_base.py are in sync")
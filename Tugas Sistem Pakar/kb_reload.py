@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# kb_reload.py - Hot reload of the knowledge base for Outfit Recommendation System
+
+"""
+Reloads the knowledge base while the process keeps serving.
+
+KnowledgeBaseReloader watches the sources a KnowledgeBase was built from:
+the catalogue file, outfit_kb.pl, or the module that holds the dictionary
+knowledge base. When one of them changes, a new KnowledgeBase is built
+next to the old one, taking over the item IDs, masks and filtered tables
+of every cell that didn't change. Engines are then switched to the new
+version with a single reference swap. Requests already running keep the
+version they started on, and only the cached results of changed cells
+are dropped.
+
+Example:
+    reloader = KnowledgeBaseReloader(kb, engines=[engine])
+    reloader.start()
+    ...
+    print(reloader.last_report.as_dict())
+"""
+
+import importlib
+import inspect
+import os
+import sys
+import threading
+from time import perf_counter
+
+class ReloadReport:
+    """Outcome of one reload"""
+    
+    def __init__(self, old_version, new_version=None, seconds=0.0, changed_cells=(),
+                 changed_tips=(), invalidated_results=0, full=False, error=None):
+        """Initialize the report
+        
+        Args:
+            old_version (int): Version that was replaced
+            new_version (int): Version now in use, None if the reload failed
+            seconds (float): Time from the start of the reload to the swap
+            changed_cells: (category, occasion, weather) cells that changed
+            changed_tips: Tip and color tables that changed
+            invalidated_results (int): Cached engine results dropped
+            full (bool): Whether every cell had to be treated as changed
+            error (str): Why the reload failed, the old version stays in use
+        """
+        self.old_version = old_version
+        self.new_version = new_version
+        self.seconds = seconds
+        self.changed_cells = sorted(changed_cells)
+        self.changed_tips = sorted(changed_tips)
+        self.invalidated_results = invalidated_results
+        self.full = full
+        self.error = error
+    
+    def as_dict(self):
+        """Return the report as a JSON-friendly dict"""
+        return {
+            "old_version": self.old_version,
+            "new_version": self.new_version,
+            "seconds": self.seconds,
+            "changed_cells": len(self.changed_cells),
+            "cells": ["/".join(cell) for cell in self.changed_cells],
+            "changed_tips": self.changed_tips,
+            "invalidated_results": self.invalidated_results,
+            "full": self.full,
+            "error": self.error
+        }
+    
+    def __repr__(self):
+        if self.error:
+            return f"ReloadReport(version {self.old_version} kept: {self.error})"
+        return (f"ReloadReport(version {self.old_version} -> {self.new_version}, "
+                f"{len(self.changed_cells)} cells changed, {self.seconds * 1e3:.1f} ms)")
+
+def reload_module_factory(previous):
+    """Build the next version of a dictionary knowledge base
+    
+    The module defining the knowledge base class is re-imported first, so
+    edits to its item lists take effect.
+    
+    Args:
+        previous (KnowledgeBase): Knowledge base being replaced
+    
+    Returns:
+        KnowledgeBase: The new version
+    """
+    cls = type(previous)
+    module = importlib.reload(sys.modules[cls.__module__])
+    cls = getattr(module, cls.__name__)
+    return cls(
+        use_prolog=previous.use_prolog,
+        prolog_file=previous.prolog_file,
+        metrics=previous.metrics,
+        catalogue_file=previous.catalogue_file,
+        previous=previous
+    )
+
+def rebuild_factory(previous):
+    """Build the next version of a knowledge base from its files
+    
+    Args:
+        previous (KnowledgeBase): Knowledge base being replaced
+    
+    Returns:
+        KnowledgeBase: The new version
+    """
+    return type(previous)(
+        use_prolog=previous.use_prolog,
+        prolog_file=previous.prolog_file,
+        metrics=previous.metrics,
+        catalogue_file=previous.catalogue_file,
+        previous=previous
+    )
+
+class KnowledgeBaseReloader:
+    """Watch the knowledge base sources and swap in new versions"""
+    
+    def __init__(self, knowledge_base, engines=(), bridge=None, interval=1.0,
+                 factory=None, sources=None, on_reload=None):
+        """Initialize the reloader
+        
+        Args:
+            knowledge_base (KnowledgeBase): Version currently in use
+            engines: OutfitRecommendationEngine objects switched on a reload
+            bridge (PrologBridge): Optional bridge that reconsults a changed
+                                   Prolog file, keeping its workers warm
+            interval (float): Seconds between checks of the sources
+            factory: Function building the next version from the current
+                     one, defaults to reload_module_factory for the
+                     dictionary knowledge base and rebuild_factory otherwise
+            sources: Files to watch, defaults to the ones the knowledge
+                     base was built from
+            on_reload: Optional function called with every ReloadReport
+        """
+        self.kb = knowledge_base
+        self.engines = list(engines)
+        self.bridge = bridge
+        self.interval = interval
+        self.on_reload = on_reload
+        self.sources = list(sources) if sources is not None else self._default_sources(knowledge_base)
+        if factory is None:
+            python_kb = not knowledge_base.use_prolog and not knowledge_base.catalogue_file
+            factory = reload_module_factory if python_kb else rebuild_factory
+        self.factory = factory
+        self.last_report = None
+        
+        self._stamps = self._stat()
+        # Changed stamps seen on the last check, waiting to settle
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @staticmethod
+    def _default_sources(kb):
+        """Files a knowledge base was built from"""
+        sources = []
+        if kb.catalogue_file:
+            sources.append(kb.catalogue_file)
+        if kb.use_prolog:
+            sources.append(kb.prolog_file)
+        if not sources:
+            sources.append(inspect.getsourcefile(type(kb)))
+        return sources
+    
+    def _stat(self):
+        """Modification time and size of every source, None for missing files"""
+        stamps = []
+        for path in self.sources:
+            try:
+                info = os.stat(path)
+                stamps.append((info.st_mtime_ns, info.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+    
+    def check(self):
+        """Reload if a source changed since the last reload
+        
+        A change is only picked up once the file has looked the same on two
+        checks in a row, so a file that is still being written isn't read.
+        
+        Returns:
+            ReloadReport: The reload report, or None if nothing changed
+        """
+        stamps = self._stat()
+        if stamps == self._stamps or None in stamps:
+            self._pending = None
+            return None
+        if self._pending != stamps:
+            self._pending = stamps
+            return None
+        return self.reload()
+    
+    def reload(self):
+        """Build the next version now and swap it in
+        
+        Returns:
+            ReloadReport: What changed and how long it took
+        """
+        with self._lock:
+            old = self.kb
+            stamps = self._stat()
+            start = perf_counter()
+            try:
+                new = self.factory(old)
+                if old.use_prolog and not new.use_prolog:
+                    # The Prolog file didn't load and the new version fell
+                    # back to the dictionary knowledge base
+                    raise ValueError(new.load_error or f"{old.prolog_file} could not be loaded")
+            except Exception as e:
+                # A broken edit must not take the service down
+                self._stamps = stamps
+                report = ReloadReport(old.version, seconds=perf_counter() - start, error=str(e))
+                return self._finish(report)
+            
+            changed_cells, changed_tips, full = self._diff(old, new)
+            stale = self._stale_results(old, new, changed_cells, changed_tips, full)
+            
+            # The swap: new requests see the new version from here on
+            self.kb = new
+            invalidated = 0
+            for engine in self.engines:
+                engine.kb = new
+                invalidated += engine.invalidate(stale)
+            seconds = perf_counter() - start
+            self._stamps = stamps
+            
+            if self.bridge is not None and new.use_prolog and (changed_cells or changed_tips or full):
+                self.bridge.consult(new.prolog_file)
+            
+            report = ReloadReport(old.version, new.version, seconds, changed_cells,
+                                  changed_tips, invalidated, full)
+            return self._finish(report)
+    
+    def _finish(self, report):
+        self.last_report = report
+        if self.on_reload is not None:
+            self.on_reload(report)
+        return report
+    
+    @staticmethod
+    def _diff(old, new):
+        """Compare two versions
+        
+        Returns:
+            tuple: (changed cells, changed tip tables, whether every cell
+                    has to be treated as changed)
+        """
+        changed_cells = new.diff_cells(old)
+        changed_tips = [
+            name for name in ("color_recommendations", "weather_tips", "occasion_tips")
+            if getattr(old, name) != getattr(new, name)
+        ]
+        # Keywords, extras and fallbacks feed into the filtering of every cell
+        full = (
+            old.attribute_keywords != new.attribute_keywords
+            or old.feminine_extras != new.feminine_extras
+            or old.modest_fallbacks != new.modest_fallbacks
+        )
+        if full:
+            changed_cells = set(old.catalogue.cells) | set(new.catalogue.cells)
+        return changed_cells, changed_tips, full
+    
+    @staticmethod
+    def _stale_results(old, new, changed_cells, changed_tips, full):
+        """Work out which cached (occasion, weather) results are stale
+        
+        Returns:
+            set: (occasion, weather) pairs, or None when every result is stale
+        """
+        if full or "color_recommendations" in changed_tips:
+            return None
+        stale = {(occasion, weather) for _, occasion, weather in changed_cells}
+        pairs = {key[1:] for key in old.catalogue.cells} | {key[1:] for key in new.catalogue.cells}
+        for name, position in (("weather_tips", 1), ("occasion_tips", 0)):
+            if name in changed_tips:
+                old_tips = getattr(old, name)
+                new_tips = getattr(new, name)
+                changed = {key for key in old_tips.keys() | new_tips.keys()
+                           if old_tips.get(key) != new_tips.get(key)}
+                stale.update(pair for pair in pairs if pair[position] in changed)
+        return stale
+    
+    def start(self):
+        """Check the sources every interval seconds on a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="kb-reload", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+    
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error checking knowledge base sources: {e}")
@@ -1,284 +1,760 @@
-#!/usr/bin/env python3
-# knowledge_base.py - Knowledge base module for Outfit Recommendation System
-
-import os
-import sys
-import subprocess
-from datetime import datetime
-
-class KnowledgeBase:
-    """Class to handle the knowledge base for outfit recommendations"""
-    
-    def __init__(self, use_prolog=False):
-        """Initialize knowledge base
-        
-        Args:
-            use_prolog (bool): If True, will try to use the Prolog knowledge base
-                              If False, will use the Python dictionary knowledge base
-        """
-        self.use_prolog = use_prolog
-        
-        # Initialize the Python version of the knowledge base
-        self._init_python_kb()
-        
-        # Try to initialize Prolog if requested
-        if self.use_prolog:
-            self._init_prolog_kb()
-    
-    def _init_python_kb(self):
-        """Initialize the Python version of the knowledge base"""
-        self.knowledge_base = {
-            "tops": {
-                "formal": {
-                    "hot": ["Kemeja katun lengan pendek", "Kemeja linen tipis", "Blus sutra"],
-                    "warm": ["Kemeja formal lengan panjang", "Blus semi-formal", "Kemeja katun lengan 3/4"],
-                    "cold": ["Kemeja tebal", "Sweater kasmir", "Turtle neck"],
-                    "rainy": ["Kemeja lengan panjang", "Blus dengan lapisan dalam"]
-                },
-                "casual": {
-                    "hot": ["Kaos katun", "Tank top", "Crop top", "T-shirt vintage"],
-                    "warm": ["Kaos lengan panjang", "Henley shirt", "Polo shirt"],
-                    "cold": ["Sweater rajut", "Hoodie", "Sweatshirt"],
-                    "rainy": ["Kaos lengan panjang", "Sweater tipis"]
-                },
-                "sports": {
-                    "hot": ["Singlet olahraga", "Sport bra", "Kaos dry-fit"],
-                    "warm": ["Kaos olahraga lengan panjang", "Jersey ringan"],
-                    "cold": ["Jaket olahraga", "Sweater training", "Base layer thermal"],
-                    "rainy": ["Kaos olahraga waterproof", "Jaket lari ringan"]
-                }
-            },
-            
-            "bottoms": {
-                "formal": {
-                    "hot": ["Celana bahan tipis", "Rok A-line", "Celana kulot"],
-                    "warm": ["Celana bahan", "Rok pensil", "Celana ankle-length"],
-                    "cold": ["Celana wool", "Rok panjang", "Celana bahan tebal"],
-                    "rainy": ["Celana bahan anti air", "Rok panjang"]
-                },
-                "casual": {
-                    "hot": ["Celana pendek", "Rok mini", "Jeans pendek", "Rok flare"],
-                    "warm": ["Jeans", "Celana chino", "Rok midi"],
-                    "cold": ["Jeans tebal", "Celana cargo", "Legging"],
-                    "rainy": ["Jeans", "Celana panjang waterproof"]
-                },
-                "sports": {
-                    "hot": ["Celana pendek olahraga", "Legging pendek", "Rok tennis"],
-                    "warm": ["Celana training", "Legging 3/4", "Jogger pants"],
-                    "cold": ["Celana training tebal", "Legging thermal", "Sweatpants"],
-                    "rainy": ["Celana training waterproof", "Legging tahan air"]
-                }
-            },
-            
-            "outerwear": {
-                "formal": {
-                    "hot": ["Tidak diperlukan", "Blazer ultra tipis (opsional)"],
-                    "warm": ["Blazer ringan", "Cardigan formal", "Jas tipis"],
-                    "cold": ["Blazer wol", "Coat formal", "Trench coat"],
-                    "rainy": ["Blazer waterproof", "Trench coat", "Jas hujan formal"]
-                },
-                "casual": {
-                    "hot": ["Tidak diperlukan"],
-                    "warm": ["Cardigan tipis", "Jaket denim", "Kemeja flannel"],
-                    "cold": ["Jaket tebal", "Parka", "Coat casual", "Puffer jacket"],
-                    "rainy": ["Jaket hujan", "Windbreaker", "Parka tahan air"]
-                },
-                "sports": {
-                    "hot": ["Tidak diperlukan"],
-                    "warm": ["Jaket olahraga ringan", "Windbreaker tipis"],
-                    "cold": ["Jaket olahraga tebal", "Windbreaker berlapis", "Down jacket"],
-                    "rainy": ["Jaket hujan olahraga", "Anorak", "Poncho olahraga"]
-                }
-            },
-            
-            "shoes": {
-                "formal": {
-                    "hot": ["Loafer", "Flat shoes", "Sepatu pantofel"],
-                    "warm": ["Oxford shoes", "Sepatu kulit", "Heels"],
-                    "cold": ["Boots formal", "Chelsea boots", "Sepatu kulit berlapis"],
-                    "rainy": ["Boots tahan air", "Sepatu kulit waterproof"]
-                },
-                "casual": {
-                    "hot": ["Sandal", "Slip-on", "Sneakers ringan", "Espadrilles"],
-                    "warm": ["Sneakers", "Sepatu kanvas", "Moccasin"],
-                    "cold": ["Boots casual", "Sneakers tebal", "High-top sneakers"],
-                    "rainy": ["Boots hujan", "Sneakers waterproof"]
-                },
-                "sports": {
-                    "hot": ["Sepatu lari ringan", "Training shoes", "Sandal olahraga"],
-                    "warm": ["Sepatu olahraga", "Cross-trainer", "Athletic shoes"],
-                    "cold": ["Sepatu trail", "Sneakers olahraga tebal", "Hiking shoes"],
-                    "rainy": ["Trail shoes waterproof", "Sepatu olahraga tahan air"]
-                }
-            },
-            
-            "accessories": {
-                "formal": {
-                    "hot": ["Kacamata hitam", "Tas kerja", "Jam tangan", "Scarf tipis"],
-                    "warm": ["Jam tangan", "Dasi", "Tas kerja", "Belt kulit"],
-                    "cold": ["Syal wol", "Sarung tangan kulit", "Tas kerja", "Topi formal"],
-                    "rainy": ["Payung", "Tas waterproof", "Syal anti air"]
-                },
-                "casual": {
-                    "hot": ["Topi bucket", "Kacamata hitam", "Tas selempang", "Gelang"],
-                    "warm": ["Topi baseball", "Sling bag", "Jam tangan casual"],
-                    "cold": ["Beanie", "Syal rajut", "Sarung tangan", "Backpack"],
-                    "rainy": ["Payung pocket", "Tas anti air", "Topi hujan"]
-                },
-                "sports": {
-                    "hot": ["Sport cap", "Wristband", "Tas olahraga", "Headband"],
-                    "warm": ["Beanie sport", "Gym bag", "Smart watch", "Bottle holder"],
-                    "cold": ["Ear warmer", "Sarung tangan olahraga", "Syal microfiber"],
-                    "rainy": ["Tas waterproof", "Penutup sepatu", "Payung mini"]
-                }
-            }
-        }
-    
-    def _init_prolog_kb(self):
-        """Initialize the Prolog knowledge base connection if available"""
-        try:
-            # Check if the prolog file exists
-            if not os.path.exists("outfit_kb.pl"):
-                print("Warning: outfit_kb.pl not found, reverting to Python knowledge base")
-                self.use_prolog = False
-                return
-                
-            # Try to import pyswip if it's available
-            try:
-                from pyswip import Prolog
-                self.prolog = Prolog()
-                self.prolog.consult("outfit_kb.pl")
-                print("Successfully loaded Prolog knowledge base")
-            except ImportError:
-                print("Warning: pyswip not installed, reverting to Python knowledge base")
-                self.use_prolog = False
-        except Exception as e:
-            print(f"Error initializing Prolog knowledge base: {e}")
-            self.use_prolog = False
-    
-    def get_item_options(self, category, occasion, weather):
-        """Get item options based on category, occasion and weather
-        
-        Args:
-            category (str): Item category (tops, bottoms, etc.)
-            occasion (str): Occasion type (formal, casual, sports)
-            weather (str): Weather condition (hot, warm, cold, rainy)
-            
-        Returns:
-            list: List of items matching the criteria
-        """
-        if self.use_prolog:
-            return self._get_from_prolog(category, occasion, weather)
-        else:
-            return self._get_from_python(category, occasion, weather)
-    
-    def _get_from_python(self, category, occasion, weather):
-        """Get items from the Python knowledge base
-        
-        Args:
-            category (str): Item category (tops, bottoms, etc.)
-            occasion (str): Occasion type (formal, casual, sports)
-            weather (str): Weather condition (hot, warm, cold, rainy)
-            
-        Returns:
-            list: List of items matching the criteria
-        """
-        try:
-            return self.knowledge_base[category][occasion][weather]
-        except KeyError:
-            print(f"Warning: No items found for {category}/{occasion}/{weather}")
-            return []
-    
-    def _get_from_prolog(self, category, occasion, weather):
-        """Get items from the Prolog knowledge base
-        
-        Args:
-            category (str): Item category (tops, bottoms, etc.)
-            occasion (str): Occasion type (formal, casual, sports)
-            weather (str): Weather condition (hot, warm, cold, rainy)
-            
-        Returns:
-            list: List of items matching the criteria
-        """
-        try:
-            query = f"item_options({category}, {occasion}, {weather}, Items)"
-            result = list(self.prolog.query(query))
-            if result:
-                # Extract items from the first result
-                return result[0]["Items"]
-            else:
-                print(f"Warning: No Prolog results for {query}")
-                # Fall back to Python knowledge base
-                return self._get_from_python(category, occasion, weather)
-        except Exception as e:
-            print(f"Error querying Prolog: {e}")
-            # Fall back to Python knowledge base
-            return self._get_from_python(category, occasion, weather)
-    
-    def get_season_from_month(self, month):
-        """Determine season based on month number
-        
-        Args:
-            month (int): Month number (1-12)
-            
-        Returns:
-            str: Season name (spring, summer, fall, winter)
-        """
-        if 3 <= month <= 5:
-            return "spring"
-        elif 6 <= month <= 8:
-            return "summer"
-        elif 9 <= month <= 11:
-            return "fall"
-        else:
-            return "winter"
-    
-    def get_color_recommendation(self, season):
-        """Get color recommendation based on season
-        
-        Args:
-            season (str): Season name
-            
-        Returns:
-            str: Color recommendation text
-        """
-        recommendations = {
-            "spring": "Warna-warna pastel seperti mint, peach, atau baby blue cocok untuk musim semi.",
-            "summer": "Warna-warna cerah seperti kuning, biru laut, atau coral ideal untuk musim panas.",
-            "fall": "Warna-warna hangat seperti maroon, olive, atau mustard cocok untuk musim gugur.",
-            "winter": "Warna-warna gelap seperti navy, burgundy, atau forest green ideal untuk musim dingin."
-        }
-        return recommendations.get(season, "Pilih warna yang sesuai dengan preferensi Anda.")
-    
-    def get_weather_tip(self, weather):
-        """Get tip based on weather condition
-        
-        Args:
-            weather (str): Weather condition
-            
-        Returns:
-            str: Weather-specific tip
-        """
-        tips = {
-            "hot": "☀️ Tip: Pilih bahan yang breathable dan menyerap keringat. Jangan lupa sunscreen!",
-            "rainy": "🌧️ Tip: Bawa payung atau jas hujan dan hindari sepatu berbahan suede atau kulit yang mudah rusak terkena air.",
-            "cold": "❄️ Tip: Gunakan teknik layering untuk menjaga tubuh tetap hangat. Inner thermal bisa jadi pilihan tepat.",
-            "warm": "🌤️ Tip: Pilih lapisan yang bisa ditambah atau dikurangi sesuai dengan perubahan suhu sepanjang hari."
-        }
-        return tips.get(weather, "")
-    
-    def get_occasion_tip(self, occasion):
-        """Get tip based on occasion
-        
-        Args:
-            occasion (str): Occasion type
-            
-        Returns:
-            str: Occasion-specific tip
-        """
-        tips = {
-            "formal": "💼 Tip: Pilih aksesoris minimalis namun elegan untuk tampilan profesional.",
-            "casual": "🛍️ Tip: Prioritaskan kenyamanan namun tetap stylish dengan memadukan item basic dan statement piece.",
-            "sports": "🏃 Tip: Utamakan kenyamanan dan mobilitas. Bawa botol air dan handuk kecil."
-        }
-        return tips.get(occasion, "")
\ No newline at end of file
+#!/usr/bin/env python3
+# knowledge_base.py - Knowledge base module for Outfit Recommendation System
+
+import os
+from array import array
+from time import perf_counter
+from types import MappingProxyType
+
+from catalogue import Catalogue
+from metrics import NULL_METRICS
+
+# Categories whose items are filtered by gender and modesty preference
+FILTERED_CATEGORIES = ("tops", "bottoms")
+
+# Accepted request inputs, shared by the UI, CLI, service and benchmarks
+WEATHERS = ("hot", "warm", "cold", "rainy")
+OCCASIONS = ("formal", "casual", "sports")
+GENDERS = ("masculine", "feminine", "neutral")
+SPECIALS = ("modest", "none")
+
+def validate_inputs(weather, occasion, gender="neutral", special="none"):
+    """Check that request inputs are known values
+    
+    Args:
+        weather (str): Weather value (hot, warm, cold, rainy)
+        occasion (str): Occasion value (formal, casual, sports)
+        gender (str): Gender preference (masculine, feminine, neutral)
+        special (str): Special considerations (modest, none)
+        
+    Returns:
+        tuple: (weather, occasion, gender, special)
+        
+    Raises:
+        ValueError: Naming the first field with an unknown value
+    """
+    for field, value, allowed in (("weather", weather, WEATHERS), ("occasion", occasion, OCCASIONS),
+                                  ("gender", gender, GENDERS), ("special", special, SPECIALS)):
+        if value not in allowed:
+            raise ValueError(f"{field} must be one of {', '.join(allowed)}")
+    return weather, occasion, gender, special
+
+class KnowledgeBase:
+    """Class to handle the knowledge base for outfit recommendations"""
+    
+    def __init__(self, use_prolog=False, prolog_file="outfit_kb.pl", metrics=None, catalogue_file=None,
+                 previous=None):
+        """Initialize knowledge base
+        
+        Args:
+            use_prolog (bool): If True, will try to use the Prolog knowledge base
+                              If False, will use the Python dictionary knowledge base
+            prolog_file (str): Path to the Prolog knowledge base file
+            metrics (Metrics): Optional instrumentation, shared with engines
+                               built on this knowledge base
+            catalogue_file (str): Optional catalogue file written by
+                                  catalogue_file.py, mapped instead of
+                                  building the catalogue in memory
+            previous (KnowledgeBase): Knowledge base this one replaces on a
+                                      hot reload, see kb_reload.py. Item IDs,
+                                      masks and the filtered tables of
+                                      unchanged cells are carried over
+        """
+        self.use_prolog = use_prolog
+        self.prolog_file = prolog_file
+        self.catalogue_file = catalogue_file
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.version = previous.version + 1 if previous is not None else 1
+        # Why the Prolog knowledge base couldn't be used, if it couldn't
+        self.load_error = None
+        
+        # Initialize the Python version of the knowledge base
+        self._init_python_kb()
+        
+        # Try to initialize Prolog if requested
+        if self.use_prolog:
+            self._init_prolog_kb()
+        
+        # Nothing may change the catalogue after loading
+        self._freeze()
+        
+        # Intern every item name and store the cells as ID slices
+        self._build_catalogue(previous)
+        
+        # Tag every item with its attribute bitmask
+        self._tag_items(previous)
+        
+        # Filtered candidates, computed per input combination on first use
+        self._filtered_tables = {}
+        if previous is not None:
+            self._carry_over_tables(previous)
+    
+    def _init_python_kb(self):
+        """Initialize the Python version of the knowledge base"""
+        self.knowledge_base = {
+            "tops": {
+                "formal": {
+                    "hot": ["Kemeja katun lengan pendek", "Kemeja linen tipis", "Blus sutra"],
+                    "warm": ["Kemeja formal lengan panjang", "Blus semi-formal", "Kemeja katun lengan 3/4"],
+                    "cold": ["Kemeja tebal", "Sweater kasmir", "Turtle neck"],
+                    "rainy": ["Kemeja lengan panjang", "Blus dengan lapisan dalam"]
+                },
+                "casual": {
+                    "hot": ["Kaos katun", "Tank top", "Crop top", "T-shirt vintage"],
+                    "warm": ["Kaos lengan panjang", "Henley shirt", "Polo shirt"],
+                    "cold": ["Sweater rajut", "Hoodie", "Sweatshirt"],
+                    "rainy": ["Kaos lengan panjang", "Sweater tipis"]
+                },
+                "sports": {
+                    "hot": ["Singlet olahraga", "Sport bra", "Kaos dry-fit"],
+                    "warm": ["Kaos olahraga lengan panjang", "Jersey ringan"],
+                    "cold": ["Jaket olahraga", "Sweater training", "Base layer thermal"],
+                    "rainy": ["Kaos olahraga waterproof", "Jaket lari ringan"]
+                }
+            },
+            
+            "bottoms": {
+                "formal": {
+                    "hot": ["Celana bahan tipis", "Rok A-line", "Celana kulot"],
+                    "warm": ["Celana bahan", "Rok pensil", "Celana ankle-length"],
+                    "cold": ["Celana wool", "Rok panjang", "Celana bahan tebal"],
+                    "rainy": ["Celana bahan anti air", "Rok panjang"]
+                },
+                "casual": {
+                    "hot": ["Celana pendek", "Rok mini", "Jeans pendek", "Rok flare"],
+                    "warm": ["Jeans", "Celana chino", "Rok midi"],
+                    "cold": ["Jeans tebal", "Celana cargo", "Legging"],
+                    "rainy": ["Jeans", "Celana panjang waterproof"]
+                },
+                "sports": {
+                    "hot": ["Celana pendek olahraga", "Legging pendek", "Rok tennis"],
+                    "warm": ["Celana training", "Legging 3/4", "Jogger pants"],
+                    "cold": ["Celana training tebal", "Legging thermal", "Sweatpants"],
+                    "rainy": ["Celana training waterproof", "Legging tahan air"]
+                }
+            },
+            
+            "outerwear": {
+                "formal": {
+                    "hot": ["Tidak diperlukan", "Blazer ultra tipis (opsional)"],
+                    "warm": ["Blazer ringan", "Cardigan formal", "Jas tipis"],
+                    "cold": ["Blazer wol", "Coat formal", "Trench coat"],
+                    "rainy": ["Blazer waterproof", "Trench coat", "Jas hujan formal"]
+                },
+                "casual": {
+                    "hot": ["Tidak diperlukan"],
+                    "warm": ["Cardigan tipis", "Jaket denim", "Kemeja flannel"],
+                    "cold": ["Jaket tebal", "Parka", "Coat casual", "Puffer jacket"],
+                    "rainy": ["Jaket hujan", "Windbreaker", "Parka tahan air"]
+                },
+                "sports": {
+                    "hot": ["Tidak diperlukan"],
+                    "warm": ["Jaket olahraga ringan", "Windbreaker tipis"],
+                    "cold": ["Jaket olahraga tebal", "Windbreaker berlapis", "Down jacket"],
+                    "rainy": ["Jaket hujan olahraga", "Anorak", "Poncho olahraga"]
+                }
+            },
+            
+            "shoes": {
+                "formal": {
+                    "hot": ["Loafer", "Flat shoes", "Sepatu pantofel"],
+                    "warm": ["Oxford shoes", "Sepatu kulit", "Heels"],
+                    "cold": ["Boots formal", "Chelsea boots", "Sepatu kulit berlapis"],
+                    "rainy": ["Boots tahan air", "Sepatu kulit waterproof"]
+                },
+                "casual": {
+                    "hot": ["Sandal", "Slip-on", "Sneakers ringan", "Espadrilles"],
+                    "warm": ["Sneakers", "Sepatu kanvas", "Moccasin"],
+                    "cold": ["Boots casual", "Sneakers tebal", "High-top sneakers"],
+                    "rainy": ["Boots hujan", "Sneakers waterproof"]
+                },
+                "sports": {
+                    "hot": ["Sepatu lari ringan", "Training shoes", "Sandal olahraga"],
+                    "warm": ["Sepatu olahraga", "Cross-trainer", "Athletic shoes"],
+                    "cold": ["Sepatu trail", "Sneakers olahraga tebal", "Hiking shoes"],
+                    "rainy": ["Trail shoes waterproof", "Sepatu olahraga tahan air"]
+                }
+            },
+            
+            "accessories": {
+                "formal": {
+                    "hot": ["Kacamata hitam", "Tas kerja", "Jam tangan", "Scarf tipis"],
+                    "warm": ["Jam tangan", "Dasi", "Tas kerja", "Belt kulit"],
+                    "cold": ["Syal wol", "Sarung tangan kulit", "Tas kerja", "Topi formal"],
+                    "rainy": ["Payung", "Tas waterproof", "Syal anti air"]
+                },
+                "casual": {
+                    "hot": ["Topi bucket", "Kacamata hitam", "Tas selempang", "Gelang"],
+                    "warm": ["Topi baseball", "Sling bag", "Jam tangan casual"],
+                    "cold": ["Beanie", "Syal rajut", "Sarung tangan", "Backpack"],
+                    "rainy": ["Payung pocket", "Tas anti air", "Topi hujan"]
+                },
+                "sports": {
+                    "hot": ["Sport cap", "Wristband", "Tas olahraga", "Headband"],
+                    "warm": ["Beanie sport", "Gym bag", "Smart watch", "Bottle holder"],
+                    "cold": ["Ear warmer", "Sarung tangan olahraga", "Syal microfiber"],
+                    "rainy": ["Tas waterproof", "Penutup sepatu", "Payung mini"]
+                }
+            }
+        }
+        
+        # Keywords that tag an item with an attribute. Every attribute gets
+        # one bit of the item's mask, in the order listed here
+        self.attribute_keywords = {
+            "feminine": ["Blus", "Rok", "Dress", "Crop top"],
+            "immodest": ["Crop top", "Tank top", "Singlet", "Rok mini", "Celana pendek"],
+            "waterproof": ["waterproof", "hujan", "tahan air", "Payung"],
+            "thermal": ["thermal", "tebal", "wol", "kasmir", "Down jacket"]
+        }
+        
+        # Extra options offered for the feminine style preference
+        self.feminine_extras = {
+            "formal": {
+                "tops": ["Blus formal", "Kemeja feminine"],
+                "bottoms": ["Rok pensil", "Dress formal"]
+            },
+            "casual": {
+                "tops": ["Blus casual", "Crop top stylish"],
+                "bottoms": ["Rok casual", "Dress santai"]
+            },
+            "sports": {
+                "tops": ["Sport bra", "Tank top feminine"]
+            }
+        }
+        
+        # Modest alternatives used when filtering leaves nothing
+        self.modest_fallbacks = {
+            "tops": ["Kemeja lengan panjang", "Blus tertutup", "Kaos lengan panjang"],
+            "bottoms": ["Celana panjang", "Rok panjang", "Celana kulot"]
+        }
+        
+        # Color recommendations based on season
+        self.color_recommendations = {
+            "spring": "Warna-warna pastel seperti mint, peach, atau baby blue cocok untuk musim semi.",
+            "summer": "Warna-warna cerah seperti kuning, biru laut, atau coral ideal untuk musim panas.",
+            "fall": "Warna-warna hangat seperti maroon, olive, atau mustard cocok untuk musim gugur.",
+            "winter": "Warna-warna gelap seperti navy, burgundy, atau forest green ideal untuk musim dingin."
+        }
+        
+        # Tips based on weather condition
+        self.weather_tips = {
+            "hot": "☀️ Tip: Pilih bahan yang breathable dan menyerap keringat. Jangan lupa sunscreen!",
+            "rainy": "🌧️ Tip: Bawa payung atau jas hujan dan hindari sepatu berbahan suede atau kulit yang mudah rusak terkena air.",
+            "cold": "❄️ Tip: Gunakan teknik layering untuk menjaga tubuh tetap hangat. Inner thermal bisa jadi pilihan tepat.",
+            "warm": "🌤️ Tip: Pilih lapisan yang bisa ditambah atau dikurangi sesuai dengan perubahan suhu sepanjang hari."
+        }
+        
+        # Tips based on occasion
+        self.occasion_tips = {
+            "formal": "💼 Tip: Pilih aksesoris minimalis namun elegan untuk tampilan profesional.",
+            "casual": "🛍️ Tip: Prioritaskan kenyamanan namun tetap stylish dengan memadukan item basic dan statement piece.",
+            "sports": "🏃 Tip: Utamakan kenyamanan dan mobilitas. Bawa botol air dan handuk kecil."
+        }
+    
+    def _init_prolog_kb(self):
+        """Load the catalogue, tips and keywords from the Prolog knowledge base
+        
+        The ground facts of the Prolog file are compiled into the same Python
+        structures used by the dictionary knowledge base, so queries never go
+        through a Prolog engine and both modes cost the same per request.
+        """
+        try:
+            # Check if the prolog file exists
+            if not os.path.exists(self.prolog_file):
+                print(f"Warning: {self.prolog_file} not found, reverting to Python knowledge base")
+                self.load_error = f"{self.prolog_file} not found"
+                self.metrics.increment("prolog_fallbacks")
+                self.use_prolog = False
+                return
+            
+            from kb_loader import load_prolog_kb
+            compiled = load_prolog_kb(self.prolog_file)
+            self.knowledge_base = compiled["item_options"]
+            self.color_recommendations.update(compiled["color_recommendation"])
+            self.weather_tips.update(compiled["weather_tip"])
+            self.occasion_tips.update(compiled["occasion_tip"])
+            self.attribute_keywords.update(compiled["attribute_keywords"])
+            if compiled["feminine_keywords"]:
+                self.attribute_keywords["feminine"] = compiled["feminine_keywords"]
+            if compiled["immodest_keywords"]:
+                self.attribute_keywords["immodest"] = compiled["immodest_keywords"]
+            if compiled["attribute_bits"]:
+                # Use the bit positions declared in the Prolog file
+                bits = compiled["attribute_bits"]
+                self.attribute_keywords = dict(sorted(
+                    self.attribute_keywords.items(),
+                    key=lambda pair: bits.get(pair[0], len(bits))
+                ))
+            print("Successfully loaded Prolog knowledge base")
+        except Exception as e:
+            print(f"Error initializing Prolog knowledge base: {e}")
+            self.load_error = str(e)
+            self.metrics.increment("prolog_errors")
+            self.metrics.increment("prolog_fallbacks")
+            self.use_prolog = False
+    
+    def _freeze(self):
+        """Turn the loaded lookup tables into read-only views
+        
+        Item lists become tuples and the nested dictionaries, the color
+        recommendations and the tips become mapping proxies, so callers
+        can't grow or reorder the shared knowledge base by accident. The
+        catalogue itself is made read-only by _build_catalogue.
+        """
+        def freeze(value):
+            if isinstance(value, dict):
+                return MappingProxyType({key: freeze(item) for key, item in value.items()})
+            if isinstance(value, list):
+                return tuple(value)
+            return value
+        
+        self.feminine_extras = freeze(self.feminine_extras)
+        self.modest_fallbacks = freeze(self.modest_fallbacks)
+        self.attribute_keywords = freeze(self.attribute_keywords)
+        self.color_recommendations = freeze(self.color_recommendations)
+        self.weather_tips = freeze(self.weather_tips)
+        self.occasion_tips = freeze(self.occasion_tips)
+        self.feminine_keywords = self.attribute_keywords["feminine"]
+        self.immodest_keywords = self.attribute_keywords["immodest"]
+    
+    def _build_catalogue(self, previous=None):
+        """Move the item lists into an integer-interned Catalogue
+        
+        Every item name is stored once and every cell becomes a slice of
+        one ID buffer. knowledge_base stays available as a read-only nested
+        view that resolves names on access. With a catalogue file the
+        catalogue is memory-mapped from it instead.
+        
+        Args:
+            previous (KnowledgeBase): Knowledge base being replaced, its
+                                      in-memory item IDs are kept
+        """
+        extra_items = [item for categories in self.feminine_extras.values()
+                       for cell in categories.values() for item in cell]
+        extra_items += [item for cell in self.modest_fallbacks.values() for item in cell]
+        
+        self.catalogue = None
+        if self.catalogue_file:
+            from catalogue_file import CatalogueFileError, MappedCatalogue
+            try:
+                self.catalogue = MappedCatalogue(self.catalogue_file)
+                for item in extra_items:
+                    self.catalogue.intern(item)
+            except CatalogueFileError as e:
+                print(f"Warning: {e}, building the catalogue in memory")
+                self.catalogue = None
+        
+        if self.catalogue is None:
+            base = None
+            if previous is not None and type(previous.catalogue) is Catalogue:
+                base = previous.catalogue
+            self.catalogue = Catalogue.from_nested(self.knowledge_base, base)
+            for item in extra_items:
+                self.catalogue.intern(item)
+        
+        # ID -> name table used when a recommendation is rendered
+        self.item_names = self.catalogue.strings
+        self.knowledge_base = self.catalogue.nested()
+    
+    def _tag_items(self, previous=None):
+        """Give every known item its attribute bitmask
+        
+        Keyword matching happens once per item here. Filters then only
+        test bits, so their cost no longer depends on the keyword lists.
+        
+        Args:
+            previous (KnowledgeBase): Knowledge base being replaced, whose
+                                      masks are reused when the item IDs and
+                                      keywords are the same
+        """
+        if len(self.attribute_keywords) > 64:
+            raise ValueError("At most 64 item attributes are supported")
+        self.attribute_bits = MappingProxyType({
+            name: 1 << index for index, name in enumerate(self.attribute_keywords)
+        })
+        
+        # Indexed by item ID. A mapped catalogue carries masks, which are
+        # valid as long as they were built from the same keywords
+        stored = getattr(self.catalogue, "masks", None)
+        if stored is not None and self.catalogue.attributes == self.attribute_fingerprint():
+            self._item_masks = stored
+        elif self._reuses_masks(previous):
+            # Only items that are new in this catalogue need matching
+            self._item_masks = array("Q", previous._item_masks)
+            self._item_masks.extend(
+                self._compute_mask(item) for item in self.item_names[len(self._item_masks):]
+            )
+        else:
+            self._item_masks = array("Q", (self._compute_mask(item) for item in self.item_names))
+    
+    def shares_ids(self, other):
+        """Check whether an item ID means the same item here and in another knowledge base
+        
+        True when one in-memory catalogue was built on top of the other,
+        see Catalogue.from_nested.
+        """
+        if type(self.catalogue) is not Catalogue or type(other.catalogue) is not Catalogue:
+            return False
+        mine = self.catalogue.strings
+        theirs = other.catalogue.strings
+        if len(mine) < len(theirs):
+            mine, theirs = theirs, mine
+        return mine[:len(theirs)] == theirs
+    
+    def _reuses_masks(self, previous):
+        """Check whether the masks of a replaced knowledge base are still valid"""
+        return (
+            previous is not None
+            and previous.attribute_keywords == self.attribute_keywords
+            and self.shares_ids(previous)
+        )
+    
+    def _carry_over_tables(self, previous):
+        """Keep the filtered tables of cells a hot reload didn't change
+        
+        Tables hold item IDs, so they are only reused when IDs, masks,
+        extras and fallbacks are all the same as in the previous version.
+        Unfiltered categories are slices of the old ID buffer and are cheap
+        to take again, so they are left out.
+        """
+        if not (self._reuses_masks(previous)
+                and previous.feminine_extras == self.feminine_extras
+                and previous.modest_fallbacks == self.modest_fallbacks):
+            return
+        changed = self.diff_cells(previous)
+        for key, item_ids in previous._filtered_tables.items():
+            if key[0] in FILTERED_CATEGORIES and key[:3] not in changed:
+                self._filtered_tables[key] = item_ids
+    
+    def diff_cells(self, other):
+        """Find the cells whose items differ from another knowledge base
+        
+        Args:
+            other (KnowledgeBase): Knowledge base to compare with
+        
+        Returns:
+            set: (category, occasion, weather) keys that were added, removed
+                 or have different items
+        """
+        mine = self.catalogue
+        theirs = other.catalogue
+        changed = set(mine.cells.keys() ^ theirs.cells.keys())
+        same_ids = self.shares_ids(other)
+        for key in mine.cells.keys() & theirs.cells.keys():
+            if same_ids:
+                # Equal IDs mean equal items, compare the raw slices
+                if mine.cell_ids(*key) != theirs.cell_ids(*key):
+                    changed.add(key)
+            elif mine.cell_items(*key) != theirs.cell_items(*key):
+                changed.add(key)
+        return changed
+    
+    def attribute_fingerprint(self):
+        """Identify the attribute keywords the item masks are built from
+        
+        Returns:
+            str: Hex digest of the attribute names and keywords in bit order
+        """
+        import hashlib
+        import json
+        
+        keywords = [[name, list(words)] for name, words in self.attribute_keywords.items()]
+        return hashlib.sha256(json.dumps(keywords).encode("utf-8")).hexdigest()
+    
+    def item_masks(self):
+        """Return the attribute mask of every item, indexed by item ID"""
+        return self._item_masks
+    
+    def _compute_mask(self, item):
+        """Match an item name against every attribute's keywords"""
+        mask = 0
+        for name, keywords in self.attribute_keywords.items():
+            if self._matches_any(item, keywords):
+                mask |= self.attribute_bits[name]
+        return mask
+    
+    def attribute_mask(self, *attributes):
+        """Combine attributes into one bitmask
+        
+        Args:
+            *attributes (str): Attribute names, e.g. "waterproof", "thermal"
+            
+        Returns:
+            int: Bitmask with the bit of every named attribute set
+        """
+        mask = 0
+        for name in attributes:
+            mask |= self.attribute_bits[name]
+        return mask
+    
+    def item_mask(self, item):
+        """Return the attribute bitmask of an item
+        
+        Args:
+            item (str): Item name
+            
+        Returns:
+            int: Bitmask of the item's attributes
+        """
+        item_id = self.catalogue.id_of(item)
+        if item_id is None:
+            # Item from outside the catalogue, tag it now
+            return self._compute_mask(item)
+        return self._item_masks[item_id]
+    
+    def has_attribute(self, item, attribute):
+        """Check whether an item carries an attribute
+        
+        Args:
+            item (str): Item name
+            attribute (str): Attribute name
+            
+        Returns:
+            bool: True if the item is tagged with the attribute
+        """
+        return bool(self.item_mask(item) & self.attribute_bits[attribute])
+    
+    def items_with(self, items, required=0, excluded=0):
+        """Filter items by attribute bits
+        
+        Args:
+            items: Item names to filter
+            required (int): Mask of attributes every item must have
+            excluded (int): Mask of attributes no item may have
+            
+        Returns:
+            list: Items passing both masks, in their original order
+        """
+        item_mask = self.item_mask
+        selected = []
+        for item in items:
+            mask = item_mask(item)
+            if mask & required == required and not mask & excluded:
+                selected.append(item)
+        return selected
+    
+    def ids_with(self, item_ids, required=0, excluded=0):
+        """Filter item IDs by attribute bits, see items_with
+        
+        Args:
+            item_ids: Item IDs to filter
+            required (int): Mask of attributes every item must have
+            excluded (int): Mask of attributes no item may have
+            
+        Returns:
+            list: IDs passing both masks, in their original order
+        """
+        masks = self._item_masks
+        return [
+            item_id for item_id in item_ids
+            if masks[item_id] & required == required and not masks[item_id] & excluded
+        ]
+    
+    def get_item_options(self, category, occasion, weather):
+        """Get item options based on category, occasion and weather
+        
+        Args:
+            category (str): Item category (tops, bottoms, etc.)
+            occasion (str): Occasion type (formal, casual, sports)
+            weather (str): Weather condition (hot, warm, cold, rainy)
+            
+        Returns:
+            tuple: Read-only sequence of items matching the criteria
+        """
+        return self._get_from_python(category, occasion, weather)
+    
+    def get_filtered_options(self, category, occasion, weather, gender, special, extended=False):
+        """Get the filtered candidates for a full set of user inputs
+        
+        Args:
+            category (str): Item category (tops, bottoms, etc.)
+            occasion (str): Occasion type (formal, casual, sports)
+            weather (str): Weather condition (hot, warm, cold, rainy)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            extended (bool): Include the extra feminine options
+            
+        Returns:
+            tuple: Items left after gender and modesty filtering
+        """
+        names = self.item_names
+        return tuple(
+            names[item_id]
+            for item_id in self.get_filtered_ids(category, occasion, weather, gender, special, extended)
+        )
+    
+    def get_filtered_ids(self, category, occasion, weather, gender, special, extended=False):
+        """Get the filtered candidates as item IDs, see get_filtered_options
+        
+        Names are resolved with item_names only for the items actually picked.
+        Each combination is filtered once, on first use, and kept for later
+        calls; build_filtered_tables does all of them up front.
+        
+        Returns:
+            Read-only sequence of item IDs left after gender and modesty filtering
+        """
+        if gender not in GENDERS:
+            gender = "neutral"
+        if special not in SPECIALS:
+            special = "none"
+        
+        key = (category, occasion, weather, gender, special, extended)
+        item_ids = self._filtered_tables.get(key)
+        if item_ids is None:
+            item_ids = self._filter_ids(category, occasion, weather, gender, special, extended)
+            # Unknown category/occasion/weather isn't kept, it would grow the table
+            if (category, occasion, weather) in self.catalogue.cells:
+                self._filtered_tables[key] = item_ids
+        return item_ids
+    
+    def build_filtered_tables(self):
+        """Precompute the filtered candidate IDs for every input combination
+        
+        The catalogue is fixed after loading, so gender and modesty filtering
+        only has to run once per (category, occasion, weather, gender, special)
+        cell instead of once per request. Unfiltered categories share the
+        catalogue's own ID slice instead of a copy. Long-running processes
+        call this at startup so no request pays for a first-use filter.
+        Combinations that are already filtered are kept.
+        """
+        for category, occasion, weather in self.catalogue.cells:
+            for gender in GENDERS:
+                for special in SPECIALS:
+                    for extended in (False, True):
+                        key = (category, occasion, weather, gender, special, extended)
+                        if key in self._filtered_tables:
+                            continue
+                        self._filtered_tables[key] = self._filter_ids(
+                            category, occasion, weather, gender, special, extended
+                        )
+    
+    def _filter_ids(self, category, occasion, weather, gender, special, extended):
+        """Apply gender and modesty filtering to one knowledge base cell
+        
+        Args:
+            category (str): Item category (tops, bottoms, etc.)
+            occasion (str): Occasion type (formal, casual, sports)
+            weather (str): Weather condition (hot, warm, cold, rainy)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            extended (bool): Include the extra feminine options
+            
+        Returns:
+            Sequence of item IDs left after gender and modesty filtering
+        """
+        cell = self.catalogue.cell_ids(category, occasion, weather)
+        if cell is None:
+            self.metrics.increment("kb_misses")
+            print(f"Warning: No items found for {category}/{occasion}/{weather}")
+            cell = ()
+        if category not in FILTERED_CATEGORIES:
+            return cell
+        items = list(cell)
+        
+        # Filtering only happens here, while the tables are built and for
+        # unknown cells, so that is where the filter stages are timed
+        metrics = self.metrics
+        timed = metrics.enabled
+        if timed:
+            start = perf_counter()
+        
+        if gender == "masculine":
+            # Filter out feminine items
+            items = self.ids_with(items, excluded=self.attribute_bits["feminine"])
+        
+        if gender == "feminine" and extended:
+            # Add some feminine options if available for the occasion
+            extras = self.feminine_extras.get(occasion, {}).get(category, ())
+            items.extend(self.catalogue.id_of(item) for item in extras)
+        
+        if timed:
+            gender_done = perf_counter()
+            metrics.observe("gender_filter", gender_done - start)
+        
+        if special == "modest":
+            # Remove items that aren't modest
+            items = self.ids_with(items, excluded=self.attribute_bits["immodest"])
+            
+            # Add modest alternatives if needed
+            if not items:
+                items = [self.catalogue.id_of(item) for item in self.modest_fallbacks.get(category, ())]
+        
+        if timed:
+            metrics.observe("modesty_filter", perf_counter() - gender_done)
+        
+        # The table is shared by every caller, so it is handed out read-only
+        return memoryview(array("i", items)).toreadonly()
+    
+    @staticmethod
+    def _matches_any(item, keywords):
+        """Check whether an item name contains any of the keywords"""
+        return any(keyword in item for keyword in keywords)
+    
+    def _get_from_python(self, category, occasion, weather):
+        """Get items from the Python knowledge base
+        
+        Args:
+            category (str): Item category (tops, bottoms, etc.)
+            occasion (str): Occasion type (formal, casual, sports)
+            weather (str): Weather condition (hot, warm, cold, rainy)
+            
+        Returns:
+            tuple: Read-only sequence of items matching the criteria
+        """
+        items = self.catalogue.cell_items(category, occasion, weather)
+        if items is None:
+            self.metrics.increment("kb_misses")
+            print(f"Warning: No items found for {category}/{occasion}/{weather}")
+            return ()
+        return items
+    
+    def get_season_from_month(self, month):
+        """Determine season based on month number
+        
+        Args:
+            month (int): Month number (1-12)
+            
+        Returns:
+            str: Season name (spring, summer, fall, winter)
+        """
+        if 3 <= month <= 5:
+            return "spring"
+        elif 6 <= month <= 8:
+            return "summer"
+        elif 9 <= month <= 11:
+            return "fall"
+        else:
+            return "winter"
+    
+    def get_color_recommendation(self, season):
+        """Get color recommendation based on season
+        
+        Args:
+            season (str): Season name
+            
+        Returns:
+            str: Color recommendation text
+        """
+        return self.color_recommendations.get(season, "Pilih warna yang sesuai dengan preferensi Anda.")
+    
+    def get_weather_tip(self, weather):
+        """Get tip based on weather condition
+        
+        Args:
+            weather (str): Weather condition
+            
+        Returns:
+            str: Weather-specific tip
+        """
+        return self.weather_tips.get(weather, "")
+    
+    def get_occasion_tip(self, occasion):
+        """Get tip based on occasion
+        
+        Args:
+            occasion (str): Occasion type
+            
+        Returns:
+            str: Occasion-specific tip
+        """
+        return self.occasion_tips.get(occasion, "")
\ No newline at end of file
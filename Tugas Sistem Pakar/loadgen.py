@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# loadgen.py - Load generator for the recommendation service
+
+"""
+Opens a number of keep-alive connections to service.py and keeps a fixed
+number of pipelined requests in flight on each one. Reports requests per
+second and p50/p99 latency.
+
+Run with:
+    python loadgen.py --port 8080 --connections 32 --pipeline 8 --duration 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from knowledge_base import GENDERS, OCCASIONS, SPECIALS, WEATHERS
+
+def build_requests(host, count=256, seed=0):
+    """Prepare a pool of encoded /recommend requests with varied inputs
+    
+    Args:
+        host (str): Value for the Host header
+        count (int): Number of distinct requests to prepare
+        seed (int): Seed for picking the inputs
+    
+    Returns:
+        list: Encoded HTTP requests
+    """
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        body = json.dumps({
+            "weather": rng.choice(WEATHERS),
+            "occasion": rng.choice(OCCASIONS),
+            "gender": rng.choice(GENDERS),
+            "special": rng.choice(SPECIALS),
+            "date": [rng.randint(1, 28), rng.randint(1, 12), 2025]
+        }).encode("utf-8")
+        head = (
+            f"POST /recommend HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        requests.append(head + body)
+    return requests
+
+async def read_response(reader):
+    """Read one HTTP response and return its status code"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return status
+
+async def run_connection(open_connection, requests, pipeline, deadline, latencies, errors):
+    """Drive one keep-alive connection until the deadline
+    
+    Args:
+        open_connection: Coroutine function returning (reader, writer)
+        requests (list): Encoded requests to cycle through
+        pipeline (int): Requests kept in flight on the connection
+        deadline (float): time.perf_counter() value to stop at
+        latencies (list): Receives the latency of every response in seconds
+        errors (list): Receives one entry per non-200 response
+    """
+    reader, writer = await open_connection()
+    cycle = itertools.cycle(requests)
+    in_flight = []
+    try:
+        while True:
+            now = time.perf_counter()
+            if now < deadline:
+                while len(in_flight) < pipeline:
+                    writer.write(next(cycle))
+                    in_flight.append(time.perf_counter())
+            elif not in_flight:
+                break
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - in_flight.pop(0))
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+def percentile(sorted_values, fraction):
+    """Return the value at a fraction (0-1) of a sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+async def run_load(args):
+    """Run the load test and print a summary"""
+    if args.unix:
+        def open_connection():
+            return asyncio.open_unix_connection(args.unix)
+        host = "localhost"
+    else:
+        def open_connection():
+            return asyncio.open_connection(args.host, args.port)
+        host = f"{args.host}:{args.port}"
+    
+    requests = build_requests(host)
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        run_connection(open_connection, requests, args.pipeline, deadline, latencies, errors)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    print(f"Connections : {args.connections} (pipeline depth {args.pipeline})")
+    print(f"Requests    : {len(latencies)} in {elapsed:.2f} s, {len(errors)} errors")
+    print(f"Throughput  : {len(latencies) / elapsed:.0f} req/s")
+    print(f"Latency p50 : {percentile(latencies, 0.50) * 1e3:.2f} ms")
+    print(f"Latency p99 : {percentile(latencies, 0.99) * 1e3:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for service.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="Connect to a Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=4, help="Requests in flight per connection")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send requests for")
+    asyncio.run(run_load(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# metrics.py - Instrumentation for Outfit Recommendation System
+
+"""
+Per-stage timers and event counters for the engine, knowledge base and
+Prolog bridge, with exporters for the Prometheus text format and JSON.
+
+Components take a ``metrics`` argument. The default is NULL_METRICS, whose
+``enabled`` flag is False; hot paths check that flag once and skip the
+clock reads entirely, so disabled instrumentation costs one attribute
+lookup per call.
+
+Example:
+    metrics = Metrics()
+    kb = KnowledgeBase(metrics=metrics)
+    engine = OutfitRecommendationEngine(kb)
+    ...
+    print(metrics.export(PrometheusExporter()))
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Stages timed by the built-in instrumentation
+STAGES = ("kb_lookup", "gender_filter", "modesty_filter", "selection", "formatting", "prolog_query")
+# Events counted by the built-in instrumentation
+COUNTERS = ("kb_misses", "prolog_fallbacks", "prolog_errors", "recommendation_errors")
+
+class Metrics:
+    """Collects stage timings and event counts"""
+    
+    enabled = True
+    
+    def __init__(self):
+        """Initialize empty timers and counters"""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Drop everything collected so far"""
+        with self._lock:
+            # stage -> [calls, total seconds, slowest call]
+            self._timers = {stage: [0, 0.0, 0.0] for stage in STAGES}
+            self._counters = {name: 0 for name in COUNTERS}
+    
+    def observe(self, stage, seconds):
+        """Record one timed run of a stage
+        
+        Args:
+            stage (str): Stage name, see STAGES
+            seconds (float): Duration of the run
+        """
+        with self._lock:
+            timer = self._timers.get(stage)
+            if timer is None:
+                timer = self._timers[stage] = [0, 0.0, 0.0]
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+    
+    def increment(self, name, amount=1):
+        """Increase an event counter
+        
+        Args:
+            name (str): Counter name, see COUNTERS
+            amount (int): Value to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    @contextmanager
+    def timer(self, stage):
+        """Time a block of code as one run of a stage
+        
+        Meant for code outside the hot paths, which read the clock directly.
+        
+        Args:
+            stage (str): Stage name, see STAGES
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+    
+    def snapshot(self):
+        """Return a consistent copy of the collected values
+        
+        Returns:
+            dict: {"timers": {stage: {"count", "total_seconds", "max_seconds"}},
+                   "counters": {name: value}}
+        """
+        with self._lock:
+            timers = {
+                stage: {"count": count, "total_seconds": total, "max_seconds": slowest}
+                for stage, (count, total, slowest) in self._timers.items()
+            }
+            counters = dict(self._counters)
+        return {"timers": timers, "counters": counters}
+    
+    def export(self, exporter=None):
+        """Render the current snapshot with an exporter
+        
+        Args:
+            exporter: Object with an export(snapshot) method,
+                      defaults to JsonExporter
+        
+        Returns:
+            str: The rendered metrics
+        """
+        return (exporter or JsonExporter()).export(self.snapshot())
+
+class NullMetrics(Metrics):
+    """Metrics that record nothing, used when instrumentation is off"""
+    
+    enabled = False
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._counters = {}
+    
+    def reset(self):
+        pass
+    
+    def observe(self, stage, seconds):
+        pass
+    
+    def increment(self, name, amount=1):
+        pass
+    
+    def timer(self, stage):
+        return nullcontext()
+
+# Shared disabled instance, the default for every component
+NULL_METRICS = NullMetrics()
+
+class JsonExporter:
+    """Render a snapshot as a JSON document"""
+    
+    def __init__(self, indent=None):
+        """Initialize the exporter
+        
+        Args:
+            indent (int): Indentation passed to json.dumps
+        """
+        self.indent = indent
+    
+    def export(self, snapshot):
+        import json
+        return json.dumps(snapshot, indent=self.indent, sort_keys=True)
+
+class PrometheusExporter:
+    """Render a snapshot in the Prometheus text exposition format"""
+    
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+    
+    def __init__(self, prefix="outfit"):
+        """Initialize the exporter
+        
+        Args:
+            prefix (str): Prefix for every metric name
+        """
+        self.prefix = prefix
+    
+    def export(self, snapshot):
+        prefix = self.prefix
+        lines = []
+        
+        timer_metrics = (
+            ("stage_calls_total", "counter", "Number of timed runs per stage", "count"),
+            ("stage_seconds_total", "counter", "Total time spent per stage", "total_seconds"),
+            ("stage_seconds_max", "gauge", "Slowest single run per stage", "max_seconds"),
+        )
+        for name, kind, description, field in timer_metrics:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for stage, timer in sorted(snapshot["timers"].items()):
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {timer[field]!r}')
+        
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        
+        return "\n".join(lines) + "\n"
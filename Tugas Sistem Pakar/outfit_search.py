@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# outfit_search.py - Top-k scored outfit search for Outfit Recommendation System
+
+"""
+Ranks whole outfits instead of picking every category independently.
+
+An outfit's score is the sum of its item scores plus a compatibility score
+for every pair of items:
+
+- item score: style matching the occasion, waterproof/thermal items for the
+  weather, a colour from the season's palette (the colours named by
+  get_color_recommendation) or from the user's preferred colours, and
+  liked/disliked keywords of the user
+- pair score: depends only on the style of the two items (formal, casual,
+  sports or neutral), e.g. a formal top with sports shoes is penalised
+
+Because pair scores only depend on styles, the candidates of a category
+are grouped by style and sorted by item score once per cell. The search is
+best-first branch and bound over one heap: partial style assignments are
+ordered by an upper bound of every outfit below them, and a complete style
+assignment enumerates its item combinations lazily in descending score
+order. Outfits come out of the generator best first, so the top k cost k
+pops no matter how many items a cell holds, and the Cartesian product is
+never built.
+
+Accessories don't interact with each other, so every outfit gets the best
+accessories for its styles; other accessory sets aren't enumerated as
+separate outfits.
+
+Example:
+    search = OutfitSearch(KnowledgeBase())
+    for score, outfit in search.top_k("rainy", "formal", "feminine", "none", (1, 6, 2025), k=3,
+                                      preferences={"colors": ["navy"]}):
+        print(score, search.recommendation(outfit, "rainy", "formal", (1, 6, 2025)))
+"""
+
+import heapq
+from datetime import datetime
+from itertools import count, islice
+
+from query_cache import QueryCache
+
+# No item in a category, same as the planner's
+NO_ITEM = -1
+
+# Categories with one item per outfit, in the order they are assigned
+SINGLE_CATEGORIES = ("tops", "bottoms", "outerwear", "shoes")
+
+# Items that stand for "nothing"
+PLACEHOLDER_MARK = "Tidak diperlukan"
+
+# Name keywords of every style, matched case-insensitively in this order
+STYLE_KEYWORDS = (
+    ("sports", ("olahraga", "sport", "training", "dry-fit", "jersey", "lari", "legging", "jogger",
+                "trail", "athletic", "cross-trainer", "gym", "wristband", "headband", "sweatpants",
+                "singlet", "hiking", "smart watch", "bottle holder", "poncho")),
+    ("casual", ("casual", "santai", "kaos", "t-shirt", "jeans", "denim", "sneakers", "hoodie",
+                "sweatshirt", "polo", "henley", "flannel", "cargo", "chino", "crop top", "sandal",
+                "slip-on", "kanvas", "espadrilles", "moccasin", "baseball", "bucket", "backpack",
+                "sling bag", "selempang", "kacamata hitam")),
+    ("formal", ("formal", "blazer", "jas ", "kemeja", "bahan", "pensil", "oxford", "pantofel",
+                "loafer", "kulit", "dasi", "tas kerja", "heels", "chelsea", "trench", "sutra",
+                "kasmir", "wol"))
+)
+NEUTRAL = "neutral"
+
+# Colour words recognised in item names and in the season colour texts
+COLOR_WORDS = (
+    "baby blue", "biru laut", "forest green", "mint", "peach", "kuning", "coral", "maroon",
+    "olive", "mustard", "navy", "burgundy", "hitam", "putih", "abu-abu", "krem", "coklat",
+    "merah", "biru", "hijau", "pink", "ungu"
+)
+
+# Compatibility of two styles, neutral items go with everything
+PAIR_SCORES = {
+    frozenset(("formal",)): 1.0,
+    frozenset(("casual",)): 1.0,
+    frozenset(("sports",)): 1.0,
+    frozenset(("formal", "casual")): -0.5,
+    frozenset(("casual", "sports")): -0.5,
+    frozenset(("formal", "sports")): -2.0,
+}
+MAX_PAIR_SCORE = max(PAIR_SCORES.values())
+
+# Item score weights
+STYLE_MATCH = 1.0
+STYLE_MISMATCH = -0.5
+WEATHER_MATCH = 1.5
+WEATHER_MISMATCH = -1.5
+SEASON_COLOR = 1.0
+PREFERRED_COLOR = 2.0
+LIKED_KEYWORD = 2.0
+DISLIKED_KEYWORD = -3.0
+
+def pair_score(style_a, style_b):
+    """Compatibility score of two item styles
+    
+    Args:
+        style_a (str): Style of the first item
+        style_b (str): Style of the second item
+    
+    Returns:
+        float: Pair score, 0 when either item is neutral
+    """
+    if style_a == NEUTRAL or style_b == NEUTRAL:
+        return 0.0
+    return PAIR_SCORES[frozenset((style_a, style_b))]
+
+class _Group:
+    """Candidates of one category and style, best item score first"""
+    
+    __slots__ = ("style", "scores", "ids")
+    
+    def __init__(self, style, scored):
+        self.style = style
+        self.scores = [score for score, _ in scored]
+        self.ids = [item_id for _, item_id in scored]
+
+class OutfitSearch:
+    """Top-k outfit search over the filtered candidates of a knowledge base"""
+    
+    def __init__(self, knowledge_base, accessories=2, cache_size=1024):
+        """Initialize the search
+        
+        Args:
+            knowledge_base (KnowledgeBase): Knowledge base the candidates come from
+            accessories (int): Number of accessories per outfit
+            cache_size (int): Scored cells to keep, one per set of inputs and preferences
+        """
+        self.kb = knowledge_base
+        self.accessories = accessories
+        self._groups = QueryCache(max(cache_size, 1))
+        # Style and colour of every item, tagged on first use
+        self._styles = {}
+        self._colors = {}
+        names = knowledge_base.item_names
+        self._placeholders = frozenset(
+            item_id for item_id in range(len(names)) if PLACEHOLDER_MARK in names[item_id]
+        )
+        bits = knowledge_base.attribute_bits
+        self._waterproof = bits.get("waterproof", 0)
+        self._thermal = bits.get("thermal", 0)
+    
+    def style(self, item_id):
+        """Style of an item: formal, casual, sports or neutral"""
+        style = self._styles.get(item_id)
+        if style is None:
+            name = self.kb.item_names[item_id].lower() + " "
+            style = NEUTRAL
+            if item_id not in self._placeholders:
+                for candidate, keywords in STYLE_KEYWORDS:
+                    if any(keyword in name for keyword in keywords):
+                        style = candidate
+                        break
+            self._styles[item_id] = style
+        return style
+    
+    def color(self, item_id):
+        """Colour named in an item's name, None if it names none"""
+        if item_id not in self._colors:
+            name = self.kb.item_names[item_id].lower()
+            self._colors[item_id] = next((word for word in COLOR_WORDS if word in name), None)
+        return self._colors[item_id]
+    
+    def palette(self, season):
+        """Colours named by the colour recommendation of a season
+        
+        Args:
+            season (str): Season name
+        
+        Returns:
+            frozenset: Colour words found in get_color_recommendation(season)
+        """
+        text = self.kb.get_color_recommendation(season).lower()
+        return frozenset(word for word in COLOR_WORDS if word in text)
+    
+    def item_score(self, item_id, weather, occasion, palette, preferences):
+        """Score of a single item, see the module docstring
+        
+        Args:
+            item_id (int): Item ID
+            weather (str): Weather value
+            occasion (str): Occasion value
+            palette (frozenset): Colours of the season
+            preferences (tuple): Normalised preferences, see _preference_key
+        
+        Returns:
+            float: Item score
+        """
+        if item_id in self._placeholders:
+            return 0.0
+        score = 0.0
+        style = self.style(item_id)
+        if style == occasion:
+            score += STYLE_MATCH
+        elif style != NEUTRAL:
+            score += STYLE_MISMATCH
+        
+        mask = self.kb.item_masks()[item_id]
+        if mask & self._waterproof:
+            if weather == "rainy":
+                score += WEATHER_MATCH
+        if mask & self._thermal:
+            if weather == "cold":
+                score += WEATHER_MATCH
+            elif weather == "hot":
+                score += WEATHER_MISMATCH
+        
+        colors, liked, disliked = preferences
+        color = self.color(item_id)
+        if color is not None:
+            if color in palette:
+                score += SEASON_COLOR
+            if color in colors:
+                score += PREFERRED_COLOR
+        if liked or disliked:
+            name = self.kb.item_names[item_id].lower()
+            if any(keyword in name for keyword in liked):
+                score += LIKED_KEYWORD
+            if any(keyword in name for keyword in disliked):
+                score += DISLIKED_KEYWORD
+        return score
+    
+    @staticmethod
+    def _preference_key(preferences):
+        """Normalise a preferences dict into a hashable cache key
+        
+        Args:
+            preferences (dict): Optional "colors", "liked" and "disliked"
+                                lists of words
+        
+        Returns:
+            tuple: (colors, liked, disliked) as frozenset and sorted tuples
+        """
+        if not preferences:
+            return (frozenset(), (), ())
+        
+        def words(field):
+            return tuple(sorted({word.lower() for word in preferences.get(field, ())}))
+        
+        return (frozenset(words("colors")), words("liked"), words("disliked"))
+    
+    def _scored_groups(self, weather, occasion, gender, special, season, preferences):
+        """Candidates of every category grouped by style, best first
+        
+        Returns:
+            tuple: One list of _Group per category of SINGLE_CATEGORIES plus
+                   the accessories
+        """
+        # The extra feminine options are always offered, the score decides
+        extended = gender == "feminine"
+        key = (occasion, weather, gender, special, extended, season, preferences)
+        groups = self._groups.get(key)
+        if groups is not None:
+            return groups
+        
+        palette = self.palette(season)
+        get_ids = self.kb.get_filtered_ids
+        groups = []
+        for category in SINGLE_CATEGORIES + ("accessories",):
+            by_style = {}
+            seen = set()
+            for item_id in get_ids(category, occasion, weather, gender, special, extended):
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                score = self.item_score(item_id, weather, occasion, palette, preferences)
+                by_style.setdefault(self.style(item_id), []).append((-score, len(seen), item_id))
+            category_groups = []
+            for style, scored in by_style.items():
+                # Ties keep the order of the cell
+                scored.sort()
+                category_groups.append(_Group(style, [(-score, item_id) for score, _, item_id in scored]))
+            groups.append(category_groups)
+        groups = tuple(groups)
+        self._groups.put(key, groups)
+        return groups
+    
+    def _best_accessories(self, accessory_groups, styles):
+        """Best accessories for the styles of an outfit
+        
+        Returns:
+            tuple: (score of the accessories, accessory ID tuple)
+        """
+        # Every group is sorted and its pair bonus is the same for all its
+        # items, so the best accessories are the heads of a merge
+        heads = []
+        for index, group in enumerate(accessory_groups):
+            bonus = sum(pair_score(group.style, style) for style in styles)
+            heads.append((-(group.scores[0] + bonus), index, 0, bonus))
+        heapq.heapify(heads)
+        picked = []
+        total = 0.0
+        while heads and len(picked) < self.accessories:
+            negative, index, position, bonus = heapq.heappop(heads)
+            group = accessory_groups[index]
+            picked.append(group.ids[position])
+            total -= negative
+            if position + 1 < len(group.ids):
+                heapq.heappush(heads, (-(group.scores[position + 1] + bonus), index, position + 1, bonus))
+        return total, tuple(picked)
+    
+    def iter_outfits(self, weather, occasion, gender, special, date=None, preferences=None, min_score=None):
+        """Generate outfits in descending score order
+        
+        Args:
+            weather (str): Weather value (hot, warm, cold, rainy)
+            occasion (str): Occasion value (formal, casual, sports)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            date (tuple): Optional (day, month, year), picks the season palette
+            preferences (dict): Optional "colors", "liked" and "disliked" word lists
+            min_score (float): Stop before the first outfit scoring lower
+        
+        Yields:
+            tuple: (score, (top, bottom, outerwear, shoes, accessories tuple)),
+                   item IDs with NO_ITEM for an empty category
+        """
+        month = int(date[1]) if date is not None else datetime.now().month
+        season = self.kb.get_season_from_month(month)
+        groups = self._scored_groups(weather, occasion, gender, special, season,
+                                     self._preference_key(preferences))
+        core = [category_groups for category_groups in groups[:-1] if category_groups]
+        present = [bool(category_groups) for category_groups in groups[:-1]]
+        accessory_groups = groups[-1]
+        
+        # Bound of the accessories and of the pairs not assigned yet
+        accessory_bound = 0.0
+        if accessory_groups:
+            best = heapq.nlargest(self.accessories, (
+                score for group in accessory_groups for score in group.scores[:self.accessories]
+            ))
+            accessory_bound = sum(best) + len(best) * len(core) * MAX_PAIR_SCORE
+        
+        def bound(depth, styles, base):
+            # Upper bound of every outfit whose first `depth` categories have these styles
+            total = base + accessory_bound
+            for category_groups in core[depth:]:
+                total += max(
+                    group.scores[0] + sum(pair_score(group.style, style) for style in styles)
+                    for group in category_groups
+                )
+            remaining = len(core) - depth
+            return total + remaining * (remaining - 1) // 2 * MAX_PAIR_SCORE
+        
+        # Entries: (-priority, tie, chosen groups, base, indices, last
+        # advanced position, accessories). indices is None while styles are
+        # being assigned, priority is then an upper bound and base the pair
+        # and head scores so far. Afterwards priority is the exact score
+        tie = count()
+        heap = [(-bound(0, (), 0.0), next(tie), (), 0.0, None, 0, ())]
+        while heap:
+            negative, _, chosen, base, indices, last, accessories = heapq.heappop(heap)
+            if min_score is not None and -negative < min_score:
+                return
+            
+            if indices is None:
+                depth = len(chosen)
+                styles = [group.style for group in chosen]
+                if depth < len(core):
+                    # Branch on the style of the next category
+                    for group in core[depth]:
+                        child = base + group.scores[0] + sum(pair_score(group.style, style) for style in styles)
+                        upper = bound(depth + 1, styles + [group.style], child)
+                        if min_score is None or upper >= min_score:
+                            heapq.heappush(heap, (-upper, next(tie), chosen + (group,), child, None, 0, ()))
+                    continue
+                # All styles assigned: the best combination of these groups
+                accessory_score, accessories = self._best_accessories(accessory_groups, styles)
+                heads = sum(group.scores[0] for group in chosen)
+                constant = base - heads + accessory_score
+                heapq.heappush(heap, (-(constant + heads), next(tie), chosen, constant,
+                                      (0,) * len(chosen), 0, accessories))
+                continue
+            
+            score = -negative
+            items = iter([group.ids[index] for group, index in zip(chosen, indices)])
+            outfit = tuple(next(items) if has_items else NO_ITEM for has_items in present)
+            yield score, outfit + (accessories,)
+            
+            # Next combinations: advance one position at or after the last
+            # advanced one, so every combination is pushed exactly once
+            for position in range(last, len(chosen)):
+                group = chosen[position]
+                index = indices[position]
+                if index + 1 < len(group.ids):
+                    child = score - group.scores[index] + group.scores[index + 1]
+                    if min_score is None or child >= min_score:
+                        advanced = indices[:position] + (index + 1,) + indices[position + 1:]
+                        heapq.heappush(heap, (-child, next(tie), chosen, base, advanced, position, accessories))
+    
+    def top_k(self, weather, occasion, gender, special, date=None, k=5, preferences=None, min_score=None):
+        """The k best outfits, see iter_outfits
+        
+        Returns:
+            list: Up to k (score, outfit) tuples, best first
+        """
+        return list(islice(self.iter_outfits(weather, occasion, gender, special, date, preferences, min_score), k))
+    
+    def recommendation(self, outfit, weather, occasion, date=None, score=None):
+        """An outfit as a recommendation dict, like the engine's
+        
+        Args:
+            outfit (tuple): Outfit from iter_outfits
+            weather (str): Weather value
+            occasion (str): Occasion value
+            date (tuple): Optional (day, month, year)
+            score (float): Optional score, added as "score"
+        
+        Returns:
+            dict: Recommendation with the outfit's item names
+        """
+        kb = self.kb
+        names = kb.item_names
+        top, bottom, outerwear, shoes, accessories = outfit
+        month = int(date[1]) if date is not None else datetime.now().month
+        now = datetime.now()
+        outerwear_name = names[outerwear] if outerwear != NO_ITEM else None
+        result = {
+            "date": now.strftime("%d %B %Y"),
+            "time": now.strftime("%H:%M"),
+            "top": names[top] if top != NO_ITEM else "Outfit tidak tersedia",
+            "bottom": names[bottom] if bottom != NO_ITEM else "Outfit tidak tersedia",
+            "outerwear": outerwear_name if outerwear_name and PLACEHOLDER_MARK not in outerwear_name else None,
+            "shoes": names[shoes] if shoes != NO_ITEM else "Outfit tidak tersedia",
+            "accessories": [names[item_id] for item_id in accessories] or ["Aksesoris minimal"],
+            "color_recommendation": kb.get_color_recommendation(kb.get_season_from_month(month)),
+            "weather_tip": kb.get_weather_tip(weather),
+            "occasion_tip": kb.get_occasion_tip(occasion)
+        }
+        if score is not None:
+            result["score"] = round(score, 2)
+        return result
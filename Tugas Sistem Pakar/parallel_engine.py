@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# parallel_engine.py - Multi-process batch generation for Outfit Recommendation System
+
+"""
+Spreads a batch of recommendation requests over a ProcessPoolExecutor.
+
+The batch is cut into fixed-size chunks and every chunk gets a seed derived
+from the base seed and the chunk's position. The output therefore depends
+only on the input and the seed, not on how many workers run the chunks.
+"""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from knowledge_base import KnowledgeBase
+from recommendation_engine import OutfitRecommendationEngine, RecommendationBatch
+
+# Rows per task. Large enough to amortise the per-group setup of the batch
+# API; part of the seed derivation, so changing it changes the output
+CHUNK_SIZE = 65536
+
+# Engine owned by each worker process, built once by _init_worker
+_worker_engine = None
+
+def _init_worker(use_prolog, catalogue_file=None):
+    """Process pool initializer: build the knowledge base once per worker"""
+    global _worker_engine
+    kb = KnowledgeBase(use_prolog, catalogue_file=catalogue_file)
+    _worker_engine = OutfitRecommendationEngine(kb, rng=random.Random())
+
+def _run_chunk(task):
+    """Generate the recommendations for one chunk inside a worker"""
+    chunk_seed, columns = task
+    return _worker_engine.generate_recommendations(columns, seed=chunk_seed)
+
+def chunk_seed(seed, chunk_index):
+    """Derive the seed of one chunk from the base seed
+    
+    Args:
+        seed (int): Base seed of the batch
+        chunk_index (int): Position of the chunk in the batch
+    
+    Returns:
+        int: 64-bit seed for the chunk
+    """
+    digest = hashlib.sha256(f"{seed}:{chunk_index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+class ParallelRecommendationEngine:
+    """Batch recommendation engine that uses every CPU core"""
+    
+    def __init__(self, workers=None, seed=0, chunk_size=CHUNK_SIZE, use_prolog=False,
+                 catalogue_file=None):
+        """Initialize the process pool
+        
+        Args:
+            workers (int): Number of worker processes, defaults to the CPU count
+            seed (int): Base seed, the same seed and input give the same output
+            chunk_size (int): Rows per task sent to a worker
+            use_prolog (bool): Build the worker knowledge bases from outfit_kb.pl
+            catalogue_file (str): Catalogue file every worker maps, so the
+                                  workers share its pages
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(use_prolog, catalogue_file)
+        )
+    
+    def generate_recommendations(self, requests):
+        """Generate recommendations for a batch, in input order
+        
+        Args:
+            requests: Iterable of (weather, occasion, gender, special[, date])
+                rows, or a dict of columns (see
+                OutfitRecommendationEngine.generate_recommendations)
+        
+        Returns:
+            RecommendationBatch: Columnar results for all rows
+        """
+        weathers, occasions, genders, specials, months = OutfitRecommendationEngine._batch_columns(requests)
+        
+        tasks = []
+        for index, start in enumerate(range(0, len(weathers), self.chunk_size)):
+            end = start + self.chunk_size
+            tasks.append((chunk_seed(self.seed, index), {
+                "weather": weathers[start:end],
+                "occasion": occasions[start:end],
+                "gender": genders[start:end],
+                "special": specials[start:end],
+                "month": months[start:end]
+            }))
+        
+        # map() yields results in submission order, which keeps input order
+        return RecommendationBatch.concat(list(self._pool.map(_run_chunk, tasks)))
+    
+    def close(self):
+        """Shut down the worker processes"""
+        self._pool.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
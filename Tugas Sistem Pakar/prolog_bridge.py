@@ -1,164 +1,378 @@
-#!/usr/bin/env python3
-# prolog_bridge.py - Bridge module for Python to Prolog interaction
-
-"""
-This module provides a bridge between Python and Prolog for the Outfit Recommendation System.
-It uses the pyswip library if available, otherwise it provides fallback mechanisms.
-"""
-
-import os
-import sys
-import subprocess
-import tempfile
-
-class PrologBridge:
-    """Bridge class for Python to Prolog interaction"""
-    
-    def __init__(self, prolog_file="outfit_kb.pl"):
-        """Initialize the Prolog bridge
-        
-        Args:
-            prolog_file (str): Path to the Prolog knowledge base file
-        """
-        self.prolog_file = prolog_file
-        self.pyswip_available = False
-        
-        # Check if pyswip is available
-        try:
-            from pyswip import Prolog
-            self.prolog = Prolog()
-            self.pyswip_available = True
-            self._consult_prolog_file()
-            print("Successfully initialized pyswip Prolog bridge")
-        except ImportError:
-            print("pyswip not available, will use alternative methods")
-            # Check if SWI-Prolog is installed
-            self._check_swipl_installed()
-    
-    def _consult_prolog_file(self):
-        """Consult the Prolog knowledge base file"""
-        if not self.pyswip_available:
-            return
-        
-        try:
-            if os.path.exists(self.prolog_file):
-                self.prolog.consult(self.prolog_file)
-                print(f"Successfully consulted {self.prolog_file}")
-            else:
-                print(f"Warning: Prolog file {self.prolog_file} not found")
-        except Exception as e:
-            print(f"Error consulting Prolog file: {e}")
-    
-    def _check_swipl_installed(self):
-        """Check if SWI-Prolog is installed on the system"""
-        try:
-            result = subprocess.run(
-                ["swipl", "--version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.returncode == 0:
-                print("SWI-Prolog found on system")
-                self.swipl_available = True
-            else:
-                print("SWI-Prolog not found on system")
-                self.swipl_available = False
-        except Exception:
-            print("Could not check for SWI-Prolog, assuming not available")
-            self.swipl_available = False
-    
-    def query(self, query_string):
-        """Execute a Prolog query
-        
-        Args:
-            query_string (str): The Prolog query string
-            
-        Returns:
-            list: List of results (dictionaries of variable bindings)
-        """
-        if self.pyswip_available:
-            return self._query_pyswip(query_string)
-        elif hasattr(self, 'swipl_available') and self.swipl_available:
-            return self._query_subprocess(query_string)
-        else:
-            print("No Prolog interface available, cannot execute query")
-            return []
-    
-    def _query_pyswip(self, query_string):
-        """Execute a query using pyswip
-        
-        Args:
-            query_string (str): The Prolog query string
-            
-        Returns:
-            list: List of results (dictionaries of variable bindings)
-        """
-        try:
-            results = list(self.prolog.query(query_string))
-            return results
-        except Exception as e:
-            print(f"Error executing pyswip query: {e}")
-            return []
-    
-    def _query_subprocess(self, query_string):
-        """Execute a query using subprocess to call swipl
-        
-        Args:
-            query_string (str): The Prolog query string
-            
-        Returns:
-            list: List of results (dictionaries of variable bindings)
-        """
-        try:
-            # Create a temporary Prolog script file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.pl', delete=False) as temp_file:
-                temp_file_name = temp_file.name
-                # Write the query to the temporary file
-                temp_file.write(f":- consult('{self.prolog_file}').\n")
-                temp_file.write(f":- {query_string}, write(user_output, true), halt.\n")
-                temp_file.write(":- write(user_output, false), halt.\n")
-            
-            # Execute the temporary Prolog script
-            result = subprocess.run(
-                ["swipl", "-q", "-f", temp_file_name],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Clean up the temporary file
-            os.unlink(temp_file_name)
-            
-            # Process the result
-            if "true" in result.stdout:
-                # Very simplified result, just indicating success
-                return [{'success': True}]
-            else:
-                return []
-        except Exception as e:
-            print(f"Error executing subprocess query: {e}")
-            return []
-
-    def recommend_outfit(self, occasion, weather, gender, modesty, month):
-        """Get a complete outfit recommendation
-        
-        Args:
-            occasion (str): Occasion type (formal, casual, sports)
-            weather (str): Weather condition (hot, warm, cold, rainy)
-            gender (str): Gender preference (masculine, feminine, neutral)
-            modesty (str): Modesty preference (modest, none)
-            month (int): Month number for seasonal considerations
-            
-        Returns:
-            dict: Dictionary containing recommendation details
-        """
-        query = f"recommend_outfit({occasion}, {weather}, {gender}, {modesty}, {month}, Recommendation)"
-        results = self.query(query)
-        
-        if results:
-            # Extract recommendation text from the first result
-            recommendation_text = results[0].get('Recommendation', '')
-            return {"success": True, "recommendation": recommendation_text}
-        else:
+#!/usr/bin/env python3
+# prolog_bridge.py - Bridge module for Python to Prolog interaction
+
+"""
+This module provides a bridge between Python and Prolog for the Outfit Recommendation System.
+It uses the pyswip library if available, otherwise it provides fallback mechanisms.
+"""
+
+import os
+import re
+import sys
+import threading
+from time import perf_counter
+
+from metrics import NULL_METRICS
+from query_cache import QueryCache
+
+# Queries calling these predicates change the database
+MUTATING_PREDICATES = frozenset(("consult", "assert", "asserta", "assertz", "retract", "retractall", "abolish"))
+
+# A call of one of MUTATING_PREDICATES anywhere in a goal, after quoted text is removed
+MUTATING_CALL = re.compile(r"\b(?:%s)\s*\(" % "|".join(sorted(MUTATING_PREDICATES)))
+
+# Quoted atoms and strings
+QUOTED = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+
+def normalize_query(query_string):
+    """Normalise a query string so equivalent spellings share a cache key
+    
+    Whitespace outside quotes is dropped around punctuation and collapsed
+    elsewhere, and the trailing full stop is removed.
+    
+    Args:
+        query_string (str): The Prolog query string
+        
+    Returns:
+        str: The normalised query
+    """
+    text = query_string.strip()
+    if text.endswith("."):
+        text = text[:-1].rstrip()
+    
+    out = []
+    quote = None
+    pending_space = False
+    for char in text:
+        if quote:
+            out.append(char)
+            if char == quote:
+                quote = None
+            continue
+        if char.isspace():
+            pending_space = True
+            continue
+        if pending_space and out and out[-1] not in "(,[|" and char not in "),]|":
+            out.append(" ")
+        pending_space = False
+        if char in "'\"":
+            quote = char
+        out.append(char)
+    return "".join(out)
+
+def is_update(query_string):
+    """Tell whether a goal calls a predicate that changes the database
+    
+    Every call in the goal counts, not only the first one, so conjunctions
+    and goals wrapped in once/1, \\+/1 or parentheses are found too.
+    Predicate names inside quoted atoms and strings are ignored.
+    
+    Args:
+        query_string (str): The Prolog goal, normalised or not
+        
+    Returns:
+        bool: True if the goal calls one of MUTATING_PREDICATES
+    """
+    return MUTATING_CALL.search(QUOTED.sub("''", query_string)) is not None
+
+class PrologBridge:
+    """Bridge class for Python to Prolog interaction"""
+    
+    def __init__(self, prolog_file="outfit_kb.pl", pool_size=2, query_timeout=5.0,
+                 cache_size=256, cache_ttl=None, metrics=None, executable="swipl"):
+        """Initialize the Prolog bridge
+        
+        Args:
+            prolog_file (str): Path to the Prolog knowledge base file
+            pool_size (int): Number of swipl worker processes used without pyswip
+            query_timeout (float): Seconds to wait for a swipl worker to answer
+            cache_size (int): Number of query results to cache, 0 disables the cache
+            cache_ttl (float): Seconds a cached result stays valid, None for no expiry
+            metrics (Metrics): Optional instrumentation for query time and errors
+            executable (str): SWI-Prolog executable used without pyswip
+        """
+        self.prolog_file = prolog_file
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.pool_size = pool_size
+        self.query_timeout = query_timeout
+        self.executable = executable
+        self.prolog = None
+        self.pyswip_available = False
+        self.swipl_available = False
+        self._pool = None
+        # service.py queries from executor threads, only one may start the pool
+        self._pool_lock = threading.Lock()
+        self.cache = QueryCache(cache_size, cache_ttl) if cache_size > 0 else None
+        
+        # pyswip starts an embedded Prolog engine and the fallback check runs
+        # swipl, so the backend is only chosen when the first query arrives
+        self._backend_ready = False
+        self._backend_lock = threading.Lock()
+    
+    def _ensure_backend(self):
+        """Initialise the Prolog interface on first use"""
+        if self._backend_ready:
+            return
+        with self._backend_lock:
+            if not self._backend_ready:
+                self._init_backend()
+                self._backend_ready = True
+    
+    def _init_backend(self):
+        """Use pyswip when it is installed, otherwise look for swipl"""
+        # Check if pyswip is available
+        try:
+            from pyswip import Prolog
+            self.prolog = Prolog()
+            self.pyswip_available = True
+            self._consult_prolog_file()
+            print("Successfully initialized pyswip Prolog bridge")
+        except ImportError:
+            print("pyswip not available, will use alternative methods")
+            self.metrics.increment("prolog_fallbacks")
+            # Check if SWI-Prolog is installed
+            self._check_swipl_installed()
+    
+    def _consult_prolog_file(self):
+        """Consult the Prolog knowledge base file"""
+        if not self.pyswip_available:
+            return
+        
+        try:
+            if os.path.exists(self.prolog_file):
+                self.prolog.consult(self.prolog_file)
+                print(f"Successfully consulted {self.prolog_file}")
+            else:
+                print(f"Warning: Prolog file {self.prolog_file} not found")
+        except Exception as e:
+            print(f"Error consulting Prolog file: {e}")
+    
+    def _check_swipl_installed(self):
+        """Check if SWI-Prolog is installed on the system"""
+        import subprocess
+        try:
+            result = subprocess.run(
+                [self.executable, "--version"], 
+                stdout=subprocess.PIPE, 
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if result.returncode == 0:
+                print("SWI-Prolog found on system")
+                self.swipl_available = True
+            else:
+                print("SWI-Prolog not found on system")
+                self.swipl_available = False
+        except Exception:
+            print("Could not check for SWI-Prolog, assuming not available")
+            self.swipl_available = False
+    
+    def query(self, query_string):
+        """Execute a Prolog query
+        
+        Results are cached by the normalised query. Queries that change the
+        database bypass the cache and invalidate it.
+        
+        Args:
+            query_string (str): The Prolog query string
+            
+        Returns:
+            list: List of results (dictionaries of variable bindings)
+        """
+        key = normalize_query(query_string)
+        if is_update(key):
+            return self._run_update(key)
+        
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return [dict(result) for result in cached]
+            generation = self.cache.generation
+        
+        timed = self.metrics.enabled
+        if timed:
+            start = perf_counter()
+        results = self._execute(query_string)
+        if timed:
+            self.metrics.observe("prolog_query", perf_counter() - start)
+        if results is None:
+            return []
+        
+        if self.cache is not None:
+            self.cache.put(key, results, generation)
+            return [dict(result) for result in results]
+        return results
+    
+    def _execute(self, query_string):
+        """Send a query to whichever Prolog interface is available
+        
+        Args:
+            query_string (str): The Prolog query string
+            
+        Returns:
+            list: List of results, or None if the query failed
+        """
+        self._ensure_backend()
+        if self.pyswip_available:
+            return self._query_pyswip(query_string)
+        elif hasattr(self, 'swipl_available') and self.swipl_available:
+            return self._query_subprocess(query_string)
+        else:
+            print("No Prolog interface available, cannot execute query")
+            self.metrics.increment("prolog_errors")
+            return None
+    
+    def _run_update(self, goal):
+        """Run a goal that changes the database and invalidate the cache
+        
+        The cache is cleared once the goal has run. Clearing also bumps its
+        generation, so a query that read the old database concurrently can't
+        store its result afterwards.
+        
+        Args:
+            goal (str): The normalised Prolog goal
+            
+        Returns:
+            list: List of results (dictionaries of variable bindings)
+        """
+        try:
+            return self._update_backend(goal)
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+    
+    def _update_backend(self, goal):
+        """Send a database update to whichever Prolog interface is available
+        
+        Args:
+            goal (str): The normalised Prolog goal
+            
+        Returns:
+            list: List of results (dictionaries of variable bindings)
+        """
+        self._ensure_backend()
+        if self.pyswip_available:
+            return self._query_pyswip(goal) or []
+        elif hasattr(self, 'swipl_available') and self.swipl_available:
+            try:
+                return self._get_pool().broadcast(goal)
+            except Exception as e:
+                print(f"Error executing subprocess query: {e}")
+                self.metrics.increment("prolog_errors")
+                return []
+        else:
+            print("No Prolog interface available, cannot execute query")
+            self.metrics.increment("prolog_errors")
+            return []
+    
+    def consult(self, prolog_file):
+        """Consult an additional Prolog file
+        
+        Args:
+            prolog_file (str): Path to the Prolog file
+        """
+        path = os.path.abspath(prolog_file).replace("\\", "/").replace("'", "\\'")
+        self._run_update(f"consult('{path}')")
+    
+    def assertz(self, fact):
+        """Add a fact or clause at the end of the database
+        
+        Args:
+            fact (str): The clause to assert, e.g. "weather_tip(foggy, 'Tip')"
+        """
+        self._run_update(f"assertz(({fact}))")
+    
+    def retractall(self, head):
+        """Remove all facts matching a head
+        
+        Args:
+            head (str): The clause head to retract, e.g. "gejala_pos(_)"
+        """
+        self._run_update(f"retractall({head})")
+    
+    def cache_stats(self):
+        """Return the query cache counters
+        
+        Returns:
+            dict: hits, misses, evictions and current size (empty if disabled)
+        """
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def _query_pyswip(self, query_string):
+        """Execute a query using pyswip
+        
+        Args:
+            query_string (str): The Prolog query string
+            
+        Returns:
+            list: List of results (dictionaries of variable bindings), or None on error
+        """
+        try:
+            results = list(self.prolog.query(query_string))
+            return results
+        except Exception as e:
+            print(f"Error executing pyswip query: {e}")
+            self.metrics.increment("prolog_errors")
+            return None
+    
+    def _query_subprocess(self, query_string):
+        """Execute a query on the pool of persistent swipl workers
+        
+        Args:
+            query_string (str): The Prolog query string
+            
+        Returns:
+            list: List of results (dictionaries of variable bindings), or None on error
+        """
+        try:
+            return self._get_pool().query(query_string)
+        except Exception as e:
+            print(f"Error executing subprocess query: {e}")
+            self.metrics.increment("prolog_errors")
+            return None
+    
+    def _get_pool(self):
+        """Return the swipl worker pool, creating it on first use"""
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                pool = self._pool
+                if pool is None:
+                    from prolog_pool import PrologWorkerPool
+                    pool = self._pool = PrologWorkerPool(
+                        self.prolog_file,
+                        size=self.pool_size,
+                        timeout=self.query_timeout,
+                        executable=self.executable
+                    )
+        return pool
+    
+    def close(self):
+        """Stop the swipl worker processes, if any were started"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def recommend_outfit(self, occasion, weather, gender, modesty, month):
+        """Get a complete outfit recommendation
+        
+        Args:
+            occasion (str): Occasion type (formal, casual, sports)
+            weather (str): Weather condition (hot, warm, cold, rainy)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            modesty (str): Modesty preference (modest, none)
+            month (int): Month number for seasonal considerations
+            
+        Returns:
+            dict: Dictionary containing recommendation details
+        """
+        query = f"recommend_outfit({occasion}, {weather}, {gender}, {modesty}, {month}, Recommendation)"
+        results = self.query(query)
+        
+        if results:
+            # Extract recommendation text from the first result
+            recommendation_text = results[0].get('Recommendation', '')
+            return {"success": True, "recommendation": recommendation_text}
+        else:
             return {"success": False, "error": "No recommendation found"}
\ No newline at end of file
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# prolog_pool.py - Pool of long-lived SWI-Prolog worker processes
+
+"""
+This module keeps a small number of swipl processes running, each of which
+consults the knowledge base once and then answers queries over stdin/stdout
+using the line protocol implemented in prolog_worker.pl.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import threading
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prolog_worker.pl")
+
+class PrologWorkerError(Exception):
+    """Raised when a worker process dies or stops answering"""
+
+class PrologQueryError(Exception):
+    """Raised when Prolog reports an error for a query"""
+
+class PrologWorker:
+    """A single swipl process speaking the line protocol"""
+    
+    def __init__(self, command, consult_files=(), timeout=5.0):
+        """Start the worker and consult the knowledge base files
+        
+        Args:
+            command (list): Command line used to start the worker process
+            consult_files (iterable): Prolog files to consult once at startup
+            timeout (float): Seconds to wait for each startup consult
+        """
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        self._lines = queue.Queue()
+        # Number of pool-wide setup goals this worker has already run
+        self.applied_goals = 0
+        reader = threading.Thread(target=self._read_lines, daemon=True)
+        reader.start()
+        
+        try:
+            for path in consult_files:
+                escaped = os.path.abspath(path).replace("\\", "/").replace("'", "\\'")
+                self.request(f"consult('{escaped}')", timeout)
+        except Exception:
+            self.stop()
+            raise
+    
+    def _read_lines(self):
+        """Forward stdout lines to the queue, ending with None on EOF"""
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+    
+    def is_alive(self):
+        """Check whether the worker process is still running"""
+        return self.process.poll() is None
+    
+    def request(self, query_string, timeout=None):
+        """Send one query and wait for its reply
+        
+        Args:
+            query_string (str): The Prolog query string
+            timeout (float): Seconds to wait for the reply, None waits forever
+        
+        Returns:
+            list: List of results (dictionaries of variable bindings)
+        """
+        goal = query_string.strip()
+        if goal.endswith("."):
+            goal = goal[:-1]
+        
+        try:
+            self.process.stdin.write(goal + " .\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise PrologWorkerError(f"Worker is not accepting queries: {e}")
+        
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise PrologWorkerError(f"Query timed out after {timeout} seconds: {goal}")
+        if line is None:
+            raise PrologWorkerError("Worker exited while answering the query")
+        
+        reply = json.loads(line)
+        if reply.get("status") != "ok":
+            raise PrologQueryError(reply.get("message", "Unknown Prolog error"))
+        return reply["results"]
+    
+    def kill(self):
+        """Terminate the worker process immediately"""
+        if self.is_alive():
+            self.process.kill()
+            self.process.wait()
+    
+    def stop(self):
+        """Stop the worker process"""
+        if self.is_alive():
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=1)
+            except Exception:
+                self.process.kill()
+                self.process.wait()
+
+class PrologWorkerPool:
+    """Fixed-size pool of PrologWorker processes
+    
+    Workers are started on demand up to ``size``. A worker that crashes or
+    times out is discarded and a fresh one takes its place on the next query.
+    Goals that change the database (see broadcast) are replayed on every
+    worker, including replacements, before it answers its next query.
+    """
+    
+    def __init__(self, prolog_file, size=2, timeout=5.0, executable="swipl"):
+        """Initialize the pool
+        
+        Args:
+            prolog_file (str): Path to the Prolog knowledge base file
+            size (int): Maximum number of worker processes
+            timeout (float): Seconds to wait for a query reply
+            executable (str): SWI-Prolog executable to run
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        
+        self.prolog_file = prolog_file
+        self.size = size
+        self.timeout = timeout
+        self.command = [executable, "-q", "-g", "serve", "-t", "halt", WORKER_SCRIPT]
+        self.restarts = 0
+        
+        self._setup_goals = []
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def query(self, query_string, timeout=None):
+        """Run a query on the next free worker
+        
+        Args:
+            query_string (str): The Prolog query string
+            timeout (float): Seconds to wait for the reply, defaults to the pool timeout
+        
+        Returns:
+            list: List of results (dictionaries of variable bindings)
+        """
+        if timeout is None:
+            timeout = self.timeout
+        
+        worker = self._acquire(timeout)
+        try:
+            self._catch_up(worker, timeout)
+            return worker.request(query_string, timeout)
+        except PrologWorkerError:
+            # The worker is in an unknown state, replace it
+            worker.kill()
+            raise
+        finally:
+            self._release(worker)
+    
+    def broadcast(self, goal, timeout=None):
+        """Run a database-changing goal (consult, assertz, ...) on every worker
+        
+        The goal runs right away on every idle worker, starting one if none
+        is idle. It is also recorded, and busy workers and workers started
+        later run it before their next query, so every worker ends up with
+        the same database. A goal that reports an error is not recorded.
+        
+        Args:
+            goal (str): The Prolog goal to run
+            timeout (float): Seconds to wait for each reply, defaults to the pool timeout
+        
+        Returns:
+            list: Results of the goal (dictionaries of variable bindings)
+        
+        Raises:
+            PrologQueryError: If Prolog reports an error for the goal
+            PrologWorkerError: If a worker dies or stops answering
+        """
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            index = len(self._setup_goals)
+            self._setup_goals.append(goal)
+        
+        workers = []
+        while True:
+            try:
+                workers.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        
+        results = None
+        error = None
+        try:
+            if not workers:
+                workers.append(self._acquire(timeout))
+            for worker in workers:
+                try:
+                    self._catch_up(worker, timeout, index)
+                    if worker.applied_goals == index:
+                        worker.applied_goals += 1
+                        answer = worker.request(goal, timeout)
+                        if results is None:
+                            results = answer
+                except PrologQueryError as e:
+                    if error is None:
+                        error = e
+                except PrologWorkerError as e:
+                    worker.kill()
+                    if error is None:
+                        error = e
+        finally:
+            for worker in workers:
+                self._release(worker)
+        
+        if isinstance(error, PrologQueryError):
+            # Don't replay a goal that fails on workers started later
+            with self._lock:
+                self._setup_goals[index] = None
+        if error is not None:
+            raise error
+        return results if results is not None else []
+    
+    def _catch_up(self, worker, timeout, until=None):
+        """Run the setup goals this worker hasn't seen yet
+        
+        Args:
+            worker (PrologWorker): Worker to bring up to date
+            timeout (float): Seconds to wait for each reply
+            until (int): Stop before this setup goal, None runs all of them
+        """
+        end = len(self._setup_goals) if until is None else until
+        while worker.applied_goals < end:
+            goal = self._setup_goals[worker.applied_goals]
+            worker.applied_goals += 1
+            if goal is None:
+                continue
+            try:
+                worker.request(goal, timeout)
+            except PrologQueryError as e:
+                print(f"Warning: setup goal {goal} failed: {e}")
+    
+    def _acquire(self, timeout):
+        """Take an idle worker, starting a new one if the pool isn't full"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if self._closed:
+                raise PrologWorkerError("Worker pool is closed")
+            start_new = self._started < self.size
+            if start_new:
+                self._started += 1
+        
+        if start_new:
+            try:
+                return PrologWorker(self.command, [self.prolog_file], self.timeout)
+            except Exception:
+                with self._lock:
+                    self._started -= 1
+                raise
+        
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PrologWorkerError(f"No Prolog worker became free within {timeout} seconds")
+    
+    def _release(self, worker):
+        """Return a worker to the pool, dropping it if it has died"""
+        if worker.is_alive() and not self._closed:
+            self._idle.put(worker)
+            return
+        
+        worker.stop()
+        with self._lock:
+            self._started -= 1
+            if not self._closed:
+                self.restarts += 1
+    
+    def close(self):
+        """Stop all idle workers and refuse further queries"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+            with self._lock:
+                self._started -= 1
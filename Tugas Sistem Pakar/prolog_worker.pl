@@ -0,0 +1,67 @@
+% prolog_worker.pl - Long-lived query server used by prolog_pool.py
+
+% Protocol: every request is one Prolog goal terminated by a full stop.
+% Every reply is one line of JSON, either
+%   {"status":"ok","results":[{"Var":Value,...},...]}
+% or
+%   {"status":"error","message":"..."}
+
+:- use_module(library(http/json)).
+
+% Main loop, started with: swipl -q -g serve -t halt prolog_worker.pl
+serve :-
+    set_stream(user_input, encoding(utf8)),
+    set_stream(user_output, encoding(utf8)),
+    repeat,
+    catch(read_term(user_input, Query, [variable_names(Bindings)]),
+          Error,
+          (reply_error(Error), fail)),
+    (   Query == end_of_file
+    ->  !
+    ;   handle(Query, Bindings),
+        fail
+    ).
+
+% Run the goal, collecting every solution as a dict of its bindings.
+% Output written by the goal itself is swallowed so it cannot break
+% the line protocol.
+handle(Query, Bindings) :-
+    catch(
+        (   with_output_to(string(_),
+                findall(Solution,
+                        (call(Query), bindings_dict(Bindings, Solution)),
+                        Solutions)),
+            reply(_{status: ok, results: Solutions})
+        ),
+        Error,
+        reply_error(Error)).
+
+reply_error(Error) :-
+    term_string(Error, Message),
+    reply(_{status: error, message: Message}).
+
+reply(Dict) :-
+    json_write_dict(user_output, Dict, [width(0)]),
+    nl(user_output),
+    flush_output(user_output).
+
+% Variables starting with an underscore are not reported, like pyswip
+bindings_dict(Bindings, Dict) :-
+    findall(Name-Json,
+            (   member(Name = Value, Bindings),
+                \+ sub_atom(Name, 0, _, _, '_'),
+                to_json(Value, Json)
+            ),
+            Pairs),
+    dict_create(Dict, _, Pairs).
+
+to_json(Value, Value) :-
+    ( number(Value) ; string(Value) ), !.
+to_json(Value, Json) :-
+    is_list(Value), !,
+    maplist(to_json, Value, Json).
+to_json(Value, String) :-
+    atom(Value), !,
+    atom_string(Value, String).
+to_json(Value, String) :-
+    term_string(Value, String).
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# query_cache.py - Bounded result cache shared by the bridge and the engine
+
+import threading
+import time
+from collections import OrderedDict
+
+class QueryCache:
+    """Thread-safe LRU cache with an optional TTL and hit/miss/eviction counters"""
+    
+    def __init__(self, max_size=256, ttl=None):
+        """Initialize the cache
+        
+        Args:
+            max_size (int): Maximum number of cached entries
+            ttl (float): Seconds a result stays valid, None keeps it until evicted
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bumped by clear(), so results computed before it are not stored
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                results, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return results
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+    
+    def put(self, key, results, generation=None):
+        """Store the value for a key
+        
+        Args:
+            key: Cache key
+            results: Value to store
+            generation (int): Value of self.generation read before the result
+                was computed; the result is dropped if the cache was cleared since
+        
+        Returns:
+            bool: True if the value was stored
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._entries[key] = (results, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+    
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+    
+    def discard(self, predicate=None):
+        """Drop the entries whose key matches a predicate
+        
+        Args:
+            predicate: Function of the key, None matches every entry
+        
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            if predicate is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+    
+    def stats(self):
+        """Return the cache counters
+        
+        Returns:
+            dict: hits, misses, evictions and current size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries)
+            }
@@ -1,164 +1,684 @@
-#!/usr/bin/env python3
-# recommendation_engine.py - Recommendation engine for Outfit Recommendation System
-
-import random
-from datetime import datetime
-
-class OutfitRecommendationEngine:
-    """The main recommendation engine for outfit suggestions"""
-    
-    def __init__(self, knowledge_base):
-        """Initialize the recommendation engine
-        
-        Args:
-            knowledge_base: The knowledge base object to use for recommendations
-        """
-        self.kb = knowledge_base
-    
-    def generate_recommendation(self, weather, occasion, gender, special, date=None):
-        """Generate an outfit recommendation based on input parameters
-        
-        Args:
-            weather (str): Weather value (hot, warm, cold, rainy)
-            occasion (str): Occasion value (formal, casual, sports)
-            gender (str): Gender preference (masculine, feminine, neutral)
-            special (str): Special considerations (modest, none)
-            date (tuple): Optional tuple of (day, month, year) for seasonal considerations
-            
-        Returns:
-            dict: A dictionary containing the recommendation details
-        """
-        try:
-            # Get the current date if none provided
-            if date is None:
-                now = datetime.now()
-                month = now.month
-                day = now.day
-                year = now.year
-            else:
-                day, month, year = date
-                # Ensure month is an integer
-                month = int(month)
-            
-            # Get season based on date
-            season = self.kb.get_season_from_month(month)
-            
-            # Get items from knowledge base
-            tops = self.kb.get_item_options("tops", occasion, weather)
-            bottoms = self.kb.get_item_options("bottoms", occasion, weather)
-            outerwear = self.kb.get_item_options("outerwear", occasion, weather)
-            shoes = self.kb.get_item_options("shoes", occasion, weather)
-            accessories = self.kb.get_item_options("accessories", occasion, weather)
-            
-            # Apply gender filtering
-            if gender == "masculine":
-                # Filter out feminine items
-                feminine_items = ["Blus", "Rok", "Dress", "Crop top"]
-                tops = [item for item in tops if not any(f_item in item for f_item in feminine_items)]
-                bottoms = [item for item in bottoms if not any(f_item in item for f_item in feminine_items)]
-            
-            if gender == "feminine":
-                # Add some feminine options if available for the occasion
-                if occasion == "formal" and random.random() > 0.5:
-                    tops.extend(["Blus formal", "Kemeja feminine"])
-                    bottoms.extend(["Rok pensil", "Dress formal"])
-                elif occasion == "casual" and random.random() > 0.5:
-                    tops.extend(["Blus casual", "Crop top stylish"])
-                    bottoms.extend(["Rok casual", "Dress santai"])
-                elif occasion == "sports":
-                    tops.extend(["Sport bra", "Tank top feminine"])
-            
-            # Apply modesty filtering
-            if special == "modest":
-                # Remove items that aren't modest
-                immodest_items = ["Crop top", "Tank top", "Singlet", "Rok mini", "Celana pendek"]
-                tops = [item for item in tops if not any(im_item in item for im_item in immodest_items)]
-                bottoms = [item for item in bottoms if not any(im_item in item for im_item in immodest_items)]
-                
-                # Add modest alternatives if needed
-                if not tops:
-                    tops = ["Kemeja lengan panjang", "Blus tertutup", "Kaos lengan panjang"]
-                if not bottoms:
-                    bottoms = ["Celana panjang", "Rok panjang", "Celana kulot"]
-            
-            # Get color recommendation based on season
-            color_recommendation = self.kb.get_color_recommendation(season)
-            
-            # Get weather tip
-            weather_tip = self.kb.get_weather_tip(weather)
-            
-            # Get occasion tip
-            occasion_tip = self.kb.get_occasion_tip(occasion)
-            
-            # Select random items from each category
-            selected_top = random.choice(tops) if tops else "Outfit tidak tersedia"
-            selected_bottom = random.choice(bottoms) if bottoms else "Outfit tidak tersedia"
-            selected_outerwear = random.choice(outerwear) if outerwear else "Tidak diperlukan"
-            selected_shoes = random.choice(shoes) if shoes else "Outfit tidak tersedia"
-            
-            # Select 2-3 random accessories
-            selected_accessories = random.sample(accessories, min(len(accessories), random.randint(2, 3))) if accessories else ["Aksesoris minimal"]
-            
-            # Current datetime for the recommendation
-            now = datetime.now()
-            date_str = now.strftime("%d %B %Y")
-            time_str = now.strftime("%H:%M")
-            
-            # Build the recommendation result
-            result = {
-                "date": date_str,
-                "time": time_str,
-                "top": selected_top,
-                "bottom": selected_bottom,
-                "outerwear": selected_outerwear if "Tidak diperlukan" not in selected_outerwear else None,
-                "shoes": selected_shoes,
-                "accessories": selected_accessories,
-                "color_recommendation": color_recommendation,
-                "weather_tip": weather_tip,
-                "occasion_tip": occasion_tip
-            }
-            
-            return result
-            
-        except Exception as e:
-            # Return error information if something goes wrong
-            return {
-                "error": str(e),
-                "date": datetime.now().strftime("%d %B %Y"),
-                "time": datetime.now().strftime("%H:%M")
-            }
-    
-    def format_recommendation_text(self, recommendation):
-        """Format a recommendation dictionary as displayable text
-        
-        Args:
-            recommendation (dict): The recommendation dictionary
-            
-        Returns:
-            str: Formatted recommendation text
-        """
-        if "error" in recommendation:
-            return f"Error: {recommendation['error']}"
-        
-        # Build the text output
-        text = []
-        text.append(f"=== REKOMENDASI OUTFIT {recommendation['date']} ===\n")
-        text.append(f"👕 Atasan: {recommendation['top']}\n")
-        text.append(f"👖 Bawahan: {recommendation['bottom']}\n")
-        
-        if recommendation['outerwear']:
-            text.append(f"🧥 Outer: {recommendation['outerwear']}\n")
-        
-        text.append(f"👟 Alas Kaki: {recommendation['shoes']}\n")
-        text.append(f"👜 Aksesoris: {', '.join(recommendation['accessories'])}\n")
-        text.append(f"🎨 {recommendation['color_recommendation']}\n")
-        
-        if recommendation['weather_tip']:
-            text.append(f"\n{recommendation['weather_tip']}")
-        
-        if recommendation['occasion_tip']:
-            text.append(f"\n{recommendation['occasion_tip']}")
-        
-        text.append(f"\nDibuat pada: {recommendation['time']}")
-        
-        return "\n".join(text)
\ No newline at end of file
+#!/usr/bin/env python3
+# recommendation_engine.py - Recommendation engine for Outfit Recommendation System
+
+import random
+import threading
+from array import array
+from datetime import datetime
+from time import perf_counter
+
+from metrics import NULL_METRICS
+from query_cache import QueryCache
+from serializers import TextFormatter
+
+# NumPy is only used by the batch API and is imported there on first use,
+# see _load_numpy
+np = None
+_numpy_checked = False
+
+# Categories in the order they are drawn by the batch API
+CATEGORIES = ("tops", "bottoms", "outerwear", "shoes", "accessories")
+# Marker for an empty slot in the columnar batch results
+NO_ITEM = -1
+# Maximum number of accessories per recommendation
+ACCESSORY_SLOTS = 3
+
+def _load_numpy():
+    """Import NumPy the first time the batch API needs it
+    
+    Returns:
+        module: numpy, or None when it isn't installed
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+        _numpy_checked = True
+    return np
+
+class RecommendationBatch:
+    """Columnar result of OutfitRecommendationEngine.generate_recommendations
+    
+    Every column holds integer IDs into the shared ``strings`` table, with
+    NO_ITEM marking an empty slot. Accessories are stored flat with
+    ACCESSORY_SLOTS entries per row.
+    """
+    
+    COLUMNS = ("top", "bottom", "outerwear", "shoes", "accessories",
+               "color_recommendation", "weather_tip", "occasion_tip")
+    
+    def __init__(self, date, time, strings, columns):
+        """Initialize the batch result
+        
+        Args:
+            date (str): Formatted date shared by the whole batch
+            time (str): Formatted time shared by the whole batch
+            strings (list): String table the ID columns point into
+            columns (dict): Mapping of column name to ID array
+        """
+        self.date = date
+        self.time = time
+        self.strings = strings
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+    
+    def __len__(self):
+        return len(self.top)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+    
+    @classmethod
+    def concat(cls, batches):
+        """Join several batches into one, merging their string tables
+        
+        Args:
+            batches (list): RecommendationBatch objects in row order
+            
+        Returns:
+            RecommendationBatch: The combined batch
+        """
+        if not batches:
+            return cls("", "", [], {name: array("i") for name in cls.COLUMNS})
+        _load_numpy()
+        
+        strings = []
+        string_ids = {}
+        parts = {name: [] for name in cls.COLUMNS}
+        for batch in batches:
+            # Map this batch's IDs into the merged table; the trailing entry
+            # makes index NO_ITEM (-1) map onto itself
+            mapping = []
+            for text in batch.strings:
+                string_id = string_ids.get(text)
+                if string_id is None:
+                    string_id = string_ids[text] = len(strings)
+                    strings.append(text)
+                mapping.append(string_id)
+            mapping.append(NO_ITEM)
+            
+            if np is not None:
+                lookup = np.array(mapping, dtype=np.int32)
+                for name in cls.COLUMNS:
+                    parts[name].append(lookup[np.asarray(getattr(batch, name))])
+            else:
+                for name in cls.COLUMNS:
+                    parts[name].append(array("i", [mapping[item_id] for item_id in getattr(batch, name)]))
+        
+        if np is not None:
+            columns = {name: np.concatenate(parts[name]) for name in cls.COLUMNS}
+        else:
+            columns = {}
+            for name in cls.COLUMNS:
+                columns[name] = array("i")
+                for part in parts[name]:
+                    columns[name].extend(part)
+        return cls(batches[0].date, batches[0].time, strings, columns)
+    
+    def __getitem__(self, index):
+        """Resolve one row into the same dict generate_recommendation returns"""
+        strings = self.strings
+        start = index * ACCESSORY_SLOTS
+        accessories = [
+            strings[item_id]
+            for item_id in self.accessories[start:start + ACCESSORY_SLOTS]
+            if item_id != NO_ITEM
+        ]
+        outerwear = self.outerwear[index]
+        return {
+            "date": self.date,
+            "time": self.time,
+            "top": strings[self.top[index]],
+            "bottom": strings[self.bottom[index]],
+            "outerwear": strings[outerwear] if outerwear != NO_ITEM else None,
+            "shoes": strings[self.shoes[index]],
+            "accessories": accessories,
+            "color_recommendation": strings[self.color_recommendation[index]],
+            "weather_tip": strings[self.weather_tip[index]],
+            "occasion_tip": strings[self.occasion_tip[index]]
+        }
+
+class OutfitRecommendationEngine:
+    """The main recommendation engine for outfit suggestions"""
+    
+    def __init__(self, knowledge_base, rng=None, deterministic=False, seed=0, cache_size=4096,
+                 metrics=None, locale="id"):
+        """Initialize the recommendation engine
+        
+        Args:
+            knowledge_base: The knowledge base object to use for recommendations
+            rng (random.Random): Random generator for the selections,
+                                 defaults to the global random module
+            deterministic (bool): Derive the selections from a stable hash of
+                                  (seed, user id, date, inputs) instead of rng
+            seed (int): Engine seed mixed into every deterministic key
+            cache_size (int): Deterministic results to keep, 0 disables the cache
+            metrics (Metrics): Instrumentation, defaults to the knowledge base's
+            locale (str): Language of format_recommendation_text, see serializers.LOCALES
+        """
+        self.kb = knowledge_base
+        self.metrics = metrics if metrics is not None else getattr(knowledge_base, "metrics", NULL_METRICS)
+        self.rng = rng if rng is not None else random
+        self.deterministic = deterministic
+        self.seed = seed
+        self.cache = QueryCache(cache_size) if deterministic and cache_size > 0 else None
+        self._keyed_rng = random.Random()
+        self._keyed_lock = threading.Lock()
+        self.formatter = TextFormatter(locale)
+        # Scored search of generate_scored_recommendations, built on first use
+        self._search = None
+    
+    def generate_recommendation(self, weather, occasion, gender, special, date=None, user_id=None):
+        """Generate an outfit recommendation based on input parameters
+        
+        Args:
+            weather (str): Weather value (hot, warm, cold, rainy)
+            occasion (str): Occasion value (formal, casual, sports)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            date (tuple): Optional tuple of (day, month, year) for seasonal considerations
+            user_id (str): Optional user identifier, used by deterministic mode
+            
+        Returns:
+            dict: A dictionary containing the recommendation details
+        """
+        if not self.deterministic:
+            return self._generate(weather, occasion, gender, special, date, self.rng)
+        
+        if date is None:
+            today = datetime.now()
+            date = (today.day, today.month, today.year)
+        key = self.recommendation_key(user_id, date, weather, occasion, gender, special)
+        # Occasion and weather lead the cache key so a reload can drop the
+        # results of changed cells only, see invalidate
+        cache_key = (occasion, weather, key)
+        
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._copy_result(cached)
+        
+        with self._keyed_lock:
+            self._keyed_rng.seed(int(key, 16))
+            result = self._generate(weather, occasion, gender, special, date, self._keyed_rng)
+        
+        if self.cache is not None and "error" not in result:
+            self.cache.put(cache_key, result)
+            return self._copy_result(result)
+        return result
+    
+    def generate_scored_recommendations(self, weather, occasion, gender, special, date=None, k=3,
+                                        preferences=None):
+        """Generate the k best scored outfits instead of random picks
+        
+        Whole outfits are ranked by item and compatibility scores, see
+        outfit_search.OutfitSearch.
+        
+        Args:
+            weather (str): Weather value (hot, warm, cold, rainy)
+            occasion (str): Occasion value (formal, casual, sports)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            date (tuple): Optional tuple of (day, month, year) for seasonal considerations
+            k (int): Number of outfits
+            preferences (dict): Optional "colors", "liked" and "disliked" word lists
+        
+        Returns:
+            list: Recommendation dicts with a "score", best first
+        """
+        from outfit_search import OutfitSearch
+        
+        kb = self.kb
+        search = self._search
+        # A hot reload swaps self.kb, the scored cells of the old one are stale
+        if search is None or search.kb is not kb:
+            search = self._search = OutfitSearch(kb)
+        try:
+            return [
+                search.recommendation(outfit, weather, occasion, date, score)
+                for score, outfit in search.top_k(weather, occasion, gender, special, date, k, preferences)
+            ]
+        except Exception as e:
+            self.metrics.increment("recommendation_errors")
+            return [{
+                "error": str(e),
+                "date": datetime.now().strftime("%d %B %Y"),
+                "time": datetime.now().strftime("%H:%M")
+            }]
+    
+    def invalidate(self, cells=None):
+        """Drop cached deterministic results after the knowledge base changed
+        
+        Args:
+            cells: (occasion, weather) pairs whose results are stale,
+                   None drops every cached result
+        
+        Returns:
+            int: Number of results dropped
+        """
+        if self.cache is None:
+            return 0
+        if cells is None:
+            return self.cache.discard()
+        cells = set(cells)
+        return self.cache.discard(lambda key: key[:2] in cells)
+    
+    def recommendation_key(self, user_id, date, weather, occasion, gender, special):
+        """Build the stable key of a deterministic recommendation
+        
+        The key is also the cache key, so the same user, date and inputs
+        always map to the same outfit.
+        
+        Args:
+            user_id (str): User identifier, may be None
+            date (tuple): Tuple of (day, month, year)
+            weather (str): Weather value
+            occasion (str): Occasion value
+            gender (str): Gender preference
+            special (str): Special considerations
+            
+        Returns:
+            str: Hex digest identifying the recommendation
+        """
+        def normalise(part):
+            # "05" from the UI and 5 from code must give the same key
+            try:
+                return str(int(part))
+            except (TypeError, ValueError):
+                return str(part)
+        
+        import hashlib
+        
+        parts = [str(self.seed), "" if user_id is None else str(user_id)]
+        parts.extend(normalise(part) for part in date)
+        parts.extend((weather, occasion, gender, special))
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+    
+    @staticmethod
+    def _copy_result(result):
+        """Copy a cached result so callers can't change the cached one"""
+        copy = dict(result)
+        copy["accessories"] = list(result["accessories"])
+        return copy
+    
+    def _generate(self, weather, occasion, gender, special, date, rng):
+        """Build one recommendation using the given random generator
+        
+        Args:
+            weather (str): Weather value (hot, warm, cold, rainy)
+            occasion (str): Occasion value (formal, casual, sports)
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            date (tuple): Optional tuple of (day, month, year)
+            rng: random.Random or the random module
+            
+        Returns:
+            dict: A dictionary containing the recommendation details
+        """
+        metrics = self.metrics
+        timed = metrics.enabled
+        # One knowledge base per request: a hot reload swaps self.kb, and
+        # requests already running finish against the version they started on
+        kb = self.kb
+        try:
+            # Get the current date if none provided
+            if date is None:
+                now = datetime.now()
+                month = now.month
+                day = now.day
+                year = now.year
+            else:
+                day, month, year = date
+                # Ensure month is an integer
+                month = int(month)
+            
+            if timed:
+                start = perf_counter()
+            
+            # Get season based on date
+            season = kb.get_season_from_month(month)
+            
+            # Decide whether the extra feminine options are offered
+            extended = False
+            if gender == "feminine":
+                if occasion == "formal" or occasion == "casual":
+                    extended = rng.random() > 0.5
+                elif occasion == "sports":
+                    extended = True
+            
+            # Get the prefiltered item IDs from knowledge base
+            get_ids = kb.get_filtered_ids
+            tops = get_ids("tops", occasion, weather, gender, special, extended)
+            bottoms = get_ids("bottoms", occasion, weather, gender, special, extended)
+            outerwear = get_ids("outerwear", occasion, weather, gender, special, extended)
+            shoes = get_ids("shoes", occasion, weather, gender, special, extended)
+            accessories = get_ids("accessories", occasion, weather, gender, special, extended)
+            
+            # Get color recommendation based on season
+            color_recommendation = kb.get_color_recommendation(season)
+            
+            # Get weather tip
+            weather_tip = kb.get_weather_tip(weather)
+            
+            # Get occasion tip
+            occasion_tip = kb.get_occasion_tip(occasion)
+            
+            if timed:
+                lookup_done = perf_counter()
+                metrics.observe("kb_lookup", lookup_done - start)
+            
+            # Select random items from each category, names are only
+            # looked up for the picked IDs
+            names = kb.item_names
+            selected_top = names[rng.choice(tops)] if tops else "Outfit tidak tersedia"
+            selected_bottom = names[rng.choice(bottoms)] if bottoms else "Outfit tidak tersedia"
+            selected_outerwear = names[rng.choice(outerwear)] if outerwear else "Tidak diperlukan"
+            selected_shoes = names[rng.choice(shoes)] if shoes else "Outfit tidak tersedia"
+            
+            # Select 2-3 random accessories
+            if accessories:
+                picked = rng.sample(accessories, min(len(accessories), rng.randint(2, 3)))
+                selected_accessories = [names[item_id] for item_id in picked]
+            else:
+                selected_accessories = ["Aksesoris minimal"]
+            
+            # Current datetime for the recommendation
+            now = datetime.now()
+            date_str = now.strftime("%d %B %Y")
+            time_str = now.strftime("%H:%M")
+            
+            # Build the recommendation result
+            result = {
+                "date": date_str,
+                "time": time_str,
+                "top": selected_top,
+                "bottom": selected_bottom,
+                "outerwear": selected_outerwear if "Tidak diperlukan" not in selected_outerwear else None,
+                "shoes": selected_shoes,
+                "accessories": selected_accessories,
+                "color_recommendation": color_recommendation,
+                "weather_tip": weather_tip,
+                "occasion_tip": occasion_tip
+            }
+            
+            if timed:
+                metrics.observe("selection", perf_counter() - lookup_done)
+            
+            return result
+            
+        except Exception as e:
+            metrics.increment("recommendation_errors")
+            # Return error information if something goes wrong
+            return {
+                "error": str(e),
+                "date": datetime.now().strftime("%d %B %Y"),
+                "time": datetime.now().strftime("%H:%M")
+            }
+    
+    def format_recommendation_text(self, recommendation):
+        """Format a recommendation dictionary as displayable text
+        
+        Args:
+            recommendation (dict): The recommendation dictionary
+            
+        Returns:
+            str: Formatted recommendation text
+        """
+        if not self.metrics.enabled:
+            return self.formatter.format(recommendation)
+        
+        start = perf_counter()
+        text = self.formatter.format(recommendation)
+        self.metrics.observe("formatting", perf_counter() - start)
+        return text
+    
+    def generate_recommendations(self, requests, seed=None):
+        """Generate outfit recommendations for a whole batch of users
+        
+        Rows sharing the same inputs are grouped and drawn together. With
+        NumPy available each group costs a single random generator call,
+        otherwise a per-batch random.Random is used.
+        
+        Args:
+            requests: Iterable of (weather, occasion, gender, special[, date])
+                rows, or a dict of columns with the keys weather, occasion,
+                gender, special and optionally date or month
+            seed (int): Optional seed for reproducible batches
+            
+        Returns:
+            RecommendationBatch: Columnar recommendation results
+        """
+        weathers, occasions, genders, specials, months = self._batch_columns(requests)
+        size = len(weathers)
+        _load_numpy()
+        # The whole batch is drawn from one knowledge base version
+        kb = self.kb
+        
+        # Format the timestamp once for the whole batch
+        now = datetime.now()
+        date_str = now.strftime("%d %B %Y")
+        time_str = now.strftime("%H:%M")
+        
+        strings = []
+        string_ids = {}
+        
+        def intern(text):
+            string_id = string_ids.get(text)
+            if string_id is None:
+                string_id = string_ids[text] = len(strings)
+                strings.append(text)
+            return string_id
+        
+        if np is not None:
+            columns = {name: np.full(size, NO_ITEM, dtype=np.int32) for name in RecommendationBatch.COLUMNS}
+            columns["accessories"] = np.full(size * ACCESSORY_SLOTS, NO_ITEM, dtype=np.int32)
+            rng = np.random.default_rng(seed)
+        else:
+            columns = {name: array("i", [NO_ITEM]) * size for name in RecommendationBatch.COLUMNS}
+            columns["accessories"] = array("i", [NO_ITEM]) * (size * ACCESSORY_SLOTS)
+            rng = random.Random(seed)
+        
+        # Group rows by their inputs so each group is drawn in one go
+        seasons = {}
+        groups = {}
+        for index, month in enumerate(months):
+            season = seasons.get(month)
+            if season is None:
+                season = seasons[month] = kb.get_season_from_month(month)
+            key = (weathers[index], occasions[index], genders[index], specials[index], season)
+            groups.setdefault(key, []).append(index)
+        
+        metrics = self.metrics
+        timed = metrics.enabled
+        for (weather, occasion, gender, special, season), rows in groups.items():
+            # Same rule as generate_recommendation for the feminine extras
+            if gender == "feminine" and occasion in ("formal", "casual"):
+                extend_mode = "coin"
+            elif gender == "feminine" and occasion == "sports":
+                extend_mode = "always"
+            else:
+                extend_mode = "never"
+            
+            if timed:
+                start = perf_counter()
+            
+            options = {
+                extended: [
+                    kb.get_filtered_options(category, occasion, weather, gender, special, extended)
+                    for category in CATEGORIES
+                ]
+                for extended in (False, True)
+            }
+            texts = (
+                intern(kb.get_color_recommendation(season)),
+                intern(kb.get_weather_tip(weather)),
+                intern(kb.get_occasion_tip(occasion))
+            )
+            
+            if timed:
+                lookup_done = perf_counter()
+                metrics.observe("kb_lookup", lookup_done - start)
+            
+            if np is not None:
+                self._draw_group_numpy(rng, rows, options, extend_mode, texts, intern, columns)
+            else:
+                self._draw_group_python(rng, rows, options, extend_mode, texts, intern, columns)
+            
+            if timed:
+                metrics.observe("selection", perf_counter() - lookup_done)
+        
+        return RecommendationBatch(date_str, time_str, strings, columns)
+    
+    @staticmethod
+    def _batch_columns(requests):
+        """Normalise batch input into weather/occasion/gender/special/month columns
+        
+        Args:
+            requests: Iterable of rows or dict of columns
+            
+        Returns:
+            tuple: Five equally long lists
+        """
+        current_month = None
+        
+        def to_month(date):
+            nonlocal current_month
+            if date is None:
+                if current_month is None:
+                    current_month = datetime.now().month
+                return current_month
+            return int(date[1])
+        
+        if isinstance(requests, dict):
+            weathers = list(requests["weather"])
+            occasions = list(requests["occasion"])
+            genders = list(requests["gender"])
+            specials = list(requests["special"])
+            if "month" in requests:
+                months = [int(month) for month in requests["month"]]
+            elif "date" in requests:
+                months = [to_month(date) for date in requests["date"]]
+            else:
+                months = [to_month(None)] * len(weathers)
+        else:
+            weathers, occasions, genders, specials, months = [], [], [], [], []
+            for row in requests:
+                weathers.append(row[0])
+                occasions.append(row[1])
+                genders.append(row[2])
+                specials.append(row[3])
+                months.append(to_month(row[4] if len(row) > 4 else None))
+        
+        if not len(weathers) == len(occasions) == len(genders) == len(specials) == len(months):
+            raise ValueError("All request columns must have the same length")
+        
+        return weathers, occasions, genders, specials, months
+    
+    def _draw_group_numpy(self, rng, rows, options, extend_mode, texts, intern, columns):
+        """Draw all selections for one input group with a single generator call
+        
+        Args:
+            rng: NumPy random generator
+            rows (list): Row indices belonging to the group
+            options (dict): Candidate tuples per category, keyed by extended flag
+            extend_mode (str): never, coin or always
+            texts (tuple): String IDs of the color recommendation and tips
+            intern: Function mapping a string to its ID
+            columns (dict): Output columns to fill
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        count = len(rows)
+        accessories = options[False][4]
+        
+        # Column 0 decides the extras, 1-4 pick the single items,
+        # 5 the accessory count and the rest rank the accessories
+        draws = rng.random((count, 6 + len(accessories)))
+        
+        if extend_mode == "coin":
+            extended = draws[:, 0] > 0.5
+        else:
+            extended = np.full(count, extend_mode == "always")
+        
+        slots = (("top", 0, "Outfit tidak tersedia"), ("bottom", 1, "Outfit tidak tersedia"),
+                 ("outerwear", 2, "Tidak diperlukan"), ("shoes", 3, "Outfit tidak tersedia"))
+        for column, category_index, missing in slots:
+            base = [self._item_id(item, column, intern) for item in options[False][category_index]]
+            extra = [self._item_id(item, column, intern) for item in options[True][category_index]]
+            table = np.array(base + extra + [self._item_id(missing, column, intern)], dtype=np.int32)
+            lengths = np.where(extended, len(extra), len(base))
+            offsets = np.where(extended, len(base), 0)
+            picks = offsets + (draws[:, 1 + category_index] * lengths).astype(np.intp)
+            picks = np.where(lengths == 0, len(table) - 1, picks)
+            columns[column][rows] = table[picks]
+        
+        slots_out = columns["accessories"].reshape(-1, ACCESSORY_SLOTS)
+        if accessories:
+            ids = np.array([intern(item) for item in accessories], dtype=np.int32)
+            wanted = np.minimum(len(accessories), np.where(draws[:, 5] < 0.5, 2, 3))
+            width = min(ACCESSORY_SLOTS, len(accessories))
+            order = np.argsort(draws[:, 6:], axis=1)[:, :width]
+            chosen = np.where(np.arange(width) < wanted[:, None], ids[order], NO_ITEM)
+            slots_out[rows, :width] = chosen
+        else:
+            slots_out[rows, 0] = intern("Aksesoris minimal")
+        
+        columns["color_recommendation"][rows] = texts[0]
+        columns["weather_tip"][rows] = texts[1]
+        columns["occasion_tip"][rows] = texts[2]
+    
+    def _draw_group_python(self, rng, rows, options, extend_mode, texts, intern, columns):
+        """Draw all selections for one input group without NumPy
+        
+        Args:
+            rng (random.Random): Random generator for the batch
+            rows (list): Row indices belonging to the group
+            options (dict): Candidate tuples per category, keyed by extended flag
+            extend_mode (str): never, coin or always
+            texts (tuple): String IDs of the color recommendation and tips
+            intern: Function mapping a string to its ID
+            columns (dict): Output columns to fill
+        """
+        slots = (("top", 0, "Outfit tidak tersedia"), ("bottom", 1, "Outfit tidak tersedia"),
+                 ("outerwear", 2, "Tidak diperlukan"), ("shoes", 3, "Outfit tidak tersedia"))
+        tables = {
+            extended: [
+                [self._item_id(item, column, intern) for item in options[extended][category_index]]
+                or [self._item_id(missing, column, intern)]
+                for column, category_index, missing in slots
+            ]
+            for extended in (False, True)
+        }
+        accessory_ids = [intern(item) for item in options[False][4]]
+        minimal_id = intern("Aksesoris minimal")
+        accessory_column = columns["accessories"]
+        
+        for row in rows:
+            if extend_mode == "coin":
+                extended = rng.random() > 0.5
+            else:
+                extended = extend_mode == "always"
+            
+            for (column, _, _), table in zip(slots, tables[extended]):
+                columns[column][row] = rng.choice(table)
+            
+            start = row * ACCESSORY_SLOTS
+            if accessory_ids:
+                picked = rng.sample(accessory_ids, min(len(accessory_ids), rng.randint(2, 3)))
+                accessory_column[start:start + len(picked)] = array("i", picked)
+            else:
+                accessory_column[start] = minimal_id
+            
+            columns["color_recommendation"][row] = texts[0]
+            columns["weather_tip"][row] = texts[1]
+            columns["occasion_tip"][row] = texts[2]
+    
+    @staticmethod
+    def _item_id(item, column, intern):
+        """Map an item to its string ID, dropping outerwear that isn't needed"""
+        if column == "outerwear" and "Tidak diperlukan" in item:
+            return NO_ITEM
+        return intern(item)
\ No newline at end of file
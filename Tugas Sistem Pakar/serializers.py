@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+# serializers.py - Text formatting and serialization of recommendations
+
+"""
+Output side of the recommendation engine.
+
+TextFormatter renders the display text with the labels of a locale. The
+serializers turn recommendation dicts into bytes:
+    
+    JsonSerializer      - compact JSON, through orjson when it is installed
+    MsgpackSerializer   - MessagePack, through msgpack or a built-in encoder
+    BinarySerializer    - fixed 48-byte records holding string IDs
+
+RecommendationWriter streams any number of recommendations or whole
+RecommendationBatch objects to a file with one of these formats.
+"""
+
+import importlib
+import struct
+
+def _optional_module(name):
+    """Import an optional backend, or return None when it isn't installed
+    
+    Serializers call this when they are created, so the JSON and
+    MessagePack libraries are only loaded by processes that use them.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+# Labels of the display text per locale
+LOCALES = {
+    "id": {
+        "title": "REKOMENDASI OUTFIT",
+        "top": "👕 Atasan",
+        "bottom": "👖 Bawahan",
+        "outerwear": "🧥 Outer",
+        "shoes": "👟 Alas Kaki",
+        "accessories": "👜 Aksesoris",
+        "color": "🎨",
+        "created": "Dibuat pada"
+    },
+    "en": {
+        "title": "OUTFIT RECOMMENDATION",
+        "top": "👕 Top",
+        "bottom": "👖 Bottom",
+        "outerwear": "🧥 Outerwear",
+        "shoes": "👟 Footwear",
+        "accessories": "👜 Accessories",
+        "color": "🎨",
+        "created": "Created at"
+    }
+}
+
+class TextFormatter:
+    """Render recommendation dicts as display text"""
+    
+    def __init__(self, locale="id"):
+        """Select the labels of a locale
+        
+        Args:
+            locale (str): Key of LOCALES
+        """
+        self.locale = locale
+        self.labels = LOCALES[locale]
+    
+    def format(self, recommendation):
+        """Format a recommendation dictionary as displayable text
+        
+        Args:
+            recommendation (dict): The recommendation dictionary
+        
+        Returns:
+            str: Formatted recommendation text
+        """
+        if "error" in recommendation:
+            return f"Error: {recommendation['error']}"
+        
+        labels = self.labels
+        text = []
+        text.append(f"=== {labels['title']} {recommendation['date']} ===\n")
+        text.append(f"{labels['top']}: {recommendation['top']}\n")
+        text.append(f"{labels['bottom']}: {recommendation['bottom']}\n")
+        if recommendation['outerwear']:
+            text.append(f"{labels['outerwear']}: {recommendation['outerwear']}\n")
+        text.append(f"{labels['shoes']}: {recommendation['shoes']}\n")
+        text.append(f"{labels['accessories']}: {', '.join(recommendation['accessories'])}\n")
+        text.append(f"{labels['color']} {recommendation['color_recommendation']}\n")
+        if recommendation['weather_tip']:
+            text.append(f"\n{recommendation['weather_tip']}")
+        if recommendation['occasion_tip']:
+            text.append(f"\n{recommendation['occasion_tip']}")
+        text.append(f"\n{labels['created']}: {recommendation['time']}")
+        return "\n".join(text)
+
+class JsonSerializer:
+    """Compact JSON, one document per recommendation"""
+    
+    name = "json"
+    
+    def __init__(self):
+        self._orjson = _optional_module("orjson")
+        self._json = _optional_module("json") if self._orjson is None else None
+    
+    def dumps(self, recommendation):
+        """Serialize one recommendation
+        
+        Args:
+            recommendation (dict): The recommendation dictionary
+        
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        if self._orjson is not None:
+            return self._orjson.dumps(recommendation)
+        return self._json.dumps(recommendation, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    def loads(self, data):
+        """Parse bytes produced by dumps"""
+        if self._orjson is not None:
+            return self._orjson.loads(data)
+        return self._json.loads(data)
+
+class MsgpackSerializer:
+    """MessagePack, with a built-in encoder when msgpack isn't installed
+    
+    The built-in encoder covers the types found in recommendations: None,
+    bool, int, float, str, list and dict.
+    """
+    
+    name = "msgpack"
+    
+    def __init__(self):
+        self._msgpack = _optional_module("msgpack")
+    
+    def dumps(self, recommendation):
+        """Serialize one recommendation
+        
+        Args:
+            recommendation (dict): The recommendation dictionary
+        
+        Returns:
+            bytes: MessagePack encoded data
+        """
+        if self._msgpack is not None:
+            return self._msgpack.packb(recommendation, use_bin_type=True)
+        out = bytearray()
+        _pack(recommendation, out)
+        return bytes(out)
+    
+    def loads(self, data):
+        """Parse bytes produced by dumps"""
+        if self._msgpack is not None:
+            return self._msgpack.unpackb(data, raw=False)
+        value, _ = _unpack(memoryview(data), 0)
+        return value
+
+def _pack(value, out):
+    """Append the MessagePack encoding of a value to a bytearray"""
+    if value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xff)
+        elif 0 <= value < 1 << 64:
+            out += b"\xcf" + struct.pack(">Q", value)
+        else:
+            out += b"\xd3" + struct.pack(">q", value)
+    elif isinstance(value, float):
+        out += b"\xcb" + struct.pack(">d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        size = len(data)
+        if size < 32:
+            out.append(0xa0 | size)
+        elif size < 1 << 8:
+            out += b"\xd9" + struct.pack(">B", size)
+        elif size < 1 << 16:
+            out += b"\xda" + struct.pack(">H", size)
+        else:
+            out += b"\xdb" + struct.pack(">I", size)
+        out += data
+    elif isinstance(value, (list, tuple)):
+        size = len(value)
+        if size < 16:
+            out.append(0x90 | size)
+        elif size < 1 << 16:
+            out += b"\xdc" + struct.pack(">H", size)
+        else:
+            out += b"\xdd" + struct.pack(">I", size)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        size = len(value)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size < 1 << 16:
+            out += b"\xde" + struct.pack(">H", size)
+        else:
+            out += b"\xdf" + struct.pack(">I", size)
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    else:
+        raise TypeError(f"Cannot serialize {type(value).__name__} to MessagePack")
+
+# Numeric MessagePack types with a fixed-width payload
+_FIXED_WIDTH = {0xca: ">f", 0xcb: ">d", 0xcc: ">B", 0xcd: ">H", 0xce: ">I", 0xcf: ">Q",
+                0xd0: ">b", 0xd1: ">h", 0xd2: ">i", 0xd3: ">q"}
+
+def _unpack(data, pos):
+    """Decode one MessagePack value, returning (value, next position)"""
+    code = data[pos]
+    pos += 1
+    if code < 0x80:
+        return code, pos
+    if code >= 0xe0:
+        return code - 0x100, pos
+    if 0xa0 <= code <= 0xbf:
+        size = code & 0x1f
+        return str(data[pos:pos + size], "utf-8"), pos + size
+    if 0x90 <= code <= 0x9f:
+        return _unpack_array(data, pos, code & 0x0f)
+    if 0x80 <= code <= 0x8f:
+        return _unpack_map(data, pos, code & 0x0f)
+    if code == 0xc0:
+        return None, pos
+    if code in (0xc2, 0xc3):
+        return code == 0xc3, pos
+    if code in (0xd9, 0xda, 0xdb):
+        width = {0xd9: 1, 0xda: 2, 0xdb: 4}[code]
+        size = int.from_bytes(data[pos:pos + width], "big")
+        pos += width
+        return str(data[pos:pos + size], "utf-8"), pos + size
+    if code in (0xdc, 0xdd):
+        width = 2 if code == 0xdc else 4
+        return _unpack_array(data, pos + width, int.from_bytes(data[pos:pos + width], "big"))
+    if code in (0xde, 0xdf):
+        width = 2 if code == 0xde else 4
+        return _unpack_map(data, pos + width, int.from_bytes(data[pos:pos + width], "big"))
+    if code in _FIXED_WIDTH:
+        fmt = _FIXED_WIDTH[code]
+        return struct.unpack_from(fmt, data, pos)[0], pos + struct.calcsize(fmt)
+    raise ValueError(f"Unsupported MessagePack type 0x{code:02x}")
+
+def _unpack_array(data, pos, size):
+    items = []
+    for _ in range(size):
+        item, pos = _unpack(data, pos)
+        items.append(item)
+    return items, pos
+
+def _unpack_map(data, pos, size):
+    result = {}
+    for _ in range(size):
+        key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
+
+# Field order of a binary record, the accessories take ACCESSORY_SLOTS fields
+RECORD_FIELDS = ("date", "time", "top", "bottom", "outerwear", "shoes",
+                 "accessories", "accessories", "accessories",
+                 "color_recommendation", "weather_tip", "occasion_tip")
+RECORD = struct.Struct("<12i")
+# Field order of an error record, the {"error", "date", "time"} dicts the engine returns
+ERROR_FIELDS = ("error", "date", "time")
+ERROR_RECORD = struct.Struct("<3i")
+# Stream frame tags: new string table entry, one record, block of records, one error record
+FRAME_STRING = b"S"
+FRAME_RECORD = b"R"
+FRAME_BLOCK = b"B"
+FRAME_ERROR = b"E"
+BINARY_MAGIC = b"OREC\x01"
+# Marker for an empty slot, same value as recommendation_engine.NO_ITEM
+NO_STRING = -1
+
+class BinarySerializer:
+    """Fixed-schema binary records that store string IDs instead of text
+    
+    Every record is RECORD.size (48) bytes: twelve little-endian int32 IDs
+    into a string table owned by the serializer. Strings the table hasn't
+    seen yet are emitted as FRAME_STRING frames ahead of the record, so a
+    stream can be decoded front to back by BinaryReader.
+    
+    Error dicts from the engine ({"error", "date", "time"}) are written as
+    FRAME_ERROR frames of ERROR_RECORD.size (12) bytes instead, so a failed
+    row doesn't interrupt the stream.
+    """
+    
+    name = "binary"
+    
+    def __init__(self):
+        self.strings = []
+        self._string_ids = {}
+    
+    def _intern(self, text, frames):
+        """Return the ID of a string, queueing a frame for new strings"""
+        if text is None:
+            return NO_STRING
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+            data = text.encode("utf-8")
+            frames.append(FRAME_STRING + struct.pack("<I", len(data)) + data)
+        return string_id
+    
+    def header(self):
+        """Bytes that start a binary stream"""
+        return BINARY_MAGIC
+    
+    def dumps(self, recommendation):
+        """Serialize one recommendation as stream frames
+        
+        Args:
+            recommendation (dict): The recommendation dictionary
+        
+        Returns:
+            bytes: Any new string frames followed by one record or error frame
+        """
+        frames = []
+        intern = self._intern
+        if "error" in recommendation:
+            record = ERROR_RECORD.pack(*[intern(recommendation.get(field), frames) for field in ERROR_FIELDS])
+            frames.append(FRAME_ERROR + record)
+            return b"".join(frames)
+        
+        accessories = list(recommendation["accessories"][:3])
+        accessories += [None] * (3 - len(accessories))
+        record = RECORD.pack(
+            intern(recommendation["date"], frames),
+            intern(recommendation["time"], frames),
+            intern(recommendation["top"], frames),
+            intern(recommendation["bottom"], frames),
+            intern(recommendation["outerwear"], frames),
+            intern(recommendation["shoes"], frames),
+            intern(accessories[0], frames),
+            intern(accessories[1], frames),
+            intern(accessories[2], frames),
+            intern(recommendation["color_recommendation"], frames),
+            intern(recommendation["weather_tip"], frames),
+            intern(recommendation["occasion_tip"], frames)
+        )
+        frames.append(FRAME_RECORD + record)
+        return b"".join(frames)
+    
+    def dumps_batch(self, batch):
+        """Serialize a RecommendationBatch straight from its ID columns
+        
+        Args:
+            batch (RecommendationBatch): Columnar engine output
+        
+        Returns:
+            bytes: New string frames followed by one block frame
+        """
+        frames = []
+        # Translate the batch's string IDs into this serializer's table,
+        # the trailing entry keeps NO_ITEM (-1) mapped onto itself
+        mapping = [self._intern(text, frames) for text in batch.strings] + [NO_STRING]
+        date_id = self._intern(batch.date, frames)
+        time_id = self._intern(batch.time, frames)
+        
+        count = len(batch)
+        columns = (batch.top, batch.bottom, batch.outerwear, batch.shoes)
+        tails = (batch.color_recommendation, batch.weather_tip, batch.occasion_tip)
+        accessories = batch.accessories
+        pack = RECORD.pack
+        records = bytearray()
+        for index in range(count):
+            start = index * 3
+            records += pack(
+                date_id, time_id,
+                *[mapping[column[index]] for column in columns],
+                mapping[accessories[start]], mapping[accessories[start + 1]], mapping[accessories[start + 2]],
+                *[mapping[column[index]] for column in tails]
+            )
+        frames.append(FRAME_BLOCK + struct.pack("<I", count) + bytes(records))
+        return b"".join(frames)
+
+class BinaryReader:
+    """Decode a stream written with BinarySerializer"""
+    
+    def __init__(self, fileobj):
+        """Initialize the reader
+        
+        Args:
+            fileobj: Binary file object positioned at the stream header
+        """
+        self.file = fileobj
+        self.strings = []
+        if self.file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError("Not a binary recommendation stream")
+    
+    def __iter__(self):
+        """Yield the recommendation dicts in stream order"""
+        read = self.file.read
+        while True:
+            tag = read(1)
+            if not tag:
+                return
+            if tag == FRAME_STRING:
+                size = struct.unpack("<I", read(4))[0]
+                self.strings.append(read(size).decode("utf-8"))
+            elif tag == FRAME_RECORD:
+                yield self._record(read(RECORD.size))
+            elif tag == FRAME_BLOCK:
+                count = struct.unpack("<I", read(4))[0]
+                data = read(count * RECORD.size)
+                for offset in range(0, len(data), RECORD.size):
+                    yield self._record(data[offset:offset + RECORD.size])
+            elif tag == FRAME_ERROR:
+                ids = ERROR_RECORD.unpack(read(ERROR_RECORD.size))
+                yield {field: self.strings[string_id] if string_id != NO_STRING else None
+                       for field, string_id in zip(ERROR_FIELDS, ids)}
+            else:
+                raise ValueError(f"Unknown frame tag {tag!r}")
+    
+    def _record(self, data):
+        strings = self.strings
+        ids = RECORD.unpack(data)
+        text = [strings[string_id] if string_id != NO_STRING else None for string_id in ids]
+        return {
+            "date": text[0],
+            "time": text[1],
+            "top": text[2],
+            "bottom": text[3],
+            "outerwear": text[4],
+            "shoes": text[5],
+            "accessories": [item for item in text[6:9] if item is not None],
+            "color_recommendation": text[9],
+            "weather_tip": text[10],
+            "occasion_tip": text[11]
+        }
+
+SERIALIZERS = {
+    "json": JsonSerializer,
+    "msgpack": MsgpackSerializer,
+    "binary": BinarySerializer
+}
+
+class RecommendationWriter:
+    """Stream recommendations to a binary file in a chosen format
+    
+    JSON output is JSON Lines, MessagePack output is a sequence of
+    MessagePack documents and binary output is a BinarySerializer stream.
+    Output is buffered and written in chunks of about buffer_size bytes.
+    """
+    
+    def __init__(self, fileobj, fmt="json", buffer_size=1 << 16):
+        """Initialize the writer
+        
+        Args:
+            fileobj: File object opened in binary mode
+            fmt (str): json, msgpack or binary
+            buffer_size (int): Bytes to collect before writing to the file
+        """
+        self.file = fileobj
+        self.serializer = SERIALIZERS[fmt]()
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = bytearray()
+        self._newline = fmt == "json"
+        if fmt == "binary":
+            self._buffer += self.serializer.header()
+    
+    def write(self, recommendation):
+        """Add one recommendation dict to the stream"""
+        self._buffer += self.serializer.dumps(recommendation)
+        if self._newline:
+            self._buffer += b"\n"
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+    
+    def write_many(self, recommendations):
+        """Add an iterable of recommendation dicts to the stream"""
+        for recommendation in recommendations:
+            self.write(recommendation)
+    
+    def write_batch(self, batch):
+        """Add every row of a RecommendationBatch to the stream"""
+        if isinstance(self.serializer, BinarySerializer):
+            self._buffer += self.serializer.dumps_batch(batch)
+            self.count += len(batch)
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+        else:
+            self.write_many(batch)
+    
+    def flush(self):
+        """Write the buffered bytes to the file"""
+        if self._buffer:
+            self.file.write(self._buffer)
+            self._buffer.clear()
+    
+    def close(self):
+        """Flush the remaining output, the file itself stays open"""
+        self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
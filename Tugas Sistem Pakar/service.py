@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# service.py - Asynchronous HTTP/JSON service for Outfit Recommendation System
+
+"""
+Serves the recommendation engine over a small HTTP/1.1 server built on asyncio.
+Connections are kept alive and pipelined requests are answered in order.
+
+Endpoints:
+    GET  /health                 - liveness check
+    POST /recommend              - one recommendation
+    POST /recommend/batch        - many recommendations in one call
+    POST /prolog/recommend       - recommendation text from the Prolog rules
+    GET  /metrics                - JSON snapshot of the instrumentation
+    GET  /metrics/prometheus     - the same in the Prometheus text format
+    POST /reload                 - reload the knowledge base now (with --watch)
+
+Run with:
+    python service.py --port 8080
+    python service.py --unix /tmp/outfit.sock
+    python service.py --prolog --watch 2
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from knowledge_base import KnowledgeBase, validate_inputs
+from metrics import Metrics, PrometheusExporter
+from recommendation_engine import OutfitRecommendationEngine
+from serializers import JsonSerializer
+
+# Upper bound for request bodies, batches included
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class BadRequest(Exception):
+    """Raised for malformed requests, answered with HTTP 400"""
+    
+    status = 400
+
+class PayloadTooLarge(BadRequest):
+    """Raised for bodies over MAX_BODY_SIZE, answered with HTTP 413"""
+    
+    status = 413
+
+class RecommendationService:
+    """asyncio front end for OutfitRecommendationEngine"""
+    
+    def __init__(self, engine, bridge=None, executor_workers=4, reloader=None):
+        """Initialize the service
+        
+        Args:
+            engine (OutfitRecommendationEngine): Engine used for recommendations
+            bridge (PrologBridge): Optional bridge for the Prolog endpoint
+            executor_workers (int): Threads used for blocking Prolog and batch work
+            reloader (KnowledgeBaseReloader): Optional hot reload of the knowledge base
+        """
+        self.engine = engine
+        self.bridge = bridge
+        self.reloader = reloader
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers)
+        self.serializer = JsonSerializer()
+    
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client goes away"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except BadRequest as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                
+                method, path, _, body, keep_alive = request
+                status, payload = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader):
+        """Read one HTTP request, or return None when the connection is closed
+        
+        Returns:
+            tuple: (method, path, headers, body, keep_alive)
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise BadRequest("Incomplete request head")
+            return None
+        except asyncio.LimitOverrunError:
+            raise BadRequest("Request head too large")
+        
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise BadRequest("Malformed request line")
+        
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise BadRequest("Invalid Content-Length")
+        if length < 0:
+            raise BadRequest("Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise PayloadTooLarge(f"Request body larger than {MAX_BODY_SIZE} bytes")
+        body = await reader.readexactly(length) if length else b""
+        
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        
+        return method, path.split("?", 1)[0], headers, body, keep_alive
+    
+    async def _respond(self, writer, status, payload, keep_alive):
+        """Write a JSON response, or a Prometheus text response for str payloads"""
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = PrometheusExporter.CONTENT_TYPE
+        else:
+            body = self.serializer.dumps(payload)
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+    
+    async def _dispatch(self, method, path, body):
+        """Route a request to its handler
+        
+        Returns:
+            tuple: (HTTP status, JSON payload)
+        """
+        routes = {
+            "/health": ("GET", self._health),
+            "/recommend": ("POST", self._recommend),
+            "/recommend/batch": ("POST", self._recommend_batch),
+            "/prolog/recommend": ("POST", self._prolog_recommend),
+            "/metrics": ("GET", self._metrics),
+            "/metrics/prometheus": ("GET", self._metrics_prometheus),
+            "/reload": ("POST", self._reload),
+        }
+        if path not in routes:
+            return 404, {"error": f"Unknown path {path}"}
+        expected, handler = routes[path]
+        if method != expected:
+            return 405, {"error": f"Use {expected} for {path}"}
+        
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise BadRequest("Request body must be a JSON object")
+            return await handler(data)
+        except (BadRequest, ValueError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+    
+    async def _health(self, data):
+        return 200, {"status": "ok"}
+    
+    async def _metrics(self, data):
+        return 200, self.engine.metrics.snapshot()
+    
+    async def _metrics_prometheus(self, data):
+        return 200, self.engine.metrics.export(PrometheusExporter())
+    
+    async def _reload(self, data):
+        if self.reloader is None:
+            return 503, {"error": "Hot reload is not enabled, start with --watch"}
+        # Building the new version takes a while, keep it off the loop
+        loop = asyncio.get_running_loop()
+        report = await loop.run_in_executor(self.executor, self.reloader.reload)
+        return (500 if report.error else 200), report.as_dict()
+    
+    async def _recommend(self, data):
+        # The engine only does dictionary lookups, so it runs on the event loop
+        weather, occasion, gender, special, date = self._parse_inputs(data)
+        user_id = data.get("user_id")
+        recommendation = self.engine.generate_recommendation(
+            weather, occasion, gender, special, date, user_id=user_id
+        )
+        if "error" in recommendation:
+            return 500, recommendation
+        return 200, recommendation
+    
+    async def _recommend_batch(self, data):
+        rows = data.get("requests")
+        if not isinstance(rows, list):
+            raise BadRequest("Field 'requests' must be a list")
+        parsed = [self._parse_inputs(row) for row in rows]
+        
+        # Large batches would stall other connections, run them off the loop
+        loop = asyncio.get_running_loop()
+        batch = await loop.run_in_executor(self.executor, self.engine.generate_recommendations, parsed)
+        return 200, {"recommendations": list(batch)}
+    
+    async def _prolog_recommend(self, data):
+        if self.bridge is None:
+            return 503, {"error": "Prolog backend is not enabled"}
+        weather, occasion, gender, special, date = self._parse_inputs(data)
+        month = date[1] if date else data.get("month", 1)
+        if isinstance(month, bool) or not isinstance(month, int) or not 1 <= month <= 12:
+            raise BadRequest("month must be a number from 1 to 12")
+        
+        # Prolog queries block, keep them away from the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.executor, self.bridge.recommend_outfit, occasion, weather, gender, special, month
+        )
+        return (200 if result.get("success") else 500), result
+    
+    @staticmethod
+    def _parse_inputs(data):
+        """Validate request fields
+        
+        Args:
+            data: JSON object or [weather, occasion, gender, special, date] list
+        
+        Returns:
+            tuple: (weather, occasion, gender, special, date)
+        """
+        if isinstance(data, list):
+            data = dict(zip(("weather", "occasion", "gender", "special", "date"), data))
+        if not isinstance(data, dict):
+            raise BadRequest("Request must be a JSON object")
+        
+        try:
+            weather, occasion, gender, special = validate_inputs(
+                data.get("weather"),
+                data.get("occasion"),
+                data.get("gender", "neutral"),
+                data.get("special", "none")
+            )
+        except ValueError as e:
+            raise BadRequest(str(e))
+        
+        date = data.get("date")
+        if date is not None:
+            if not isinstance(date, list) or len(date) != 3:
+                raise BadRequest("date must be [day, month, year]")
+            try:
+                date = tuple(int(part) for part in date)
+            except (TypeError, ValueError):
+                raise BadRequest("date must be [day, month, year]")
+        return weather, occasion, gender, special, date
+
+async def serve(service, host="127.0.0.1", port=8080, unix_path=None):
+    """Run the service until cancelled
+    
+    Args:
+        service (RecommendationService): The service to expose
+        host (str): Host to bind for TCP
+        port (int): Port to bind for TCP
+        unix_path (str): Unix socket path, used instead of TCP when given
+    """
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+        print(f"Listening on unix:{unix_path}")
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        print(f"Listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Entry point for the service mode"""
+    parser = argparse.ArgumentParser(description="Outfit recommendation HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--prolog", action="store_true", help="Load the catalogue from outfit_kb.pl and enable the Prolog endpoint")
+    parser.add_argument("--workers", type=int, default=4, help="Executor threads for blocking work")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Same user_id, date and inputs always give the same (cached) outfit")
+    parser.add_argument("--metrics", action="store_true", help="Collect stage timings and counters for /metrics")
+    parser.add_argument("--catalogue", help="Map the item catalogue from a file written by catalogue_file.py")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="Check the knowledge base sources this often and hot reload changes")
+    args = parser.parse_args()
+    
+    metrics = Metrics() if args.metrics else None
+    kb = KnowledgeBase(use_prolog=args.prolog, metrics=metrics, catalogue_file=args.catalogue)
+    # Filter every cell before the first connection instead of on first use
+    kb.build_filtered_tables()
+    engine = OutfitRecommendationEngine(kb, deterministic=args.deterministic)
+    bridge = None
+    if args.prolog:
+        from prolog_bridge import PrologBridge
+        bridge = PrologBridge(pool_size=args.workers, metrics=metrics)
+    
+    reloader = None
+    if args.watch:
+        from kb_reload import KnowledgeBaseReloader
+        reloader = KnowledgeBaseReloader(kb, engines=[engine], bridge=bridge, interval=args.watch,
+                                         on_reload=lambda report: print(f"Knowledge base reload: {report}"))
+        reloader.start()
+    
+    service = RecommendationService(engine, bridge, executor_workers=args.workers, reloader=reloader)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if reloader is not None:
+            reloader.stop()
+        if bridge is not None:
+            bridge.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# swipl_stub.py - Stand-in for swipl on machines without SWI-Prolog
+
+"""
+Speaks the line protocol of prolog_worker.pl so the subprocess path of
+PrologBridge and prolog_pool.py can be exercised and benchmarked where
+SWI-Prolog isn't installed.
+
+Only ground facts are known: consult/1 loads the facts of a file with
+kb_loader, and a goal made of a single fact with variable arguments is
+answered by matching it against them. Rules are not evaluated, but
+consult/1 rejects format strings with C-style %w directives, which real
+SWI-Prolog only reports when the rule runs.
+
+Use it as the executable of the bridge:
+    PrologBridge(executable="/path/to/swipl_stub.py")
+"""
+
+import json
+import re
+import sys
+
+from kb_loader import PrologSyntaxError, Variable, _FactParser, _split_clauses, parse_facts
+
+def parse_goal(goal):
+    """Parse a goal into (name, args), variables become Variable objects"""
+    clauses = list(_split_clauses(goal + " ."))
+    if len(clauses) != 1:
+        raise PrologSyntaxError("Expected a single goal")
+    fact = _FactParser(clauses[0]).fact()
+    if fact is None:
+        raise PrologSyntaxError("Only single facts can be queried")
+    return fact
+
+# Quoted format string of a format/2 or format/3 call
+FORMAT_CALL = re.compile(r"\bformat\((?:[^,()']+(?:\([^()]*\))?,\s*)?'((?:[^'\\]|\\.)*)'")
+
+def check_format_strings(text):
+    """Reject format strings using % instead of ~ directives
+    
+    Raises:
+        PrologSyntaxError: If a format/2,3 call uses a %w style directive
+    """
+    for match in FORMAT_CALL.finditer(text):
+        directive = re.search(r"%[a-z]", match.group(1))
+        if directive:
+            line = text.count("\n", 0, match.start()) + 1
+            raise PrologSyntaxError(
+                f"format/2: unknown directive {directive.group()} on line {line}, use ~ directives"
+            )
+
+def to_json(value):
+    """Convert a parsed term into the JSON the real worker would send"""
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if isinstance(value, tuple):
+        name, args = value
+        return f"{name}({', '.join(str(to_json(arg)) for arg in args)})"
+    return value
+
+def solve(facts, name, args):
+    """Match a goal against the known facts
+    
+    Returns:
+        list: One dict of variable bindings per matching fact
+    """
+    solutions = []
+    for fact_args in facts.get((name, len(args)), ()):
+        bindings = {}
+        for goal_arg, fact_arg in zip(args, fact_args):
+            if isinstance(goal_arg, Variable):
+                if goal_arg.name in bindings and bindings[goal_arg.name] != fact_arg:
+                    break
+                bindings[goal_arg.name] = fact_arg
+            elif goal_arg != fact_arg:
+                break
+        else:
+            solutions.append({
+                variable: to_json(value) for variable, value in bindings.items()
+                if not variable.startswith("_")
+            })
+    return solutions
+
+def reply(message):
+    sys.stdout.write(json.dumps(message, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+def serve():
+    """Answer goals from stdin until it is closed"""
+    facts = {}
+    for line in sys.stdin:
+        goal = line.strip()
+        if goal.endswith("."):
+            goal = goal[:-1].rstrip()
+        if not goal:
+            continue
+        try:
+            name, args = parse_goal(goal)
+            if name == "consult" and len(args) == 1:
+                with open(args[0], encoding="utf-8") as f:
+                    text = f.read()
+                check_format_strings(text)
+                for key, rows in parse_facts(text, args[0]).items():
+                    facts.setdefault(key, []).extend(rows)
+                reply({"status": "ok", "results": [{}]})
+            else:
+                reply({"status": "ok", "results": solve(facts, name, args)})
+        except (OSError, PrologSyntaxError) as e:
+            reply({"status": "error", "message": str(e)})
+
+def main():
+    if "--version" in sys.argv[1:]:
+        print("swipl_stub.py, a fact-only stand-in for SWI-Prolog")
+        return
+    serve()
+
+if __name__ == "__main__":
+    main()
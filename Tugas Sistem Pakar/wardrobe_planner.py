@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# wardrobe_planner.py - Multi-day outfit planning for Outfit Recommendation System
+
+"""
+Plans outfits for a week or a month from a forecast of (date, weather,
+occasion) rows, so that no item is worn on two consecutive days.
+
+Each day is picked from the filtered candidates of the knowledge base (the
+tables behind get_item_options, with the gender and modesty filters of
+the user applied), avoiding the items of the day before and the day
+after. When a cell has too few items to avoid a repeat, the repeat is
+kept and counted in WardrobePlan.repeats.
+
+Plans keep item IDs and resolve names only when asked. Changing the
+forecast of one day re-picks that day and, only if it couldn't avoid its
+neighbours, the days after it.
+
+Example:
+    planner = WardrobePlanner(KnowledgeBase())
+    plan = planner.plan([((1, 6, 2025), "hot", "formal"), ((2, 6, 2025), "rainy", "casual")],
+                        gender="feminine")
+    plan.update_day(1, weather="cold")
+    for day in plan.recommendations():
+        print(day["date"], day["top"])
+"""
+
+import random
+from datetime import datetime
+
+# No item in a category, same as the engine's placeholders
+NO_ITEM = -1
+
+# Categories picked one item per day, in the order of a day's picks
+SINGLE_CATEGORIES = ("tops", "bottoms", "outerwear", "shoes")
+
+# Items that stand for "nothing" may appear on consecutive days
+PLACEHOLDER_MARK = "Tidak diperlukan"
+
+class WardrobePlanner:
+    """Builds WardrobePlan objects on top of a knowledge base"""
+    
+    def __init__(self, knowledge_base, seed=0):
+        """Initialize the planner
+        
+        Args:
+            knowledge_base (KnowledgeBase): Knowledge base the plans are built from
+            seed (int): Planner seed, mixed with the user ID of every plan
+        """
+        self.kb = knowledge_base
+        self.seed = seed
+        # Candidate IDs of the five categories per set of inputs
+        self._candidates = {}
+        names = knowledge_base.item_names
+        self._placeholders = frozenset(
+            item_id for item_id in range(len(names)) if PLACEHOLDER_MARK in names[item_id]
+        )
+    
+    def candidates(self, occasion, weather, gender, special, extended):
+        """Filtered item IDs of every category for one set of inputs
+        
+        Returns:
+            tuple: (tops, bottoms, outerwear, shoes, accessories) ID sequences
+        """
+        key = (occasion, weather, gender, special, extended)
+        found = self._candidates.get(key)
+        if found is None:
+            get_ids = self.kb.get_filtered_ids
+            found = tuple(
+                get_ids(category, occasion, weather, gender, special, extended)
+                for category in SINGLE_CATEGORIES + ("accessories",)
+            )
+            self._candidates[key] = found
+        return found
+    
+    def plan(self, forecast, gender="neutral", special="none", user_id=None):
+        """Plan every day of a forecast
+        
+        Args:
+            forecast: Sequence of (date, weather, occasion) rows, date being
+                      a (day, month, year) tuple
+            gender (str): Gender preference (masculine, feminine, neutral)
+            special (str): Special considerations (modest, none)
+            user_id (str): Optional user identifier, seeds the plan
+        
+        Returns:
+            WardrobePlan: The planned days
+        """
+        return WardrobePlan(self, forecast, gender, special, user_id)
+
+class WardrobePlan:
+    """Outfits for consecutive days of one user"""
+    
+    def __init__(self, planner, forecast, gender="neutral", special="none", user_id=None):
+        """Plan every day of the forecast, see WardrobePlanner.plan"""
+        self.planner = planner
+        self.gender = gender
+        self.special = special
+        self.user_id = user_id
+        self.rng = random.Random(f"{planner.seed}|{'' if user_id is None else user_id}")
+        self.forecast = []
+        # Per day: (extended, top, bottom, outerwear, shoes, accessories tuple)
+        self.days = []
+        self.extend(forecast)
+    
+    def __len__(self):
+        return len(self.days)
+    
+    def extend(self, forecast):
+        """Plan additional days after the last planned one
+        
+        Args:
+            forecast: Sequence of (date, weather, occasion) rows
+        """
+        for row in forecast:
+            date, weather, occasion = row
+            self.forecast.append((tuple(date), weather, occasion))
+            self.days.append(None)
+            self.days[-1] = self._pick(len(self.days) - 1)
+    
+    def _pick(self, index):
+        """Pick the items of one day, avoiding the neighbouring days
+        
+        Returns:
+            tuple: (extended, top, bottom, outerwear, shoes, accessories tuple)
+        """
+        planner = self.planner
+        rng = self.rng
+        _, weather, occasion = self.forecast[index]
+        previous = self.days[index - 1] if index > 0 else None
+        following = self.days[index + 1] if index + 1 < len(self.days) else None
+        
+        # The extra feminine options are offered like in the engine
+        extended = False
+        if self.gender == "feminine":
+            if occasion == "formal" or occasion == "casual":
+                extended = rng.random() > 0.5
+            elif occasion == "sports":
+                extended = True
+        candidates = planner.candidates(occasion, weather, self.gender, self.special, extended)
+        placeholders = planner._placeholders
+        
+        picks = [extended]
+        for position in range(len(SINGLE_CATEGORIES)):
+            options = candidates[position]
+            if not options:
+                picks.append(NO_ITEM)
+                continue
+            avoid = []
+            for neighbour in (previous, following):
+                if neighbour is not None and neighbour[position + 1] not in placeholders:
+                    avoid.append(neighbour[position + 1])
+            item = options[int(rng.random() * len(options))]
+            if item in avoid:
+                # Prefer an item worn on neither neighbouring day, then one
+                # not worn the day before
+                allowed = [option for option in options if option not in avoid]
+                if not allowed and previous is not None:
+                    allowed = [option for option in options if option != previous[position + 1]]
+                if allowed:
+                    item = allowed[int(rng.random() * len(allowed))]
+            picks.append(item)
+        
+        options = candidates[-1]
+        worn = set()
+        for neighbour in (previous, following):
+            if neighbour is not None:
+                worn.update(neighbour[-1])
+        fresh = [option for option in options if option not in worn] if worn else list(options)
+        count = rng.randint(2, 3)
+        if fresh:
+            # Fewer accessories rather than yesterday's again
+            accessories = tuple(rng.sample(fresh, min(len(fresh), count)))
+        elif options:
+            accessories = tuple(rng.sample(list(options), min(len(options), count)))
+        else:
+            accessories = ()
+        picks.append(accessories)
+        return tuple(picks)
+    
+    def _conflicts(self, index):
+        """Whether day index repeats an item of the day before"""
+        if index <= 0 or index >= len(self.days):
+            return False
+        previous, day = self.days[index - 1], self.days[index]
+        placeholders = self.planner._placeholders
+        for position in range(1, len(SINGLE_CATEGORIES) + 1):
+            item = day[position]
+            if item != NO_ITEM and item == previous[position] and item not in placeholders:
+                return True
+        return bool(set(day[-1]) & set(previous[-1]))
+    
+    def update_day(self, index, weather=None, occasion=None, date=None):
+        """Change the forecast of one day and re-plan what it affects
+        
+        The day is re-picked avoiding both neighbours. The following days
+        are only re-picked while they repeat an item of the day before,
+        which happens only in cells too small to avoid it.
+        
+        Args:
+            index (int): Day to change, 0 is the first day of the plan
+            weather (str): New weather, None keeps the current one
+            occasion (str): New occasion, None keeps the current one
+            date (tuple): New (day, month, year), None keeps the current one
+        
+        Returns:
+            list: Indices of the days that were re-picked
+        """
+        old_date, old_weather, old_occasion = self.forecast[index]
+        self.forecast[index] = (
+            tuple(date) if date is not None else old_date,
+            weather if weather is not None else old_weather,
+            occasion if occasion is not None else old_occasion
+        )
+        changed = [index]
+        self.days[index] = self._pick(index)
+        following = index + 1
+        while following < len(self.days) and self._conflicts(following):
+            self.days[following] = self._pick(following)
+            changed.append(following)
+            following += 1
+        return changed
+    
+    def update_forecast(self, forecast):
+        """Replace the forecast, re-planning only the rows that changed
+        
+        Args:
+            forecast: Sequence of (date, weather, occasion) rows
+        
+        Returns:
+            list: Indices of the days that were re-picked or added
+        """
+        rows = [(tuple(date), weather, occasion) for date, weather, occasion in forecast]
+        if len(rows) < len(self.days):
+            del self.forecast[len(rows):]
+            del self.days[len(rows):]
+        changed = []
+        for index in range(len(self.days)):
+            if rows[index] != self.forecast[index]:
+                date, weather, occasion = rows[index]
+                changed.extend(self.update_day(index, weather, occasion, date))
+        start = len(self.days)
+        self.extend(rows[start:])
+        changed.extend(range(start, len(self.days)))
+        return sorted(set(changed))
+    
+    @property
+    def repeats(self):
+        """Number of days that repeat an item of the day before"""
+        return sum(1 for index in range(1, len(self.days)) if self._conflicts(index))
+    
+    def recommendation(self, index):
+        """One planned day as a recommendation dict, like the engine's
+        
+        Args:
+            index (int): Day of the plan
+        
+        Returns:
+            dict: Recommendation with the planned date, weather and occasion
+        """
+        kb = self.planner.kb
+        names = kb.item_names
+        date, weather, occasion = self.forecast[index]
+        _, top, bottom, outerwear, shoes, accessories = self.days[index]
+        day, month, year = date
+        outerwear_name = names[outerwear] if outerwear != NO_ITEM else None
+        return {
+            "date": datetime(int(year), int(month), int(day)).strftime("%d %B %Y"),
+            "time": datetime.now().strftime("%H:%M"),
+            "weather": weather,
+            "occasion": occasion,
+            "top": names[top] if top != NO_ITEM else "Outfit tidak tersedia",
+            "bottom": names[bottom] if bottom != NO_ITEM else "Outfit tidak tersedia",
+            "outerwear": outerwear_name if outerwear_name and PLACEHOLDER_MARK not in outerwear_name else None,
+            "shoes": names[shoes] if shoes != NO_ITEM else "Outfit tidak tersedia",
+            "accessories": [names[item_id] for item_id in accessories] or ["Aksesoris minimal"],
+            "color_recommendation": kb.get_color_recommendation(kb.get_season_from_month(int(month))),
+            "weather_tip": kb.get_weather_tip(weather),
+            "occasion_tip": kb.get_occasion_tip(occasion)
+        }
+    
+    def recommendations(self):
+        """Every planned day, see recommendation"""
+        return [self.recommendation(index) for index in range(len(self.days))]